@@ -2,29 +2,187 @@
 File: aggregate.py
 Description:    Simple script to aggregate and analyze data from a CSV file.
                 Used only for analysis purposes.
+                The file is read only once in chunks, so datasets larger than memory can be analyzed.
+                Distinct values are counted exactly or estimated by HyperLogLog,
+                most frequent values are tracked by Space-Saving algorithm in bounded memory.
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 01/11/2024
-Updated: 27/04/2025
+Updated: 19/10/2026
 """
 
 import pandas as pd
 import argparse
+from collections import Counter
+import csv
+import hashlib
+import heapq
+import io
+import math
 
 
-def process_file(file_path, max_unique_values=10):
-    ds = pd.read_csv(file_path, sep=";")
-    columns = ds.columns
+def infer_values(texts, has_missing):
+    """
+    Values of column texts as read_csv infers them from the whole file, so values are displayed
+    the same as when the file is read at once (e.g., numbers of column with missing values as floats).
+    """
+    if not texts:
+        return []
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(["value"])
+    writer.writerows([text] for text in texts)
+    if has_missing:
+        writer.writerow([""])
+    buffer.seek(0)
+    values = pd.read_csv(buffer, sep=";", low_memory=False)["value"]
+    return list(values.iloc[: len(texts)])
 
-    counts = {col: ds[col].value_counts() for col in columns}
-    percentages = {col: ds[col].value_counts(normalize=True) * 100 for col in columns}
-    total_count = len(ds)
 
-    for col in columns:
-        unique_count = ds[col].nunique()
-        column_total_count = ds[
-            col
-        ].count()  # Total count for the column (non-NaN values)
+class HyperLogLog:
+    """Estimates number of distinct values using 2^precision registers."""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = bytearray(self.num_registers)
+        self.alpha = 0.7213 / (1 + 1.079 / self.num_registers)
+
+    def add(self, value):
+        digest = hashlib.blake2b(str(value).encode(), digest_size=8).digest()
+        hashed = int.from_bytes(digest, "big")
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        # Position of the leftmost 1-bit in the remaining bits.
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        estimate = self.alpha * self.num_registers**2 / sum(
+            2.0**-register for register in self.registers
+        )
+        zeros = self.registers.count(0)
+        # Small range correction using linear counting.
+        if estimate <= 2.5 * self.num_registers and zeros:
+            estimate = self.num_registers * math.log(self.num_registers / zeros)
+        return round(estimate)
+
+
+class SpaceSaving:
+    """
+    Top-k heavy hitters in bounded memory. Counts of values are overestimated
+    at most by the smallest count held when the value was added.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+
+    def update(self, counts):
+        # Merge exact counts of one chunk into the summary.
+        floor = min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+        merged = dict(self.counts)
+        for value, count in counts.items():
+            merged[value] = merged.get(value, floor) + count
+        if len(merged) > self.capacity:
+            merged = dict(heapq.nlargest(self.capacity, merged.items(), key=lambda x: x[1]))
+        self.counts = merged
+
+    def top(self, n):
+        return heapq.nlargest(n, self.counts.items(), key=lambda x: x[1])
+
+
+class ColumnProfile:
+    def __init__(self, distinct, capacity):
+        self.total_count = 0  # non-NaN values
+        self.distinct = distinct
+        if distinct == "exact":
+            self.counter = Counter()
+        else:
+            self.hll = HyperLogLog()
+            self.heavy_hitters = SpaceSaving(capacity)
+
+    def update(self, series):
+        # values are kept in order of first appearance, ties are ordered as by value_counts of whole column
+        counts = series.value_counts(sort=False)
+        self.total_count += int(counts.sum())
+        if self.distinct == "exact":
+            self.counter.update(counts.to_dict())
+        else:
+            for value in counts.index:
+                self.hll.add(value)
+            self.heavy_hitters.update(counts.to_dict())
+
+    def finish(self, total_rows):
+        # Chunks are read as text, values are typed once over all chunks.
+        counts = self.counter if self.distinct == "exact" else self.heavy_hitters.counts
+        values = infer_values(list(counts), self.total_count < total_rows)
+        merged = {}
+        for value, count in zip(values, counts.values()):
+            merged[value] = merged.get(value, 0) + count
+        if self.distinct == "exact":
+            self.counter = Counter(merged)
+        else:
+            self.heavy_hitters.counts = merged
+
+    def unique_count(self):
+        if self.distinct == "exact":
+            return len(self.counter)
+        return self.hll.count()
+
+    def top(self, n):
+        if self.distinct == "exact":
+            counts = pd.Series(self.counter, dtype="int64")
+            return list(counts.sort_values(ascending=False).head(n).items())
+        return self.heavy_hitters.top(n)
+
+
+class DatasetProfile:
+    """Statistics of the whole dataset collected in a single pass over chunks."""
+
+    def __init__(self, max_unique_values=10, distinct="exact"):
+        self.max_unique_values = max_unique_values
+        self.distinct = distinct
+        self.columns = {}
+        self.total_count = 0
+        # first app name of every file and files seen with more app names
+        self.filename_app = {}
+        self.filename_apps = {}
+
+    def update(self, chunk):
+        self.total_count += len(chunk)
+        for col in chunk.columns:
+            if col not in self.columns:
+                # keep more values than displayed, so the displayed ones are accurate
+                self.columns[col] = ColumnProfile(
+                    self.distinct, max(100, 10 * self.max_unique_values)
+                )
+            self.columns[col].update(chunk[col])
+
+        if "Filename" in chunk.columns and "AppName" in chunk.columns:
+            pairs = chunk[["Filename", "AppName"]].dropna().drop_duplicates()
+            for filename, app in pairs.itertuples(index=False):
+                first = self.filename_app.setdefault(filename, app)
+                if first != app:
+                    self.filename_apps.setdefault(filename, {first}).add(app)
+
+
+def profile_file(file_path, max_unique_values=10, distinct="exact", chunksize=100000):
+    profile = DatasetProfile(max_unique_values, distinct)
+    for chunk in pd.read_csv(file_path, sep=";", chunksize=chunksize, dtype=str):
+        profile.update(chunk)
+    for column in profile.columns.values():
+        column.finish(profile.total_count)
+    return profile
+
+
+def process_file(profile, max_unique_values=10):
+    total_count = profile.total_count
+
+    for col, column in profile.columns.items():
+        unique_count = column.unique_count()
+        column_total_count = column.total_count  # Total count for the column (non-NaN values)
         uniqueness = (unique_count / total_count) * 100
         percentage_of_total = (column_total_count / total_count) * 100
         print(
@@ -33,31 +191,24 @@ def process_file(file_path, max_unique_values=10):
 
         if unique_count > max_unique_values:
             print(f"  Showing top {max_unique_values} values:")
-            top_values = counts[col].head(max_unique_values)
-        else:
-            top_values = counts[col]
+        top_values = column.top(max_unique_values)
 
-        for idx, count in top_values.items():
-            percent = percentages[col][idx]
+        for idx, count in top_values:
+            percent = count / column_total_count * 100
             print(f"  {idx}: {count} ({percent:.2f}%)")
 
         print("\n")
     print(f"Total count (rows): {total_count}")
 
 
-def process_file_to_latex(file_path, max_unique_values=10, output_file="table.tex"):
-    ds = pd.read_csv(file_path, sep=";")
-    columns = ds.columns
-
+def process_file_to_latex(profile, output_file="table.tex"):
     # Prepare a summary DataFrame
     summary_data = []
-    total_count = len(ds)
+    total_count = profile.total_count
 
-    for col in columns:
-        unique_count = ds[col].nunique()
-        column_total_count = ds[
-            col
-        ].count()  # Total count for the column (non-NaN values)
+    for col, column in profile.columns.items():
+        unique_count = column.unique_count()
+        column_total_count = column.total_count  # Total count for the column (non-NaN values)
         uniqueness = (unique_count / total_count) * 100
         percentage_of_total = (column_total_count / total_count) * 100
         # replace _ with \_ in column names for LaTeX compatibility
@@ -68,9 +219,9 @@ def process_file_to_latex(file_path, max_unique_values=10, output_file="table.te
             {
                 "Column": col,
                 "Unique Values": unique_count,
-                "Uniqueness (\%)": f"{uniqueness:.2f}",
+                "Uniqueness (\\%)": f"{uniqueness:.2f}",
                 "Total Count": column_total_count,
-                "Percentage of Total (\%)": f"{percentage_of_total:.2f}",
+                "Percentage of Total (\\%)": f"{percentage_of_total:.2f}",
             }
         )
 
@@ -88,17 +239,13 @@ def process_file_to_latex(file_path, max_unique_values=10, output_file="table.te
     print(f"LaTeX table saved to {output_file}")
 
 
-def check_filename_appname_uniqueness(file_path):
-    ds = pd.read_csv(file_path, sep=";")
-    grouped = ds.groupby("Filename")["AppName"].nunique()
-    non_unique_filenames = grouped[grouped > 1]
-
-    if non_unique_filenames.empty:
+def check_filename_appname_uniqueness(profile):
+    if not profile.filename_apps:
         print("All filenames are associated with only one app name.")
     else:
         print("The following filenames are associated with more than one app name:")
-        for filename, unique_app_count in non_unique_filenames.items():
-            print(f"  {filename}: {unique_app_count} unique app names")
+        for filename, apps in profile.filename_apps.items():
+            print(f"  {filename}: {len(apps)} unique app names")
 
 
 if __name__ == "__main__":
@@ -106,7 +253,20 @@ if __name__ == "__main__":
     parser.add_argument("file_path", type=str)
     parser.add_argument("--max_unique_values", type=int, default=10)
     parser.add_argument("--latex", type=str, help="Export to LaTeX format")
+    parser.add_argument(
+        "--distinct",
+        type=str,
+        choices=["exact", "hll"],
+        default="exact",
+        help="count distinct values exactly or estimate them with HyperLogLog (bounded memory)",
+    )
+    parser.add_argument("--chunksize", type=int, default=100000, help="rows read at once")
 
     args = parser.parse_args()
-    process_file(args.file_path, args.max_unique_values)
-    check_filename_appname_uniqueness(args.file_path)
+    profile = profile_file(
+        args.file_path, args.max_unique_values, args.distinct, args.chunksize
+    )
+    process_file(profile, args.max_unique_values)
+    check_filename_appname_uniqueness(profile)
+    if args.latex:
+        process_file_to_latex(profile, args.latex)
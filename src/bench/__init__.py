@@ -0,0 +1,9 @@
+"""
+File: __init__.py
+Description:    Initialization file for the bench package.
+                Benchmarks measuring how the identification pipeline scales, run as modules (python -m bench.<name>).
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
@@ -0,0 +1,48 @@
+"""
+File: common.py
+Description: Helpers shared by benchmarks, storing results as JSON with description of the environment.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_results(path, benchmark, parameters, results):
+    report = {
+        "benchmark": benchmark,
+        "environment": environment(),
+        "parameters": parameters,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {path}")
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
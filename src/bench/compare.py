@@ -0,0 +1,60 @@
+"""
+File: compare.py
+Description: Compares two results of bench.pipeline and reports stages which got slower than given threshold.
+             Usage: python -m bench.compare baseline.json current.json --threshold 0.1
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from .common import load_results
+
+import argparse
+import sys
+
+
+def compare(baseline, current, threshold, min_time):
+    regressions = []
+    baseline_by_scale = {result["scale"]: result for result in baseline["results"]}
+
+    print(f"{'scale':<7}{'stage':<22}{'baseline':>10}{'current':>10}{'change':>9}")
+    for result in current["results"]:
+        base = baseline_by_scale.get(result["scale"])
+        if base is None:
+            continue
+        for stage, seconds in result["stages"].items():
+            base_seconds = base["stages"].get(stage)
+            if base_seconds is None:
+                continue
+            change = (seconds - base_seconds) / base_seconds if base_seconds else 0
+            # Very short stages are too noisy to be reported as regression.
+            regression = change > threshold and seconds >= min_time
+            mark = " !" if regression else ""
+            print(
+                f"{result['scale']:<7}{stage:<22}{base_seconds:>10.4f}{seconds:>10.4f}{change:>+8.1%}{mark}"
+            )
+            if regression:
+                regressions.append((result["scale"], stage, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two pipeline benchmark results")
+    parser.add_argument("baseline", type=str)
+    parser.add_argument("current", type=str)
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown (0.1 = 10 %%)")
+    parser.add_argument("--min_time", type=float, default=0.01, help="ignore stages faster than this [s]")
+    args = parser.parse_args()
+
+    regressions = compare(
+        load_results(args.baseline), load_results(args.current), args.threshold, args.min_time
+    )
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+File: ingest.py
+Description: Benchmark of dataset ingestion from many CSV files. Parallel parsing of files by Database
+             is compared with concatenating the files into one CSV first and parsing it at once.
+             Usage: python -m bench.ingest --files 16 --workers 1 4
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.database import Database
+from identify.metrics import metrics
+from .synthetic import SyntheticDataset
+from .common import save_results
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+
+def load(dataset, workers):
+    # Only parsing and filtering is measured, split is the same for both approaches.
+    metrics.reset()
+    metrics.enable()
+    db = Database(dataset, workers)
+    timers = metrics.to_dict()["timers"]
+    return timers["load"][0]["wall_time"] + timers["filter"][0]["wall_time"], len(db.df)
+
+
+def concatenate(files, output):
+    with open(output, "wb") as out:
+        for i, file in enumerate(files):
+            with open(file, "rb") as f:
+                if i:
+                    f.readline()  # skip header of every file except the first one
+                shutil.copyfileobj(f, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion of many dataset files")
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument("--apps", type=int, default=10, help="apps per file")
+    parser.add_argument("--launches", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=200, help="rows per launch")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", type=str, default="bench-ingest.json")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = os.path.join(tmp, "parts")
+        os.makedirs(directory)
+        for i in range(args.files):
+            SyntheticDataset(args.apps, args.launches, args.rows, seed=i).write(
+                os.path.join(directory, f"part-{i:04d}.csv")
+            )
+        files = Database.resolve_files(directory)
+        size = sum(os.path.getsize(file) for file in files)
+
+        for workers in sorted(set(args.workers)):
+            times = []
+            for _ in range(args.repeat):
+                took, rows = load(directory, workers)
+                times.append(took)
+            results.append(
+                {
+                    "method": "parallel",
+                    "workers": workers,
+                    "rows": rows,
+                    "best": min(times),
+                    "rows_per_second": rows / min(times),
+                    "mb_per_second": size / 2**20 / min(times),
+                }
+            )
+
+        times = []
+        for _ in range(args.repeat):
+            merged = os.path.join(tmp, "merged.csv")
+            start = time.perf_counter()
+            concatenate(files, merged)
+            concat_time = time.perf_counter() - start
+            took, rows = load(merged, 1)
+            times.append(concat_time + took)
+            os.unlink(merged)
+        results.append(
+            {
+                "method": "concatenate",
+                "workers": 1,
+                "rows": rows,
+                "best": min(times),
+                "rows_per_second": rows / min(times),
+                "mb_per_second": size / 2**20 / min(times),
+            }
+        )
+
+    print(f"{args.files} files, {round(size / 2**20, 2)} MiB")
+    for result in results:
+        print(
+            f"{result['method']:<12} workers {result['workers']:<3} {result['best']:.3f} s, "
+            f"{round(result['rows_per_second'])} rows/s, {result['mb_per_second']:.2f} MiB/s"
+        )
+    save_results(args.output, "ingest", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+File: launches.py
+Description: Benchmark of per-launch identification. Patterns are trained once, test data is identified
+             per record with sliding window (JA_Context.identify) and per launch (Apriori.identify) with given
+             numbers of processes, time, throughput and accuracy are compared and per-launch results of all
+             process counts are checked to be the same.
+             Usage: python -m bench.launches -d data/iscx.csv -m 0.25 -w 15 -c 3 --workers 1 2 4
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.database import Database
+from identify.fingerprinting import FingerprintingMethod
+from identify.pattern_matching import Apriori
+from identify.ja_context import JA_Context
+from .common import save_results
+
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-launch identification")
+    parser.add_argument("-d", "--dataset", type=str, default="data/iscx.csv")
+    parser.add_argument("-f", "--ja_version", type=int, choices=[3, 4], default=4)
+    parser.add_argument("-m", "--min_support", type=float, default=0.25)
+    parser.add_argument("-w", "--sliding_window_size", type=int, default=15)
+    parser.add_argument("-c", "--max_candidates_length", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("-o", "--output", type=str, default="bench-launches.json")
+    args = parser.parse_args()
+
+    db = Database(args.dataset)
+    db.create_lookup_table(args.ja_version)
+    Apriori(args.min_support, args.ja_version, args.max_candidates_length).train(db)
+
+    results = []
+    fingerprinting = FingerprintingMethod(args.ja_version)
+    fingerprinting.identify(db)
+    context = Apriori(args.min_support, args.ja_version, args.max_candidates_length)
+    start = time.perf_counter()
+    JA_Context(fingerprinting, context, args.sliding_window_size).identify(db)
+    took = time.perf_counter() - start
+    results.append(
+        {
+            "mode": "per record",
+            "time": took,
+            "units": context.number_of_tls,
+            "accuracy": sum(context.correct) / context.number_of_tls,
+        }
+    )
+    print(
+        f"{'per record':<22} {took:7.3f} s {context.number_of_tls / took:10.1f} records/s, "
+        f"accuracy {results[-1]['accuracy']:.4f}"
+    )
+
+    expected = None
+    for workers in args.workers:
+        context = Apriori(args.min_support, args.ja_version, args.max_candidates_length)
+        start = time.perf_counter()
+        launches = context.identify(db, workers)
+        took = time.perf_counter() - start
+        if expected is None:
+            expected = launches
+        mode = f"per launch ({workers} proc)"
+        results.append(
+            {
+                "mode": mode,
+                "workers": workers,
+                "time": took,
+                "units": len(launches),
+                "accuracy": sum(context.correct) / len(launches),
+                "same_result": launches == expected,
+            }
+        )
+        print(
+            f"{mode:<22} {took:7.3f} s {len(launches) / took:10.1f} launches/s, "
+            f"accuracy {results[-1]['accuracy']:.4f}, same result {launches == expected}"
+        )
+
+    save_results(args.output, "launches", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+File: lsh.py
+Description: Benchmark of MinHash LSH shortlist of context fallbacks. Every sliding window of shuffled test data
+             is scored against patterns of all apps exactly (whole db fallback) and against apps shortlisted by
+             MinHash LSH for given bands and rows. Recall of exact top-k apps, agreement of the first guess,
+             share of real apps in top-k, shortlisted apps and speedup of scoring (with index query) are reported.
+             Usage: python -m bench.lsh -d data/iscx.csv -m 0.25 -w 15 -c 3 --params 16x2 8x4
+                    python -m bench.lsh --apps 200 --launches 5 --rows 100 --params 16x2 32x2 8x4
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as CONFIG
+from identify.database import Database
+from identify.fingerprinting import FingerprintingMethod
+from identify.pattern_matching import Apriori
+from identify.ja_context import JA_Context
+from identify.lsh import MinHashLSH
+from .synthetic import SyntheticDataset
+from .common import save_results
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def parse_params(value):
+    bands, rows = value.lower().split("x")
+    return int(bands), int(rows)
+
+
+def windows(db, context, args):
+    ja_context = JA_Context(FingerprintingMethod(4), context, args.sliding_window_size)
+    test_df = ja_context._prepare_test_data(db)
+    step = max(1, len(test_df) // args.windows) if args.windows else 1
+    return [ja_context._slide_window(i, test_df) for i in range(0, len(test_df), step)]
+
+
+def score(context, patterns, windows, shortlist=None):
+    results = []
+    start = time.perf_counter()
+    for window, _ in windows:
+        scored = shortlist(patterns, window) if shortlist is not None else patterns
+        results.append(context.find_similarity(scored, window))
+    return results, time.perf_counter() - start
+
+
+def real_app_rate(results, windows):
+    hits = sum(
+        row[CONFIG.APP_NAME] in [app for app, _ in result]
+        for result, (_, row) in zip(results, windows)
+    )
+    return hits / len(windows) if windows else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark MinHash LSH shortlist of context fallbacks"
+    )
+    parser.add_argument(
+        "-d", "--dataset", type=str, default=None, help="dataset, synthetic if not given"
+    )
+    parser.add_argument("--apps", type=int, default=200)
+    parser.add_argument("--launches", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=100, help="rows per launch of synthetic dataset")
+    parser.add_argument("-m", "--min_support", type=float, default=0.25)
+    parser.add_argument("-w", "--sliding_window_size", type=int, default=15)
+    parser.add_argument("-c", "--max_candidates_length", type=int, default=3)
+    parser.add_argument(
+        "--params",
+        type=parse_params,
+        nargs="+",
+        default=[(16, 2), (8, 4)],
+        help="bands x rows of LSH, e.g. 16x2",
+    )
+    parser.add_argument(
+        "--windows", type=int, default=2000, help="maximum number of scored windows"
+    )
+    parser.add_argument("-o", "--output", type=str, default="bench-lsh.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = args.dataset
+        if dataset is None:
+            dataset = os.path.join(tmp, "dataset.csv")
+            SyntheticDataset(args.apps, args.launches, args.rows).write(dataset)
+        db = Database(dataset)
+
+    context = Apriori(args.min_support, 4, args.max_candidates_length)
+    context.train(db)
+    db.frequent_patterns.prepare()
+    scored = windows(db, context, args)
+    print(
+        f"{len(db.frequent_patterns)} apps, {db.frequent_patterns.num_patterns} patterns, "
+        f"{len(scored)} windows"
+    )
+
+    exact, exact_time = score(context, db.frequent_patterns, scored)
+    results = [
+        {
+            "mode": "exact",
+            "time": exact_time,
+            "real_app_rate": real_app_rate(exact, scored),
+        }
+    ]
+    print(
+        f"{'exact':<10} {exact_time:7.3f} s, real app in top-k {results[0]['real_app_rate']:.4f}"
+    )
+
+    for bands, rows in args.params:
+        start = time.perf_counter()
+        lsh = MinHashLSH(db.frequent_patterns, bands, rows)
+        build_time = time.perf_counter() - start
+        approximate, took = score(context, db.frequent_patterns, scored, lsh.shortlist)
+
+        recall = []
+        first = 0
+        for exact_result, result in zip(exact, approximate):
+            exact_apps = {app for app, _ in exact_result}
+            apps = {app for app, _ in result}
+            if exact_apps:
+                recall.append(len(exact_apps & apps) / len(exact_apps))
+            first += bool(exact_result) and bool(result) and exact_result[0][0] == result[0][0]
+
+        statistics = lsh.statistics()
+        result = {
+            "mode": f"{bands}x{rows}",
+            "bands": bands,
+            "rows": rows,
+            "build_time": build_time,
+            "time": took,
+            "speedup": exact_time / took,
+            "recall": sum(recall) / len(recall) if recall else 0,
+            "first_guess_agreement": first / len(scored) if scored else 0,
+            "real_app_rate": real_app_rate(approximate, scored),
+            "avg_shortlisted": statistics["avg_shortlisted"],
+            "empty": statistics["empty"],
+        }
+        results.append(result)
+        print(
+            f"{result['mode']:<10} {took:7.3f} s "
+            f"(speedup {result['speedup']:.2f}x, build {build_time:.3f} s), "
+            f"recall@k {result['recall']:.4f}, 1st guess {result['first_guess_agreement']:.4f}, "
+            f"real app in top-k {result['real_app_rate']:.4f}, "
+            f"shortlisted {result['avg_shortlisted']:.1f} of {len(db.frequent_patterns)} apps"
+        )
+
+    save_results(
+        args.output,
+        "lsh",
+        {**vars(args), "params": [f"{b}x{r}" for b, r in args.params]},
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+File: memory.py
+Description: Benchmark of memory of dataset modes. Every mode (Database, LeanDatabase) runs in a fresh process,
+             which loads dataset, builds lookup table, trains patterns and prepares shuffled test data. Resident
+             set size after every stage (steady state after the last one) and peak RSS of the process are
+             reported.
+             Usage: python -m bench.memory -d data/iscx-raw.csv
+                    python -m bench.memory --apps 100 --launches 20 --rows 500
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from .synthetic import SyntheticDataset
+from .common import save_results
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+MODES = ["full", "lean"]
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rss():
+    """current resident set size of process in bytes"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def peak_rss():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def child(mode, dataset, min_support):
+    """runs stages of one mode in this process and prints JSON report"""
+    from identify.database import Database
+    from identify.lean import LeanDatabase
+    from identify.fingerprinting import FingerprintingMethod
+    from identify.pattern_matching import Apriori
+    from identify.ja_context import JA_Context
+
+    stages = {"start": rss()}
+    db = LeanDatabase(dataset) if mode == "lean" else Database(dataset)
+    gc.collect()
+    stages["load"] = rss()
+    db.create_lookup_table(4)
+    context = Apriori(min_support, 4, 3)
+    context.train(db)
+    gc.collect()
+    stages["train"] = rss()
+    test_df = JA_Context(FingerprintingMethod(4), context, 10)._prepare_test_data(db)
+    gc.collect()
+    stages["test_data"] = rss()
+
+    report = {
+        "mode": mode,
+        "rows": len(db.df),
+        "test_rows": len(test_df),
+        "stages": stages,
+        "steady_rss": stages["test_data"],
+        "peak_rss": peak_rss(),
+    }
+    print(json.dumps(report))
+
+
+def run(mode, dataset, min_support):
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "bench.memory",
+            "--child",
+            mode,
+            "-d",
+            dataset,
+            "-m",
+            str(min_support),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=SRC,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory of full and lean dataset")
+    parser.add_argument(
+        "-d", "--dataset", type=str, default=None, help="dataset, synthetic if not given"
+    )
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--launches", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=400, help="rows per launch of synthetic dataset")
+    parser.add_argument("-m", "--min_support", type=float, default=0.25)
+    parser.add_argument("--child", type=str, choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("-o", "--output", type=str, default="bench-memory.json")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.dataset, args.min_support)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = args.dataset
+        if dataset is None:
+            dataset = os.path.join(tmp, "dataset.csv")
+            SyntheticDataset(args.apps, args.launches, args.rows).write(dataset)
+
+        results = [run(mode, dataset, args.min_support) for mode in MODES]
+
+    for result in results:
+        stages = ", ".join(
+            f"{stage} {size / 2**20:.1f}" for stage, size in result["stages"].items()
+        )
+        print(
+            f"{result['mode']:<6} steady {result['steady_rss'] / 2**20:7.1f} MiB, "
+            f"peak {result['peak_rss'] / 2**20:7.1f} MiB ({stages} MiB)"
+        )
+    full, lean = results
+    print(
+        f"steady state {1 - lean['steady_rss'] / full['steady_rss']:.1%} lower, "
+        f"peak {1 - lean['peak_rss'] / full['peak_rss']:.1%} lower"
+    )
+
+    save_results(args.output, "memory", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+File: partial_match.py
+Description: Benchmark of partial match of JA4 sections. Context identification is run with whole database
+             fallback and with partial match, number of avoided whole database scorings, scoring time of both
+             fallbacks and accuracy are compared.
+             Usage: python -m bench.partial_match -d data/iscx.csv -m 0.25 -w 15 -c 3
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.database import Database
+from identify.fingerprinting import FingerprintingMethod
+from identify.pattern_matching import Apriori
+from identify.ja_context import JA_Context
+from identify.metrics import metrics
+from identify.pattern_store import PatternStore
+from .common import save_results
+
+import argparse
+
+
+def _scoring(timers, branch):
+    entries = [
+        entry
+        for entry in timers.get("context_scoring", [])
+        if entry["labels"]["branch"] == branch
+    ]
+    count = sum(entry["count"] for entry in entries)
+    wall_time = sum(entry["wall_time"] for entry in entries)
+    return count, wall_time
+
+
+def run(db, fingerprinting, args, partial_match):
+    metrics.reset()
+    metrics.enable()
+    db.frequent_patterns = PatternStore()
+    context = Apriori(args.min_support, args.ja_version, args.max_candidates_length)
+    context.train(db)
+    ja_context = JA_Context(
+        fingerprinting, context, args.sliding_window_size, partial_match=partial_match
+    )
+    ja_context.identify(db)
+
+    timers = metrics.to_dict()["timers"]
+    whole_db, whole_db_time = _scoring(timers, "whole_db")
+    partial, partial_time = _scoring(timers, "partial_match")
+    return {
+        "partial_match": partial_match,
+        "whole_db": whole_db,
+        "whole_db_time": whole_db_time,
+        "partial_match_scorings": partial,
+        "partial_match_time": partial_time,
+        "avoided": context.partial_match_count + context.partial_match_comb,
+        "context_identify": timers["context_identify"][0]["wall_time"],
+        "accuracy": sum(context.correct) / context.number_of_tls,
+        "accuracy_comb": sum(context.comb_correct) / context.number_of_tls,
+        "level_hits": dict(ja_context.ja4_index.level_hits) if partial_match else {},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark partial match of JA4 sections")
+    parser.add_argument("-d", "--dataset", type=str, default="data/iscx.csv")
+    parser.add_argument("-f", "--ja_version", type=int, choices=[3, 4], default=4)
+    parser.add_argument("-m", "--min_support", type=float, default=0.25)
+    parser.add_argument("-w", "--sliding_window_size", type=int, default=15)
+    parser.add_argument("-c", "--max_candidates_length", type=int, default=3)
+    parser.add_argument("-o", "--output", type=str, default="bench-partial-match.json")
+    args = parser.parse_args()
+
+    db = Database(args.dataset)
+    fingerprinting = FingerprintingMethod(args.ja_version)
+    db.create_lookup_table(args.ja_version)
+
+    baseline = run(db, fingerprinting, args, partial_match=False)
+    partial = run(db, fingerprinting, args, partial_match=True)
+
+    for result in (baseline, partial):
+        mode = "partial match" if result["partial_match"] else "whole db"
+        print(
+            f"{mode:<14} whole db scorings {result['whole_db']:<5} "
+            f"partial scorings {result['partial_match_scorings']:<5} "
+            f"context {result['context_identify']:.3f} s, "
+            f"accuracy {result['accuracy']:.4f} / comb {result['accuracy_comb']:.4f}"
+        )
+    print(f"Whole db scoring avoided: {partial['avoided']} of {baseline['whole_db']}")
+    if baseline["whole_db"] and partial["partial_match_scorings"]:
+        whole_db_mean = baseline["whole_db_time"] / baseline["whole_db"]
+        partial_mean = partial["partial_match_time"] / partial["partial_match_scorings"]
+        print(
+            f"Mean fallback scoring: whole db {whole_db_mean * 1000:.2f} ms, "
+            f"partial match {partial_mean * 1000:.2f} ms ({whole_db_mean / partial_mean:.1f}x)"
+        )
+    print(f"Matched JA4 components: {partial['level_hits']}")
+
+    save_results(args.output, "partial_match", vars(args), [baseline, partial])
+
+
+if __name__ == "__main__":
+    main()
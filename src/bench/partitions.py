@@ -0,0 +1,105 @@
+"""
+File: partitions.py
+Description: Benchmark of out-of-core training. Synthetic dataset is trained in memory (Database, lookup table,
+             Apriori.train) and with per-app partitions spilled to disk (PartitionedDatabase.train), time and
+             peak memory (tracemalloc) of both modes are compared and stored patterns and lookup tables are checked
+             to be the same.
+             Usage: python -m bench.partitions --apps 50 --launches 10 --rows 400 --workers 1 2
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.database import Database
+from identify.partitions import PartitionedDatabase
+from identify.pattern_matching import Apriori
+from .synthetic import SyntheticDataset
+from .common import save_results
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def in_memory(path, args):
+    db = Database(path)
+    db.create_lookup_table(4)
+    Apriori(args.min_support, 4, 3).train(db)
+    return db
+
+
+def partitioned(path, directory, workers, args):
+    db = PartitionedDatabase(path, directory, workers)
+    db.train(Apriori(args.min_support, 4, 3), 4)
+    return db
+
+
+def measure(function):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    db = function()
+    took = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return db, took, peak
+
+
+def summary(db):
+    patterns = {app: set(db.frequent_patterns[app].itemsets) for app in db.frequent_patterns}
+    return patterns, db.lookup_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark out-of-core training with partitions")
+    parser.add_argument("--apps", type=int, default=50)
+    parser.add_argument("--launches", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=400, help="rows per launch")
+    parser.add_argument("-m", "--min_support", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=str, default="bench-partitions.json")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dataset.csv")
+        rows = SyntheticDataset(args.apps, args.launches, args.rows, seed=args.seed).write(path)
+
+        db, took, peak = measure(lambda: in_memory(path, args))
+        expected = summary(db)
+        del db
+        results.append({"mode": "in memory", "time": took, "peak_memory": peak})
+        print(f"{'in memory':<22} {took:7.2f} s {peak / 2**20:8.1f} MiB peak, {rows} rows")
+
+        for workers in args.workers:
+            directory = os.path.join(tmp, "partitions")
+            db, took, peak = measure(lambda: partitioned(path, directory, workers, args))
+            same = summary(db) == expected
+            largest = max(os.path.getsize(file) for file in db.partitions.values())
+            del db
+            mode = f"partitioned ({workers} proc)"
+            results.append(
+                {
+                    "mode": mode,
+                    "workers": workers,
+                    "time": took,
+                    "peak_memory": peak,
+                    "largest_partition": largest,
+                    "same_result": same,
+                }
+            )
+            print(
+                f"{mode:<22} {took:7.2f} s {peak / 2**20:8.1f} MiB peak, "
+                f"largest partition {largest / 2**20:.1f} MiB, same result {same}"
+            )
+
+    save_results(args.output, "partitions", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+File: pipeline.py
+Description: Benchmark of the identification pipeline on synthetic datasets of growing size.
+             Every stage (Database load/filter/split, create_lookup_table, Apriori.train,
+             FingerprintingMethod.identify, JA_Context.identify) is timed for each scale point.
+             Usage: python -m bench.pipeline --scales xs s m -o bench-results.json
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.database import Database
+from identify.fingerprinting import FingerprintingMethod
+from identify.pattern_matching import Apriori
+from identify.ja_context import JA_Context
+from identify.metrics import metrics
+from .synthetic import SyntheticDataset
+from .common import save_results
+
+import argparse
+import os
+import tempfile
+
+# Scale points as (apps, launches per app, rows per launch).
+SCALES = {
+    "xs": (5, 4, 25),
+    "s": (10, 5, 50),
+    "m": (25, 8, 100),
+    "l": (50, 10, 200),
+    "xl": (100, 20, 250),
+}
+
+STAGES = [
+    "load",
+    "filter",
+    "split",
+    "lookup_build",
+    "train",
+    "fingerprint_identify",
+    "context_identify",
+]
+
+
+def run_scale(path, ja_version, min_support, window, candidates):
+    metrics.reset()
+    metrics.enable()
+
+    db = Database(path)
+    fingerprinting = FingerprintingMethod(ja_version)
+    db.create_lookup_table(ja_version)
+    fingerprinting.identify(db)
+
+    context = Apriori(min_support, ja_version, candidates)
+    context.train(db)
+
+    ja_context = JA_Context(fingerprinting, context, window)
+    ja_context.identify(db)
+
+    timers = metrics.to_dict()["timers"]
+    stages = {stage: sum(entry["wall_time"] for entry in timers[stage]) for stage in STAGES}
+    window_timer = timers["context_window"][0]
+    correct = sum(context.comb_correct)
+
+    return {
+        "train_rows": len(db.train_df),
+        "test_rows": len(db.test_df),
+        "stages": stages,
+        "total": sum(stages.values()),
+        "context_window_mean": window_timer["mean"],
+        "context_window_max": window_timer["max"],
+        "accuracy_comb": correct / context.number_of_tls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark stages of identification pipeline")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["xs", "s", "m"])
+    parser.add_argument("--sharing", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-f", "--ja_version", type=int, choices=[3, 4], default=4)
+    parser.add_argument("-m", "--min_support", type=float, default=0.1)
+    parser.add_argument("-w", "--sliding_window_size", type=int, default=10)
+    parser.add_argument("-c", "--max_candidates_length", type=int, default=3)
+    parser.add_argument("-o", "--output", type=str, default="bench-pipeline.json")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            apps, launches, rows = SCALES[scale]
+            path = os.path.join(tmp, f"{scale}.csv")
+            num_rows = SyntheticDataset(
+                apps, launches, rows, sharing=args.sharing, seed=args.seed
+            ).write(path)
+
+            result = run_scale(
+                path,
+                args.ja_version,
+                args.min_support,
+                args.sliding_window_size,
+                args.max_candidates_length,
+            )
+            result.update(scale=scale, apps=apps, launches=launches, rows=num_rows)
+            results.append(result)
+
+            stages = ", ".join(f"{k} {v:.3f}" for k, v in result["stages"].items())
+            print(f"[{scale}] {num_rows} rows, total {result['total']:.2f} s: {stages}")
+
+    save_results(args.output, "pipeline", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
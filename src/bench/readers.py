@@ -0,0 +1,180 @@
+"""
+File: readers.py
+Description: Benchmark of streaming readers of sensor logs. Synthetic records are written as Zeek ssl.log
+             (TSV and JSON) and Suricata eve.json (with non-TLS events in between) next to the same records
+             in ;-separated CSV, records/s, MiB/s and peak memory (tracemalloc) of streaming the logs are
+             compared with parsing the CSV by pandas.
+             Usage: python -m bench.readers --apps 20 --launches 10 --rows 500
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as col_names
+from identify.readers import read_frames, read_records
+from .synthetic import COLUMNS, SyntheticDataset
+from .common import save_results
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+ZEEK_FIELDS = [
+    "ts",
+    "uid",
+    "id.orig_h",
+    "id.orig_p",
+    "id.resp_h",
+    "id.resp_p",
+    "version",
+    "server_name",
+    "ja3",
+    "ja3s",
+    "ja4",
+    "ja4s",
+]
+
+
+def _logs(dataset):
+    # fields of records of synthetic dataset kept in sensor logs, rows of type A and M are not captured
+    index = {column: COLUMNS.index(column) for column in COLUMNS}
+    for i, row in enumerate(dataset.rows()):
+        if row[index[col_names.TYPE]] != "0":
+            continue
+        yield i, {
+            "ts": 1700000000 + i / 1000,
+            "uid": f"C{i:016x}",
+            "id.orig_h": row[index["SrcIP"]],
+            "id.orig_p": row[index["SrcPort"]],
+            "id.resp_h": row[index["DstIP"]],
+            "id.resp_p": row[index["DstPort"]],
+            "version": "TLSv13",
+            "server_name": row[index[col_names.SNI]] or None,
+            "ja3": row[index[col_names.JA3]],
+            "ja3s": row[index[col_names.JA3_S]],
+            "ja4": row[index[col_names.JA4]],
+            "ja4s": row[index[col_names.JA4_S]],
+        }
+
+
+def write_zeek(dataset, path):
+    with open(path, "w") as f:
+        f.write("#separator \\x09\n#set_separator\t,\n#empty_field\t(empty)\n#unset_field\t-\n")
+        f.write("#path\tssl\n#fields\t" + "\t".join(ZEEK_FIELDS) + "\n")
+        for _, entry in _logs(dataset):
+            values = ["-" if entry[field] is None else str(entry[field]) for field in ZEEK_FIELDS]
+            f.write("\t".join(values) + "\n")
+        f.write("#close\t2026-10-19-00-00-00\n")
+
+
+def write_zeek_json(dataset, path):
+    with open(path, "w") as f:
+        for _, entry in _logs(dataset):
+            # unset fields are omitted by Zeek
+            entry = {key: value for key, value in entry.items() if value is not None}
+            f.write(json.dumps(entry) + "\n")
+
+
+def write_eve(dataset, path):
+    with open(path, "w") as f:
+        for i, entry in _logs(dataset):
+            flow = {
+                "timestamp": entry["ts"],
+                "flow_id": i,
+                "src_ip": entry["id.orig_h"],
+                "src_port": entry["id.orig_p"],
+                "dest_ip": entry["id.resp_h"],
+                "dest_port": entry["id.resp_p"],
+                "proto": "TCP",
+            }
+            f.write(json.dumps({**flow, "event_type": "flow", "flow": {"pkts_toserver": 12}}) + "\n")
+            tls = {
+                "version": "TLS 1.3",
+                "ja3": {"hash": entry["ja3"]},
+                "ja3s": {"hash": entry["ja3s"]},
+                "ja4": entry["ja4"],
+            }
+            if entry["server_name"]:
+                tls["sni"] = entry["server_name"]
+            f.write(json.dumps({**flow, "event_type": "tls", "tls": tls}) + "\n")
+
+
+def measure(function):
+    # time is measured without tracemalloc, which slows down allocations
+    start = time.perf_counter()
+    count = function()
+    took = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, took, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming readers of sensor logs")
+    parser.add_argument("--apps", type=int, default=20)
+    parser.add_argument("--launches", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=500, help="rows per launch")
+    parser.add_argument("--chunk_size", type=int, default=col_names.READER_CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=str, default="bench-readers.json")
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(args.apps, args.launches, args.rows, seed=args.seed)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            "csv": os.path.join(tmp, "dataset.csv"),
+            "zeek": os.path.join(tmp, "ssl.log"),
+            "zeek_json": os.path.join(tmp, "ssl.json"),
+            "eve": os.path.join(tmp, "eve.json"),
+        }
+        dataset.write(paths["csv"])
+        write_zeek(dataset, paths["zeek"])
+        write_zeek_json(dataset, paths["zeek_json"])
+        write_eve(dataset, paths["eve"])
+
+        runs = {
+            "csv": lambda: len(pd.read_csv(paths["csv"], delimiter=";")),
+        }
+        for file_format in ("zeek", "zeek_json", "eve"):
+            path = paths[file_format]
+            runs[f"{file_format} records"] = lambda path=path: sum(
+                1 for _ in read_records(path, "app")
+            )
+            runs[f"{file_format} frames"] = lambda path=path: sum(
+                len(frame) for frame in read_frames(path, args.chunk_size, "app")
+            )
+
+        for method, function in runs.items():
+            count, took, peak = measure(function)
+            size = os.path.getsize(paths[method.split()[0]])
+            results.append(
+                {
+                    "method": method,
+                    "records": count,
+                    "time": took,
+                    "records_per_second": count / took,
+                    "mb_per_second": size / 2**20 / took,
+                    "file_size": size,
+                    "peak_memory": peak,
+                }
+            )
+            print(
+                f"{method:<18} {count:>8} records {took:7.2f} s "
+                f"{count / took:>10.0f} records/s {size / 2**20 / took:7.1f} MiB/s "
+                f"{peak / 2**20:7.1f} MiB peak"
+            )
+
+    save_results(args.output, "readers", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
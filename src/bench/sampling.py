@@ -0,0 +1,107 @@
+"""
+File: sampling.py
+Description: Benchmark of sampled mining of large app groups. Apriori.train is run on all rows and on samples
+             sized by support error (with and without exact verification of supports), training time, peak
+             memory (tracemalloc) and difference of stored pattern sets are compared.
+             Usage: python -m bench.sampling --errors 0.02 0.01 --rows 4000
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.database import Database
+from identify.pattern_matching import Apriori
+from identify.pattern_store import PatternStore
+from identify.sampling import SupportSampler
+from .synthetic import SyntheticDataset
+from .common import save_results
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def train(db, min_support, sampler=None):
+    db.frequent_patterns = PatternStore()
+    context = Apriori(min_support, 4, 3)
+    context.sampler = sampler
+    tracemalloc.start()
+    start = time.perf_counter()
+    context.train(db)
+    took = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    patterns = {app: set(db.frequent_patterns[app].itemsets) for app in db.frequent_patterns}
+    return took, peak, patterns
+
+
+def compare(exact, sampled):
+    # Apps with exactly the same stored itemsets and mean Jaccard similarity of itemsets per app.
+    same = 0
+    similarity = 0.0
+    for app, itemsets in exact.items():
+        other = sampled.get(app, set())
+        same += itemsets == other
+        union = itemsets | other
+        similarity += len(itemsets & other) / len(union) if union else 1.0
+    return same, similarity / len(exact)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sampled mining of large app groups")
+    parser.add_argument("--apps", type=int, default=5)
+    parser.add_argument("--launches", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=4000, help="rows per launch")
+    parser.add_argument("-m", "--min_support", type=float, default=0.05)
+    parser.add_argument("--errors", type=float, nargs="+", default=[0.02, 0.01])
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=str, default="bench-sampling.json")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "large.csv")
+        SyntheticDataset(args.apps, args.launches, args.rows, seed=args.seed).write(path)
+        db = Database(path)
+
+    exact_time, exact_peak, exact = train(db, args.min_support)
+    print(
+        f"{'exact':<24} {exact_time:7.2f} s {exact_peak / 2**20:8.1f} MiB peak, "
+        f"{len(db.train_df)} rows"
+    )
+    results = [{"mode": "exact", "time": exact_time, "peak_memory": exact_peak}]
+
+    for error in args.errors:
+        for verify in (False, True):
+            sampler = SupportSampler(error, args.confidence, verify, args.seed)
+            took, peak, sampled = train(db, args.min_support, sampler)
+            same, similarity = compare(exact, sampled)
+            mode = f"error {error}" + (" verified" if verify else "")
+            results.append(
+                {
+                    "mode": mode,
+                    "error": error,
+                    "verify": verify,
+                    "sample_size": sampler.sample_size,
+                    "time": took,
+                    "peak_memory": peak,
+                    "time_saved": exact_time - took,
+                    "memory_saved": exact_peak - peak,
+                    "same_apps": same,
+                    "pattern_similarity": similarity,
+                }
+            )
+            print(
+                f"{mode:<24} {took:7.2f} s {peak / 2**20:8.1f} MiB peak, "
+                f"sample {sampler.sample_size} rows, same patterns {same}/{len(exact)} apps, "
+                f"similarity {similarity:.3f}"
+            )
+
+    save_results(args.output, "sampling", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+File: score_cache.py
+Description: Benchmark of cache of context scores. Context identification is run without the cache and with
+             caches of given sizes, time of context identification, hit rate, evictions and memory of the cache
+             are reported and accuracies are checked to be the same as without the cache.
+             Usage: python -m bench.score_cache -d data/iscx.csv -m 0.25 -w 15 -c 3 --sizes 64 4096
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.database import Database
+from identify.fingerprinting import FingerprintingMethod
+from identify.pattern_matching import Apriori
+from identify.ja_context import JA_Context
+from identify.score_cache import ScoreCache
+from .common import save_results
+
+import argparse
+import time
+
+
+def run(db, fingerprinting, test_df, args, size):
+    context = Apriori(args.min_support, args.ja_version, args.max_candidates_length)
+    ja_context = JA_Context(
+        fingerprinting, context, args.sliding_window_size, cascade=args.cascade
+    )
+    if size:
+        ja_context.score_cache = ScoreCache(size)
+    start = time.perf_counter()
+    ja_context.identify(db, test_df)
+    took = time.perf_counter() - start
+
+    result = {
+        "size": size,
+        "time": took,
+        "statistics": [context.get_statistics(is_comb) for is_comb in (False, True)],
+    }
+    if size:
+        result.update(ja_context.score_cache.statistics())
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cache of context scores")
+    parser.add_argument("-d", "--dataset", type=str, default="data/iscx.csv")
+    parser.add_argument("-f", "--ja_version", type=int, choices=[3, 4], default=4)
+    parser.add_argument("-m", "--min_support", type=float, default=0.25)
+    parser.add_argument("-w", "--sliding_window_size", type=int, default=15)
+    parser.add_argument("-c", "--max_candidates_length", type=int, default=3)
+    parser.add_argument("--cascade", action="store_true")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 4096])
+    parser.add_argument("-o", "--output", type=str, default="bench-score-cache.json")
+    args = parser.parse_args()
+
+    db = Database(args.dataset)
+    db.create_lookup_table(args.ja_version)
+    Apriori(args.min_support, args.ja_version, args.max_candidates_length).train(db)
+    fingerprinting = FingerprintingMethod(args.ja_version)
+    fingerprinting.identify(db)
+    # all runs identify the same shuffled test data
+    test_df = JA_Context(
+        fingerprinting,
+        Apriori(args.min_support, args.ja_version, args.max_candidates_length),
+        args.sliding_window_size,
+    )._prepare_test_data(db)
+
+    baseline = run(db, fingerprinting, test_df, args, 0)
+    results = [baseline]
+    print(f"{'no cache':<14} {baseline['time']:7.3f} s")
+    for size in args.sizes:
+        result = run(db, fingerprinting, test_df, args, size)
+        result["same_result"] = result["statistics"] == baseline["statistics"]
+        results.append(result)
+        print(
+            f"{'size ' + str(size):<14} {result['time']:7.3f} s "
+            f"(speedup {baseline['time'] / result['time']:.2f}x), hit rate {result['hit_rate']:.4f}, "
+            f"evictions {result['evictions']}, peak {result['peak_size'] / 2**20:.2f} MiB, "
+            f"same result {result['same_result']}"
+        )
+
+    save_results(args.output, "score_cache", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+File: sni.py
+Description: Benchmark of SNI lookups in plain dict of lookup table and in trie of reversed domain labels.
+             Memory of both structures (tracemalloc), lookup latency of known domains and of unseen
+             subdomains of known domains and share of unseen subdomains matched are reported.
+             Usage: python -m bench.sni -d data/iscx.csv
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.sni_trie import SNITrie
+from .common import save_results
+import config as col_names
+
+import argparse
+import random
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+def build_table(dataset):
+    df = pd.read_csv(dataset, delimiter=";", usecols=[col_names.SNI, col_names.APP_NAME])
+    df = df.dropna()
+    table = {}
+    for sni, app in df.itertuples(index=False):
+        table.setdefault(sni, set()).add(app)
+    return table
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    structure = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return structure, size
+
+
+def measure_lookups(lookup, domains, repeat):
+    best = float("inf")
+    matched = 0
+    for _ in range(repeat):
+        matched = 0
+        start = time.perf_counter()
+        for domain in domains:
+            if lookup(domain):
+                matched += 1
+        best = min(best, time.perf_counter() - start)
+    return best / len(domains), matched / len(domains)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SNI dict and trie lookups")
+    parser.add_argument("-d", "--dataset", type=str, default="data/iscx.csv")
+    parser.add_argument("--probes", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=str, default="bench-sni.json")
+    args = parser.parse_args()
+
+    # Sets of apps are shared by both structures, only the index itself is measured.
+    source = build_table(args.dataset)
+    table, dict_size = measure_memory(lambda: dict(source))
+    trie, trie_size = measure_memory(lambda: SNITrie.from_lookup_table(source))
+
+    rng = random.Random(args.seed)
+    domains = list(table)
+    known = [rng.choice(domains) for _ in range(args.probes)]
+    # New subdomains of known domains, e.g. per-region hostnames.
+    unseen = [f"region{rng.randint(1, 99)}.{domain}" for domain in known]
+
+    results = []
+    lookups = [("dict", "exact", lambda d: table.get(d, set()))]
+    for mode in SNITrie.MODES:
+        lookups.append(("trie", mode, lambda d, mode=mode: trie.get(d, mode)))
+
+    print(f"{len(table)} domains, dict {dict_size / 1024:.1f} KiB, trie {trie_size / 1024:.1f} KiB")
+    for structure, mode, lookup in lookups:
+        known_latency, known_matched = measure_lookups(lookup, known, args.repeat)
+        unseen_latency, unseen_matched = measure_lookups(lookup, unseen, args.repeat)
+        results.append(
+            {
+                "structure": structure,
+                "mode": mode,
+                "memory": dict_size if structure == "dict" else trie_size,
+                "known_latency": known_latency,
+                "unseen_latency": unseen_latency,
+                "known_matched": known_matched,
+                "unseen_matched": unseen_matched,
+            }
+        )
+        print(
+            f"{structure:<5} {mode:<12} known {known_latency * 1e9:7.0f} ns ({known_matched:.0%} matched), "
+            f"unseen subdomain {unseen_latency * 1e9:7.0f} ns ({unseen_matched:.0%} matched)"
+        )
+
+    save_results(args.output, "sni", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+File: startup.py
+Description: Benchmark of startup time. Modules are imported in fresh interpreters (python -X importtime),
+             cumulative import time is reported together with heavy training dependencies (pandas, scikit-learn,
+             mlxtend) loaded by the import. With a model, time from interpreter start to first classified batch
+             of inference-only runtime and of server classifier is measured as well.
+             Usage: python -m bench.startup --repeat 5 --model model.pkl
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from .common import save_results
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODULES = ["identify.inference", "identify.server", "identify.pattern_matching"]
+HEAVY = ["pandas", "sklearn", "mlxtend"]
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Classifies one batch of records missing every fingerprint (context of the whole model is scored).
+FIRST_BATCH = """
+import sys
+from identify.{module} import {classifier}
+from identify.model import Model
+classifier = {classifier}(Model.load(sys.argv[1]), 10, 4)
+classifier.classify([{{}}] * 100)
+"""
+
+CLASSIFIERS = {"inference": "InferenceClassifier", "server": "Classifier"}
+
+
+def run_child(args, **kwargs):
+    """runs python child in temporary directory (identify.log stays out of src), src is on its path"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC, env.get("PYTHONPATH")]))
+    with tempfile.TemporaryDirectory() as cwd:
+        return subprocess.run(
+            [sys.executable, *args], check=True, cwd=cwd, env=env, **kwargs
+        )
+
+
+def import_time(module):
+    """cumulative import time of module in microseconds and heavy packages it loads"""
+    output = run_child(
+        ["-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True
+    ).stderr
+    cumulative = None
+    loaded = set()
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        name = name.strip()
+        if name.split(".")[0] in HEAVY:
+            loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative, sorted(loaded)
+
+
+def first_batch_time(module, model):
+    start = time.perf_counter()
+    run_child(
+        [
+            "-c",
+            FIRST_BATCH.format(module=module, classifier=CLASSIFIERS[module]),
+            os.path.abspath(model),
+        ],
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup and import time")
+    parser.add_argument("--modules", type=str, nargs="+", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "-M", "--model", type=str, default=None, help="model for time to first batch"
+    )
+    parser.add_argument("-o", "--output", type=str, default="bench-startup.json")
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        times = []
+        for _ in range(args.repeat):
+            cumulative, loaded = import_time(module)
+            times.append(cumulative)
+        median = statistics.median(times) / 1e6
+        results.append({"module": module, "import_time": median, "heavy_imports": loaded})
+        print(f"{module:<28} import {median * 1000:8.1f} ms, heavy: {', '.join(loaded) or '-'}")
+
+    if args.model:
+        for module in CLASSIFIERS:
+            took = statistics.median(
+                first_batch_time(module, args.model) for _ in range(args.repeat)
+            )
+            results.append({"module": f"identify.{module}", "first_batch_time": took})
+            print(f"{'identify.' + module:<28} first batch {took * 1000:8.1f} ms")
+
+    save_results(args.output, "startup", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
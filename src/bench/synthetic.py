@@ -0,0 +1,161 @@
+"""
+File: synthetic.py
+Description: Generator of synthetic TLS datasets in the same ;-delimited schema as the real datasets
+             (AppName, Filename, Type, JA3hash, JA4hash, JA3Shash, JA4Shash, SNI, ...).
+             Number of apps, launches per app, rows per launch and sharing of fingerprints between apps are tunable.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as col_names
+
+import argparse
+import csv
+import hashlib
+import random
+
+COLUMNS = [
+    "SrcIP",
+    "DstIP",
+    "SrcPort",
+    "DstPort",
+    col_names.SNI,
+    col_names.ORG,
+    col_names.JA3,
+    col_names.JA4,
+    col_names.APP_NAME,
+    col_names.TYPE,
+    col_names.JA3_S,
+    col_names.JA4_S,
+    col_names.FILE,
+    "Version",
+]
+
+
+def _hex(rng, length):
+    return "%0*x" % (length, rng.getrandbits(4 * length))
+
+
+class _Fingerprint:
+    """Client and server fingerprints with SNI of one TLS connection type."""
+
+    def __init__(self, rng, domain):
+        self.ja3 = hashlib.md5(_hex(rng, 32).encode()).hexdigest()
+        self.ja3s = hashlib.md5(_hex(rng, 32).encode()).hexdigest()
+        ciphers = rng.randint(5, 40)
+        extensions = rng.randint(5, 20)
+        alpn = rng.choice(["h2", "h1", "00"])
+        version = rng.choice(["12", "13"])
+        self.ja4 = f"t{version}d{ciphers:02d}{extensions:02d}{alpn}_{_hex(rng, 12)}_{_hex(rng, 12)}"
+        self.ja4s = f"t{version}{rng.randint(1, 9):02d}{alpn}_{_hex(rng, 4)}_{_hex(rng, 12)}"
+        self.sni = f"{rng.choice(['api', 'www', 'cdn', 'edge', 'static'])}{rng.randint(1, 99)}.{domain}"
+
+
+class SyntheticDataset:
+    def __init__(
+        self,
+        apps=10,
+        launches=5,
+        rows_per_launch=50,
+        fingerprints_per_app=8,
+        shared_fingerprints=10,
+        sharing=0.2,
+        filtered_rows=0.05,
+        seed=0,
+    ):
+        """
+        Args:
+            apps (int): Number of applications.
+            launches (int): Number of launches (capture files) per application.
+            rows_per_launch (int): Number of TLS records per launch.
+            fingerprints_per_app (int): Number of connection types specific to one application.
+            shared_fingerprints (int): Number of connection types in pool shared by all applications.
+            sharing (float): Probability that record uses connection type from the shared pool.
+            filtered_rows (float): Share of rows with Type A or M, which are filtered out when loaded.
+            seed (int): Seed of random generator, same parameters and seed give the same dataset.
+        """
+        self.apps = apps
+        self.launches = launches
+        self.rows_per_launch = rows_per_launch
+        self.fingerprints_per_app = fingerprints_per_app
+        self.shared_fingerprints = shared_fingerprints
+        self.sharing = sharing
+        self.filtered_rows = filtered_rows
+        self.seed = seed
+
+    def rows(self):
+        rng = random.Random(self.seed)
+        shared = [_Fingerprint(rng, "shared-cdn.net") for _ in range(self.shared_fingerprints)]
+
+        for app_index in range(self.apps):
+            app = f"app{app_index:04d}"
+            own = [
+                _Fingerprint(rng, f"{app}.com") for _ in range(self.fingerprints_per_app)
+            ]
+            # Connection types are not equally frequent, first ones are used the most.
+            weights = [1 / (rank + 1) for rank in range(len(own))]
+
+            for launch in range(self.launches):
+                filename = f"{app}_{launch:04d}.pcap"
+                for _ in range(self.rows_per_launch):
+                    if shared and rng.random() < self.sharing:
+                        fingerprint = rng.choice(shared)
+                    else:
+                        fingerprint = rng.choices(own, weights)[0]
+
+                    row_type = "0"
+                    if rng.random() < self.filtered_rows:
+                        row_type = rng.choice(["A", "M"])
+
+                    yield [
+                        f"10.0.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                        f"192.0.2.{rng.randint(1, 254)}",
+                        rng.randint(1024, 65535),
+                        443,
+                        fingerprint.sni if rng.random() > 0.1 else "",
+                        "Synthetic Org",
+                        fingerprint.ja3,
+                        fingerprint.ja4,
+                        app,
+                        row_type,
+                        fingerprint.ja3s,
+                        fingerprint.ja4s,
+                        filename,
+                        "0",
+                    ]
+
+    def write(self, path):
+        count = 0
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f, delimiter=";")
+            writer.writerow(COLUMNS)
+            for row in self.rows():
+                writer.writerow(row)
+                count += 1
+        return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic TLS dataset")
+    parser.add_argument("output", type=str)
+    parser.add_argument("--apps", type=int, default=10)
+    parser.add_argument("--launches", type=int, default=5)
+    parser.add_argument("--rows", type=int, default=50, help="rows per launch")
+    parser.add_argument("--fingerprints", type=int, default=8, help="fingerprints per app")
+    parser.add_argument("--shared", type=int, default=10, help="size of shared fingerprint pool")
+    parser.add_argument("--sharing", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    dataset = SyntheticDataset(
+        args.apps,
+        args.launches,
+        args.rows,
+        args.fingerprints,
+        args.shared,
+        args.sharing,
+        seed=args.seed,
+    )
+    print(f"{dataset.write(args.output)} rows written to {args.output}")
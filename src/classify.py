@@ -0,0 +1,102 @@
+"""
+File: classify.py
+Description: Classifies TLS records with model stored by main.py (--save_model) using inference-only runtime,
+             which starts without pandas, scikit-learn and mlxtend. Records are read from JSON lines (one record
+             with column names of config.py per line), Zeek ssl.log or Suricata eve.json, classified in batches
+             and written as JSON lines (one result per record).
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.inference import InferenceClassifier
+from identify.logger import Logger
+from identify.readers import COLUMNS, detect_format, read_records
+
+import argparse
+from itertools import islice
+import json
+import sys
+import time
+
+
+def read_input(path):
+    """yields records of JSON lines with column names of config.py or of sensor log"""
+    with open(path, "r", encoding="utf-8") as f:
+        line = f.readline()
+    if line.lstrip().startswith("{") and set(json.loads(line)) & set(COLUMNS):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    if detect_format(path) == "csv":
+        raise ValueError(f"{path} is not JSON lines of records, Zeek or Suricata log")
+    yield from read_records(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Classify TLS records with trained model without training dependencies"
+    )
+    parser.add_argument(
+        "-M", "--model", type=str, required=True, help="Path to the trained model"
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=str,
+        required=True,
+        help="JSON lines of records, Zeek ssl.log or Suricata eve.json",
+    )
+    parser.add_argument(
+        "-w",
+        "--sliding_window_size",
+        type=int,
+        help="size of sliding window within one batch",
+        default=10,
+    )
+    parser.add_argument(
+        "-c",
+        "--max_candidates_length",
+        type=int,
+        help="maximum number of guesses returned per record",
+        default=4,
+    )
+    parser.add_argument(
+        "-b", "--batch_size", type=int, help="records classified at once", default=1000
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, help="output JSON lines, stdout by default", default=None
+    )
+    args = parser.parse_args()
+
+    with Logger() as logger:
+        logger.info("[START CLASSIFY]")
+        start_time = time.time()
+        classifier = InferenceClassifier.load(
+            args.model, args.sliding_window_size, args.max_candidates_length
+        )
+        logger.info("Model loaded in %.3f s", time.time() - start_time)
+
+        output = open(args.output, "w") if args.output else sys.stdout
+        num_records = 0
+        try:
+            records = read_input(args.input)
+            while batch := list(islice(records, args.batch_size)):
+                for result in classifier.classify(batch):
+                    output.write(json.dumps(result) + "\n")
+                num_records += len(batch)
+        finally:
+            if args.output:
+                output.close()
+
+        took = time.time() - start_time
+        logger.info("Classified %s records in %.2f s", num_records, took)
+        logger.info(f"Statistics: {classifier.statistics()}")
+        logger.info("[STOP CLASSIFY]")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ Description: This file contains constants representing column names in the datas
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 17/11/2024
-Updated: 13/05/2025
+Updated: 19/10/2026
 """
 
 # Modify the constants to match the dataset column names
@@ -92,9 +92,49 @@ PATTERN_FILTERS = [
     {"operator": "==", "length": 3, "head": 2},
 ]
 
+#! NAMED FILTER SETS SELECTABLE IN HYPERPARAMETER SWEEP (sweep.py --filters) !#
+PATTERN_FILTER_PRESETS = {
+    "none": [],
+    "config": PATTERN_FILTERS,
+    "iscx_ja4": [
+        {"operator": "==", "length": 1, "head": 5},
+        {"operator": "==", "length": 3, "head": 10},
+    ],
+    "iscx_comb": [
+        {"operator": "==", "length": 3, "head": 5},
+    ],
+    "mobile_ja4": [
+        {"operator": "==", "length": 2, "head": 5},
+        {"operator": "==", "length": 3, "head": 10},
+    ],
+    "mobile_comb": [
+        {"operator": "==", "length": 1, "head": 2},
+        {"operator": "==", "length": 3, "head": 2},
+    ],
+}
 
 # DEBUG LOG LEVEL
 DEBUG_ENABLED = False
+# Record source file and line of every log message (costs a frame lookup per message)
+LOG_CALLER_INFO = True
+# Maximum number of messages waiting for the background log writer
+LOG_QUEUE_SIZE = 10000
+
+# Number of records of Zeek/Suricata logs parsed into one DataFrame chunk (bounds memory of readers)
+READER_CHUNK_SIZE = 10000
+
+# Number of records of prediction log (main.py --results) converted to columns at once
+RESULTS_BATCH_SIZE = 4096
+
+# Size limit of on-disk cache of mined patterns (main.py --pattern_cache) in MB
+PATTERN_CACHE_SIZE_MB = 256
+
+# Number of context scorings of (selected apps, window items) kept in memory (main.py --score_cache_size)
+SCORE_CACHE_SIZE = 4096
+
+# Bands and rows per band of MinHash LSH shortlisting apps of context fallbacks (main.py --lsh)
+LSH_BANDS = 16
+LSH_ROWS = 2
 
 
 def get_keys(ja_version):
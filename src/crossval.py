@@ -0,0 +1,87 @@
+"""
+File: crossval.py
+Description: k-fold cross-validation over launches (files) of the dataset. Dataset is parsed only once,
+             folds are evaluated in parallel, accuracy per fold and its mean and standard deviation are reported.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.crossval import SCHEMES, CrossValidation
+from identify.logger import Logger
+
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Cross-validate identification over k splits of every launch"
+    )
+    parser.add_argument(
+        "-d", "--dataset", type=str, required=True, help="Path to the dataset"
+    )
+    parser.add_argument(
+        "-f",
+        "--ja_version",
+        type=int,
+        help="version of fingerprinting [JA3 or JA4]",
+        choices=[3, 4],
+        default=4,
+    )
+    parser.add_argument(
+        "-w", "--sliding_window_size", type=int, help="size of sliding window", default=10
+    )
+    parser.add_argument(
+        "-m",
+        "--min_support",
+        type=float,
+        help="minimum support for frequent pattern mining",
+        default=0.1,
+    )
+    parser.add_argument(
+        "-c",
+        "--max_candidates_length",
+        type=int,
+        help="maximum length of candidate patterns",
+        default=4,
+    )
+    parser.add_argument("-k", "--folds", type=int, help="number of folds", default=5)
+    parser.add_argument(
+        "--scheme",
+        type=str,
+        choices=SCHEMES,
+        help="blocked: test on one of k blocks of every launch, train on the rest; "
+        "rolling: train on all blocks before the tested one",
+        default="blocked",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, help="number of parallel processes", default=1
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, help="path of the results table (CSV)", default=None
+    )
+    args = parser.parse_args()
+
+    with Logger() as logger:
+        logger.info("[START CROSS-VALIDATION]")
+        cross_validation = CrossValidation(
+            args.dataset,
+            args.ja_version,
+            args.min_support,
+            args.sliding_window_size,
+            args.max_candidates_length,
+            args.folds,
+            args.scheme,
+            args.workers,
+        )
+        rows = cross_validation.run()
+        cross_validation.display_results(rows)
+        if args.output:
+            cross_validation.export_to_csv(rows, args.output)
+            print(f"\nResults saved to {args.output}")
+        logger.info("[FINISH CROSS-VALIDATION]")
+
+
+if __name__ == "__main__":
+    main()
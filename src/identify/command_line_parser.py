@@ -4,11 +4,14 @@ Description: This file contains the config class which parses and stores command
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 15/11/2024
-Updated: 13/05/2025
+Updated: 19/10/2026
 """
 
 import argparse
 from .logger import Logger
+from .profiler import StageProfiler
+from .sni_trie import SNITrie
+from config import LSH_BANDS, LSH_ROWS, PATTERN_CACHE_SIZE_MB, SCORE_CACHE_SIZE
 
 
 class CommandLineParser:
@@ -17,11 +20,19 @@ class CommandLineParser:
             logger.info("Parsing command-line arguments...")
 
             args = self.__parse_arguments()
-            self.dataset = args.dataset
+            # single path is kept as string, more paths (files, directories, globs) as list
+            self.dataset = args.dataset[0] if len(args.dataset) == 1 else args.dataset
 
             logger.info(f"Dataset path set: {self.dataset}")
 
-            self.ja_version = args.ja_version
+            self.workers = args.workers
+            logger.info(f"Workers set: {self.workers}")
+
+            # more versions are evaluated over one loaded dataset
+            self.ja_versions = list(dict.fromkeys(args.ja_version))
+            self.ja_version = (
+                self.ja_versions[0] if len(self.ja_versions) == 1 else self.ja_versions
+            )
             logger.info(f"JA version set: {self.ja_version}")
 
             self.sliding_window_size = args.sliding_window_size
@@ -33,21 +44,98 @@ class CommandLineParser:
             self.max_candidates_length = args.max_candidates_length
             logger.info(f"Maximum candidates length set: {self.max_candidates_length}")
 
+            self.cascade = args.cascade
+            logger.info(f"Cascade mode set: {self.cascade}")
+
+            self.partial_match = args.partial_match
+            logger.info(f"Partial match set: {self.partial_match}")
+
+            self.sni_match = args.sni_match
+            logger.info(f"SNI match set: {self.sni_match}")
+
+            self.sample_error = args.sample_error
+            self.sample_confidence = args.sample_confidence
+            self.sample_verify = args.sample_verify
+            logger.info(
+                f"Sampling set: error={self.sample_error}, confidence={self.sample_confidence}, verify={self.sample_verify}"
+            )
+
+            self.pattern_cache = args.pattern_cache
+            self.pattern_cache_size = args.pattern_cache_size
+            logger.info(
+                f"Pattern cache set: {self.pattern_cache}, size limit {self.pattern_cache_size} MB"
+            )
+
+            self.score_cache_size = args.score_cache_size
+            logger.info(f"Score cache size set: {self.score_cache_size}")
+
+            self.lsh = args.lsh
+            self.lsh_bands = args.lsh_bands
+            self.lsh_rows = args.lsh_rows
+            logger.info(
+                f"MinHash LSH set: {self.lsh}, bands={self.lsh_bands}, rows={self.lsh_rows}"
+            )
+
+            self.metrics_json = args.metrics_json
+            self.metrics_prom = args.metrics_prom
+            logger.info(
+                f"Metrics export set: json={self.metrics_json}, prometheus={self.metrics_prom}"
+            )
+
+            self.results = args.results
+            logger.info(f"Results log set: {self.results}")
+
+            self.per_launch = args.per_launch
+            self.launch_output = args.launch_output
+            logger.info(
+                f"Per launch mode set: {self.per_launch}, output: {self.launch_output}"
+            )
+
+            self.lean = args.lean
+            logger.info(f"Lean dataset mode set: {self.lean}")
+
+            self.partition_dir = args.partition_dir
+            logger.info(f"Partition directory set: {self.partition_dir}")
+
+            self.save_model = args.save_model
+            logger.info(f"Model output set: {self.save_model}")
+
+            self.profile = args.profile
+            self.profile_mode = args.profile_mode
+            self.profile_dir = args.profile_dir
+            logger.info(
+                f"Profiling set: stages={self.profile}, mode={self.profile_mode}, output={self.profile_dir}"
+            )
+
     def __parse_arguments(self):
         parser = argparse.ArgumentParser(
             description="Identify applications using JA3/4 fingerprints and frequent pattern matching algorithms in network traffic"
         )
         parser.add_argument(
-            "-d", "--dataset", type=str, required=True, help="Path to the dataset"
+            "-d",
+            "--dataset",
+            type=str,
+            nargs="+",
+            required=True,
+            help="Path to the dataset (CSV file, directory with CSV files, glob pattern or more of them)",
+        )
+
+        parser.add_argument(
+            "-j",
+            "--workers",
+            type=int,
+            help="number of processes parsing dataset files (default: number of CPUs)",
+            default=None,
         )
 
         parser.add_argument(
             "-f",
             "--ja_version",
             type=int,
-            help="version of fingerprinting [JA3 or JA4]",
+            nargs="+",
+            help="version of fingerprinting [JA3 or JA4], both versions can be compared over one loaded dataset",
             choices=[3, 4],
-            default=4,
+            default=[4],
         )
 
         parser.add_argument(
@@ -74,4 +162,174 @@ class CommandLineParser:
             default=4,
         )
 
-        return parser.parse_args()
+        parser.add_argument(
+            "--cascade",
+            action="store_true",
+            help="skip context when fingerprinting candidates are unambiguous",
+        )
+
+        parser.add_argument(
+            "--partial_match",
+            action="store_true",
+            help="narrow candidates of unseen JA4/JA4S hashes by their sections instead of using whole database",
+        )
+
+        parser.add_argument(
+            "--sni_match",
+            type=str,
+            choices=SNITrie.MODES,
+            help="matching of SNI missing in lookup table (default: exact)",
+            default="exact",
+        )
+
+        parser.add_argument(
+            "--sample_error",
+            type=float,
+            help="mine uniform sample of large app groups with this maximum support error (default: mine all rows)",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--sample_confidence",
+            type=float,
+            help="probability that support error of the sample is within --sample_error",
+            default=0.95,
+        )
+
+        parser.add_argument(
+            "--sample_verify",
+            action="store_true",
+            help="verify supports of patterns mined from sample on all rows",
+        )
+
+        parser.add_argument(
+            "--pattern_cache",
+            type=str,
+            help="directory of on-disk cache of mined patterns per app (default: disabled)",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--pattern_cache_size",
+            type=float,
+            help="size limit of pattern cache in MB",
+            default=PATTERN_CACHE_SIZE_MB,
+        )
+
+        parser.add_argument(
+            "--score_cache_size",
+            type=int,
+            help="number of context scorings of (candidate subset, window items) kept in memory, 0 disables the cache",
+            default=SCORE_CACHE_SIZE,
+        )
+
+        parser.add_argument(
+            "--lsh",
+            action="store_true",
+            help="shortlist apps of whole db and pure context fallbacks by MinHash LSH of patterns, "
+            "only shortlisted apps are scored",
+        )
+
+        parser.add_argument(
+            "--lsh_bands",
+            type=int,
+            help="number of bands of MinHash LSH",
+            default=LSH_BANDS,
+        )
+
+        parser.add_argument(
+            "--lsh_rows",
+            type=int,
+            help="number of rows (hash functions) per band of MinHash LSH",
+            default=LSH_ROWS,
+        )
+
+        parser.add_argument(
+            "--metrics_json",
+            type=str,
+            help="path of JSON report with per-stage timings and counters",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--metrics_prom",
+            type=str,
+            help="path of Prometheus text-format file with per-stage timings and counters",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--results",
+            type=str,
+            help="write prediction of every test record (candidates, top guesses, context branch) "
+            "to columnar file (.npz, or .parquet with pyarrow)",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--per_launch",
+            action="store_true",
+            help="identify every test launch (file) as one unit instead of records with sliding window "
+            "(-j sets number of processes)",
+        )
+
+        parser.add_argument(
+            "--launch_output",
+            type=str,
+            help="path of ;-separated file with top guesses of every launch (with --per_launch)",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--lean",
+            action="store_true",
+            help="memory-lean dataset, one encoded table with training and testing rows as arrays of positions",
+        )
+
+        parser.add_argument(
+            "--partition_dir",
+            type=str,
+            help="train out of core, rows are spilled into per-app partition files in this directory "
+            "and apps are trained one partition at a time (-j sets number of training processes)",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--save_model",
+            type=str,
+            help="path where trained model (lookup tables and frequent patterns) is stored",
+            default=None,
+        )
+
+        parser.add_argument(
+            "--profile",
+            type=str,
+            nargs="+",
+            choices=list(StageProfiler.STAGES),
+            help="profile selected stages (train: Apriori.train, fingerprint: FingerprintingMethod.identify, context: JA_Context.identify)",
+            default=[],
+        )
+
+        parser.add_argument(
+            "--profile_mode",
+            type=str,
+            choices=StageProfiler.MODES,
+            help="deterministic (cProfile) or sampling profiler",
+            default="deterministic",
+        )
+
+        parser.add_argument(
+            "--profile_dir",
+            type=str,
+            help="directory for profiling reports and stats files",
+            default="profile",
+        )
+
+        args = parser.parse_args()
+        if args.save_model and len(set(args.ja_version)) > 1:
+            parser.error("--save_model requires a single JA version")
+        if args.per_launch and len(set(args.ja_version)) > 1:
+            parser.error("--per_launch requires a single JA version")
+        if args.lean and args.partition_dir:
+            parser.error("--lean can not be combined with --partition_dir")
+        return args
@@ -0,0 +1,119 @@
+"""
+File: context_cascade.py
+Description: This file contains fallbacks of context identification shared by JA_Context (training and
+             evaluation) and InferenceClassifier (inference-only runtime and identification server).
+             Patterns of fingerprint candidates are scored first, whole database is scored when no
+             candidate is known, complement of candidates (pure context) and then full patterns when
+             candidates have no similarity with the window. Module does not import pandas.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from .logger import Logger
+
+
+class FallbackCounters:
+    """Counters of fallbacks, Apriori holds the same counters with the rest of its statistics."""
+
+    def __init__(self):
+        self.pure_context = 0
+        self.pure_context_comb = 0
+        self.context_using_whole_db = 0
+        self.context_using_whole_db_comb = 0
+
+
+class ContextCascade:
+    """
+    Fallbacks of context identification. Subclass scores patterns of one branch by
+    _score(patterns, window, branch, is_comb) and keeps fallback counters in self.context.
+    """
+
+    # partial match of unseen JA4 hashes (JA4Index), tried before the whole database
+    ja4_index = None
+
+    def _filter_frequent_patterns(self, db, candidates):
+        # Only candidates present in the database are selected
+        return db.frequent_patterns.subset(candidates)
+
+    def _find_context_candidates(self, db_subset, db, window, is_comb, row=None):
+        """finds candidates using context
+
+        Args:
+            db_subset (dict): Subset of the database to search for candidates.
+            db (dict): Database containing the frequent patterns.
+            window (df): Sliding window of data to analyze.
+            is_comb (bool): Flag indicating if the context is for a combination of fingerprints.
+            row (Series): Identified record, used by partial match of its fingerprints.
+
+        Returns:
+            list: of top N candidates found using patterns and shortened database.
+        """
+        with Logger() as logger:
+            if not db_subset and self.ja4_index is not None and row is not None:
+                candidates = self._find_partial_match_candidates(db, window, row, is_comb)
+                if candidates:
+                    return candidates
+
+            if not db_subset:
+                self._log_empty_subset(logger, is_comb)
+                return self._score(db.frequent_patterns, window, "whole_db", is_comb)
+
+            candidates = self._score(db_subset, window, "subset", is_comb)
+
+            if not candidates:
+                logger.info("No candidates found. Falling back to pure context.")
+                return self._use_pure_context(
+                    db.frequent_patterns, db_subset, window, is_comb
+                )
+
+            return candidates
+
+    def _score(self, patterns, window, branch, is_comb):
+        raise NotImplementedError
+
+    def _log_empty_subset(self, logger, is_comb):
+        context_label = "[comb]" if is_comb else ""
+        logger.info(
+            "Subset of DB is empty, using whole database for context. %s", context_label
+        )
+
+        if is_comb:
+            self.context.context_using_whole_db_comb += 1
+        else:
+            self.context.context_using_whole_db += 1
+
+    def _use_pure_context(self, patterns, db_subset, window, is_comb):
+        with Logger() as logger:
+            context_type = "[comb]" if is_comb else ""
+            logger.info(
+                "Failed to find similarity with subset db. Falling back to pure context using complement of db. %s",
+                context_type,
+            )
+
+            self._increment_pure_context_counter(is_comb)
+
+            logger.debug(lambda: f"Database subset keys: {list(db_subset.keys())}")
+
+            db_complement = self._get_db_complement(patterns, db_subset)
+            logger.debug(
+                lambda: f"Database complement keys: {list(db_complement.keys())}"
+            )
+
+            candidates = self._score(db_complement, window, "complement", is_comb)
+
+            if not candidates:
+                logger.info("No candidates found in complement. Using full patterns.")
+                candidates = self._score(patterns, window, "complement_full", is_comb)
+
+            return candidates
+
+    def _increment_pure_context_counter(self, is_comb):
+        if is_comb:
+            self.context.pure_context_comb += 1
+        else:
+            self.context.pure_context += 1
+
+    def _get_db_complement(self, patterns, db_subset):
+        return patterns.complement(db_subset)
@@ -0,0 +1,258 @@
+"""
+File: crossval.py
+Description: This file contains CrossValidation class, which evaluates the method over k train/test splits
+             of every launch (file) instead of one 75/25 split. Dataset is parsed and filtered only once, folds
+             select rows by positions. Blocked folds test on every k-th contiguous block of each launch and train
+             on the rest, rolling folds train on all blocks before the tested one (chronological order is kept).
+             Lookup tables, mining and context identification of folds run in parallel processes.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config
+from .database import Database
+from .fingerprinting import FingerprintingMethod
+from .pattern_matching import Apriori
+from .ja_context import JA_Context
+from .logger import Logger
+from .pattern_store import PatternStore
+
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import csv
+import multiprocessing
+import time
+
+import numpy as np
+
+SCHEMES = ["blocked", "rolling"]
+
+# State shared with forked worker processes (parsed dataset is not pickled).
+_shared = {}
+
+
+def fold_positions(df, folds, scheme):
+    """positions of training and testing rows of every fold
+
+    Args:
+        df (df): Parsed and filtered dataset.
+        folds (int): Number of folds.
+        scheme (str): "blocked" (test on one of k blocks, train on the rest)
+            or "rolling" (k + 1 blocks, train on blocks before the tested one).
+
+    Returns:
+        list: of (train positions, test positions) per fold, rows of launches in order of file names.
+    """
+    blocks_per_launch = folds if scheme == "blocked" else folds + 1
+    splits = [([], []) for _ in range(folds)]
+    for launch in df.groupby(config.FILE).indices.values():
+        if len(launch) < blocks_per_launch:
+            # Launch too short to be split, same as single occurrences in Database it is only trained on.
+            for train, _ in splits:
+                train.append(launch)
+            continue
+        blocks = np.array_split(launch, blocks_per_launch)
+        for fold, (train, test) in enumerate(splits):
+            if scheme == "blocked":
+                test.append(blocks[fold])
+                train.extend(blocks[:fold] + blocks[fold + 1 :])
+            else:
+                test.append(blocks[fold + 1])
+                train.extend(blocks[: fold + 1])
+    return [
+        (np.concatenate(train), np.concatenate(test) if test else np.zeros(0, dtype=int))
+        for train, test in splits
+    ]
+
+
+def _evaluate_fold(fold):
+    parameters = _shared["parameters"]
+    train, test = _shared["folds"][fold]
+    # Copy shares parsed dataset, only tables of the fold are replaced.
+    db = copy.copy(_shared["db"])
+    db.train_df = db.df.iloc[train]
+    db.test_df = db.df.iloc[test]
+    db.lookup_table = {}
+    db.frequent_patterns = PatternStore()
+
+    timings = {}
+    start_time = time.time()
+    db.create_lookup_table(parameters["ja_version"])
+    timings["lookup_time"] = time.time() - start_time
+
+    context = Apriori(
+        parameters["min_support"],
+        parameters["ja_version"],
+        parameters["candidate_size"],
+    )
+    start_time = time.time()
+    context.train(db)
+    timings["train_time"] = time.time() - start_time
+
+    fingerprinting = FingerprintingMethod(parameters["ja_version"])
+    start_time = time.time()
+    fingerprinting.identify(db)
+    timings["fingerprint_time"] = time.time() - start_time
+
+    ja_context = JA_Context(fingerprinting, context, parameters["sliding_window_size"])
+    start_time = time.time()
+    ja_context.identify(db)
+    timings["context_time"] = time.time() - start_time
+
+    rows = []
+    for is_comb in (False, True):
+        row = context.get_statistics(is_comb)
+        fingerprint_total = len(
+            fingerprinting.len_candidates_combination
+            if is_comb
+            else fingerprinting.len_candidates
+        )
+        fingerprint_correct = (
+            fingerprinting.correct_combination if is_comb else fingerprinting.correct
+        )
+        row["fold"] = fold
+        row["sliding_window_size"] = parameters["sliding_window_size"]
+        row["train_rows"] = len(train)
+        row["test_rows"] = len(test)
+        row["fingerprint_accuracy"] = (
+            fingerprint_correct / fingerprint_total if fingerprint_total else 0
+        )
+        row.update(timings)
+        rows.append(row)
+    return rows
+
+
+class CrossValidation:
+    def __init__(
+        self,
+        dataset,
+        ja_version,
+        min_support,
+        sliding_window_size,
+        candidate_size,
+        folds=5,
+        scheme="blocked",
+        workers=1,
+    ):
+        self.dataset = dataset
+        self.ja_version = ja_version
+        self.min_support = min_support
+        self.sliding_window_size = sliding_window_size
+        self.candidate_size = candidate_size
+        self.folds = folds
+        self.scheme = scheme
+        self.workers = workers
+        self.timings = {}
+
+    def run(self):
+        with Logger() as logger:
+            start_time = time.time()
+            db = Database(self.dataset)
+            folds = fold_positions(db.df, self.folds, self.scheme)
+            # rows of the default split are not needed by folds
+            db.train_df = db.test_df = None
+            self.timings["load"] = time.time() - start_time
+            logger.info(
+                "Cross-validation with %s %s folds, loaded in %.2f s",
+                self.folds,
+                self.scheme,
+                self.timings["load"],
+            )
+
+            parameters = {
+                "ja_version": self.ja_version,
+                "min_support": self.min_support,
+                "sliding_window_size": self.sliding_window_size,
+                "candidate_size": self.candidate_size,
+            }
+            _shared.update(db=db, folds=folds, parameters=parameters)
+            start_time = time.time()
+            try:
+                if self.workers > 1:
+                    with ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("fork"),
+                    ) as executor:
+                        results = list(executor.map(_evaluate_fold, range(self.folds)))
+                else:
+                    results = [_evaluate_fold(fold) for fold in range(self.folds)]
+            finally:
+                _shared.clear()
+            self.timings["folds"] = time.time() - start_time
+
+            return [row for rows in results for row in rows]
+
+    def summary(self, rows):
+        """mean and standard deviation of accuracies over folds per scope (is_comb)"""
+        summary = {}
+        for is_comb in (False, True):
+            scope_rows = [row for row in rows if row["is_comb"] == is_comb]
+            summary[is_comb] = {
+                metric: (
+                    float(np.mean([row[metric] for row in scope_rows])),
+                    float(np.std([row[metric] for row in scope_rows])),
+                )
+                for metric in ("fingerprint_accuracy", "accuracy_overall", "guess_perc_1")
+            }
+        return summary
+
+    def export_to_csv(self, rows, csv_file):
+        headers = [
+            "fold",
+            "is_comb",
+            "min_support",
+            "sliding_window_size",
+            "candidate_size",
+            "ja_version",
+            "train_rows",
+            "test_rows",
+            "fingerprint_accuracy",
+            "correct",
+            "incorrect",
+            "empty_candidates",
+            "total",
+            "accuracy_overall",
+            "error_rate",
+            "empty_ja",
+            "pure_context",
+            "context_using_whole_db",
+            "avg_len_of_candidates",
+            "lookup_time",
+            "train_time",
+            "fingerprint_time",
+            "context_time",
+        ]
+        headers += [f"guess_{i}" for i in range(1, self.candidate_size + 1)]
+        headers += [f"guess_perc_{i}" for i in range(1, self.candidate_size + 1)]
+
+        with open(csv_file, mode="w", newline="") as csvfile:
+            csv_writer = csv.DictWriter(csvfile, fieldnames=headers, delimiter=";")
+            csv_writer.writeheader()
+            csv_writer.writerows(rows)
+
+    def display_results(self, rows):
+        print(f"Load: {round(self.timings['load'], 2)} s")
+        print(f"Folds ({self.workers} processes): {round(self.timings['folds'], 2)} s\n")
+        print(
+            f"{'fold':<6}{'comb':<6}{'train':<8}{'test':<7}{'fp acc':<9}{'accuracy':<10}"
+            f"{'1. guess':<10}{'lookup':<8}{'train':<8}{'fp':<8}{'context':<8}"
+        )
+        for row in rows:
+            print(
+                f"{row['fold']:<6}{str(row['is_comb']):<6}{row['train_rows']:<8}{row['test_rows']:<7}"
+                f"{round(row['fingerprint_accuracy'], 4):<9}{round(row['accuracy_overall'], 4):<10}"
+                f"{round(row['guess_perc_1'], 4):<10}{round(row['lookup_time'], 2):<8}"
+                f"{round(row['train_time'], 2):<8}{round(row['fingerprint_time'], 2):<8}"
+                f"{round(row['context_time'], 2):<8}"
+            )
+
+        print()
+        for is_comb, metrics in self.summary(rows).items():
+            ja_version = self.ja_version
+            print(
+                f"JA{ja_version} + JA{ja_version}S + SNI:" if is_comb else f"JA{ja_version}:"
+            )
+            for metric, (mean, std) in metrics.items():
+                print(f"  {metric}: {round(mean, 4)} ± {round(std, 4)}")
@@ -4,37 +4,122 @@ Description: This file contains databases for storing fingerprints.
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 15/11/2024
-Updated: 05/05/2025
+Updated: 19/10/2026
 """
 
 import config as col_names
 from .logger import Logger
+from .metrics import metrics
+from .pattern_store import PatternStore
+from .readers import COLUMNS, detect_format, read_dataframe
+
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
 
 import pandas as pd
-from sklearn.model_selection import train_test_split
+
+
+def _read_dataset_file(file):
+    # Worker of parallel ingestion, parses only columns kept in db and drops rows of type A and M,
+    # so less data is sent back to the main process.
+    keep = set(col_names.columns_to_keep_in_db) | {col_names.TYPE}
+    if detect_format(file) != "csv":
+        df = read_dataframe(file, [column for column in COLUMNS if column in keep])
+    else:
+        df = pd.read_csv(file, delimiter=";", usecols=lambda column: column in keep)
+    return df[~df[col_names.TYPE].isin(["A", "M"])]
+
+
+def split_launches(df):
+    """splits rows of every launch (file) in order, first 75 % for training and the rest for testing
+
+    Returns:
+        tuple: of lists of training and testing parts of launches, in order of file names.
+    """
+    # scikit-learn is imported only when dataset is split, not when model is used for inference
+    from sklearn.model_selection import train_test_split
+
+    with Logger() as logger:
+        train_list = []
+        test_list = []
+        # Group dataset by file
+        groups = df.groupby(col_names.FILE)
+        single_occurrence = 0
+        for _, group in groups:
+            if len(group) > 1:
+                # If group has more than one row, split it into train and test df.
+                train_group, test_group = train_test_split(
+                    group, test_size=0.25, shuffle=False
+                )
+                train_list.append(train_group)
+                test_list.append(test_group)
+
+            else:
+                single_occurrence += 1
+                logger.warn(
+                    "File: %s has only one row. Occurrence: %s",
+                    group[col_names.FILE].values[0],
+                    single_occurrence,
+                )
+                # Single occurrences append to the training dataset.
+                train_list.append(group)
+        return train_list, test_list
 
 
 class Database:
-    def __init__(self, dataset: str):
+    def __init__(self, dataset, workers=None):
+        """
+        Args:
+            dataset (str | list): Path to CSV file, directory with CSV files, glob pattern or list of them.
+                Zeek ssl.log and Suricata eve.json files are read directly by streaming readers.
+            workers (int): Number of processes parsing multiple files, defaults to number of CPUs.
+        """
         self.dataset = dataset
+        self.workers = workers
         self.df = {}
         self.lookup_table = {}  # lookup table for fingerprinting
-        self.frequent_patterns = {}  # lookup table for frequent patterns
+        self.frequent_patterns = PatternStore()  # lookup table for frequent patterns
         self.train_df = {}
         self.test_df = {}
         self.ja_version = None
         self.context_results = {}
         self.fingerprinting_results = {}
 
-        self.handle_file(dataset)
-        self.filter_out_dataset()
-        self.split_dataset()
+        with metrics.timer("load"):
+            self.handle_file(dataset)
+        with metrics.timer("filter"):
+            self.filter_out_dataset()
+        with metrics.timer("split"):
+            self.split_dataset()
+
+    @staticmethod
+    def resolve_files(dataset):
+        # Expand directories and glob patterns, sorted so the merged dataset has deterministic order.
+        paths = [dataset] if isinstance(dataset, str) else list(dataset)
+        files = []
+        for path in paths:
+            if os.path.isdir(path):
+                files.extend(sorted(glob.glob(os.path.join(path, "*.csv"))))
+            elif glob.has_magic(path):
+                files.extend(sorted(glob.glob(path)))
+            else:
+                files.append(path)
+        return files
 
     def handle_file(self, file):
         with Logger() as logger:
             logger.info("Parsing dataset ...")
+            files = self.resolve_files(file)
             try:
-                self.df = pd.read_csv(file, delimiter=";")
+                if not files:
+                    raise FileNotFoundError(file)
+                if len(files) == 1 and detect_format(files[0]) != "csv":
+                    self.df = read_dataframe(files[0])
+                elif len(files) == 1:
+                    self.df = pd.read_csv(files[0], delimiter=";")
+                else:
+                    self.df = self.handle_files(files)
             except FileNotFoundError:
                 logger.error("File not found.")
                 print("File not found.")
@@ -44,6 +129,17 @@ class Database:
                 print("File is empty.")
                 exit(1)
 
+    def handle_files(self, files):
+        with Logger() as logger:
+            workers = min(self.workers or os.cpu_count() or 1, len(files))
+            logger.info("Parsing %s files using %s processes ...", len(files), workers)
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    frames = list(executor.map(_read_dataset_file, files))
+            else:
+                frames = [_read_dataset_file(file) for file in files]
+            return pd.concat(frames, ignore_index=True)
+
     def filter_out_dataset(self):
         with Logger() as logger:
             # filter out rows with type A
@@ -56,48 +152,35 @@ class Database:
 
     def split_dataset(self):
         with Logger() as logger:
-            train_list = []
-            test_list = []
-            # Group dataset by file
-            groups = self.df.groupby(col_names.FILE)
-            single_occurrence = 0
-            for _, group in groups:
-                if len(group) > 1:
-                    # If group has more than one row, split it into train and test df.
-                    train_group, test_group = train_test_split(
-                        group, test_size=0.25, shuffle=False
-                    )
-                    train_list.append(train_group)
-                    test_list.append(test_group)
-
-                else:
-                    single_occurrence += 1
-                    logger.warn(
-                        f"File: {group[col_names.FILE].values[0]} has only one row. Occurrence: {single_occurrence}"
-                    )
-                    # Single occurrences append to the training dataset.
-                    train_list.append(group)
+            train_list, test_list = split_launches(self.df)
 
             self.train_df = pd.concat(train_list)
             self.test_df = pd.concat(test_list)
 
             logger.info(f"training dataset: {len(self.train_df)}")
-            logger.debug(f"{self.train_df}")
+            logger.debug("%s", self.train_df)
 
             logger.info(f"testing dataset: {len(self.test_df)}")
-            logger.debug(f"{self.test_df}")
+            logger.debug("%s", self.test_df)
 
     def create_lookup_table(self, ja_version):
-        with Logger() as logger:
+        """
+        Args:
+            ja_version (int | list): JA version or list of versions, tables of all their keys are built in one scan.
+        """
+        with Logger() as logger, metrics.timer("lookup_build"):
             logger.info("Creating lookup table ...")
 
             self.ja_version = ja_version
-            ja_keys = col_names.get_keys(ja_version)
+            versions = ja_version if isinstance(ja_version, list) else [ja_version]
+            ja_keys = list(
+                dict.fromkeys(key for version in versions for key in col_names.get_keys(version))
+            )
 
             # init lookup tables for every
             self.lookup_table = {key: {} for key in ja_keys}
 
-            for index, row in self.train_df.iterrows():
+            for index, row in self.get_train_df().iterrows():
                 # get app name and ja keys
                 app_name = row[col_names.APP_NAME]
 
@@ -117,10 +200,10 @@ class Database:
     def log_lookup_table(self):
         with Logger() as logger:
             logger.debug("Printing lookup tables ...")
-            for col in col_names.get_keys(self.ja_version):
+            for col in self.lookup_table:
                 logger.info(f"Table: {col}")
                 for key, value in self.lookup_table[col].items():
-                    logger.debug(f"key: {key}, value: {value}")
+                    logger.debug("key: %s, value: %s", key, value)
 
     def get_app(self, type, value):
         return self.lookup_table[type].get(value, set())
@@ -130,3 +213,12 @@ class Database:
 
     def get_test_df(self):
         return self.test_df
+
+    def get_shuffled_test_data(self, shuffle_order):
+        """testing rows in shuffled order
+
+        Args:
+            shuffle_order (callable): Returns positions of rows of given testing df in shuffled order.
+        """
+        test_df = self.get_test_df()
+        return test_df.take(shuffle_order(test_df)).reset_index(drop=True)
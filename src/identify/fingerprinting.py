@@ -4,19 +4,30 @@ Description: This file contains methods for identification of applications using
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 15/11/2024
-Updated: 13/05/2025
+Updated: 19/10/2026
 """
 
 from config import get_keys, APP_NAME
-from .database import Database
 from .logger import Logger
+from .metrics import metrics
+from .sni_trie import SNITrie
+
+from typing import TYPE_CHECKING
 
 import numpy as np
 
+if TYPE_CHECKING:
+    # Database (pandas, scikit-learn) is not imported by inference-only runtime
+    from .database import Database
+
 
 class FingerprintingMethod:
-    def __init__(self, version):
+    def __init__(self, version, sni_match="exact"):
         self.version = version
+        # SNI missing in lookup table can be matched by registrable domain or suffix in trie
+        self.sni_match = sni_match
+        self.sni_trie = None
+        self.sni_trie_matches = 0
         self.JA_key, self.JAS_key, self.SNI_key = get_keys(version)
         with Logger() as logger:
             logger.info(f"Selecting JA{version} version")
@@ -78,6 +89,8 @@ class FingerprintingMethod:
         print(f"Modus len of candidates: {round(modus_len, 4)}")
         print(f"Max len of candidates: {max(len_cand_comb)}")
         print(f"Min len of candidates: {min(len_cand_comb)}\n")
+        if self.sni_match != "exact" or self.sni_trie_matches:
+            print(f"SNI matched by {self.sni_match}: {self.sni_trie_matches}\n")
 
     def _resolve_and_update(self, appname, candidates):
         self.len_candidates.append(len(candidates))
@@ -93,7 +106,7 @@ class FingerprintingMethod:
         else:
             self.incorrect_combination += 1
 
-    def get_ja_candidates(self, tls_entry, db: Database):
+    def get_ja_candidates(self, tls_entry, db: "Database"):
         # extract JA hash and app name from one row of ds
         ja = tls_entry[self.JA_key]
 
@@ -101,13 +114,15 @@ class FingerprintingMethod:
         ja_candidates = db.get_app(self.JA_key, ja)
         return ja_candidates
 
-    def get_ja_comb_candidates(self, tls_entry, db: Database, ja_candidates):
+    def get_ja_comb_candidates(self, tls_entry, db: "Database", ja_candidates):
         # extract JA hash and app name from one row of ds
         jas = tls_entry[self.JAS_key]
         sni = tls_entry[self.SNI_key]
 
         jas_candidates = db.get_app(self.JAS_key, jas)
         sni_candidates = db.get_app(self.SNI_key, sni)
+        if not sni_candidates:
+            sni_candidates = self._match_sni(sni, db)
 
         # filter out empty sets
         non_empty_sets = [
@@ -124,11 +139,27 @@ class FingerprintingMethod:
 
         return candidates
 
-    def identify(self, db: Database):
-        with Logger() as logger:
+    def _match_sni(self, sni, db):
+        # Trie is built on first use from SNI lookup table of database or model.
+        if self.sni_trie is None:
+            # exact mode needs only wildcard domains, others are matched by the lookup table
+            self.sni_trie = SNITrie.from_lookup_table(
+                db.lookup_table[self.SNI_key], wildcards_only=self.sni_match == "exact"
+            )
+            with Logger() as logger:
+                logger.info("SNI trie built with %s domains", self.sni_trie.size)
+        if not self.sni_trie.size:
+            return set()
+        candidates = self.sni_trie.get(sni, self.sni_match)
+        if candidates:
+            self.sni_trie_matches += 1
+        return candidates
+
+    def identify(self, db: "Database"):
+        with Logger() as logger, metrics.timer("fingerprint_identify"):
             logger.info("Identifying using fingerprinting method...")
             # iterate over test dataset and check if app name is in set of candidates
-            for index, row in db.test_df.iterrows():
+            for index, row in db.get_test_df().iterrows():
                 # get real app name
                 appname = row[APP_NAME]
 
@@ -0,0 +1,133 @@
+"""
+File: inference.py
+Description: This file contains inference-only runtime, which loads trained model (main.py --save_model) and
+             classifies records (dicts with column names of config.py) without importing pandas, scikit-learn
+             or mlxtend, these are needed only by training. Identification server classifies records
+             with it as well, sliding window is applied within one batch. Fallbacks of context are the
+             same as of JA_Context (ContextCascade).
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as CONFIG
+from .context_cascade import ContextCascade, FallbackCounters
+from .fingerprinting import FingerprintingMethod
+from .model import Model
+
+import heapq
+
+
+class InferenceClassifier(ContextCascade):
+    def __init__(self, model: Model, sliding_window_size, top_k):
+        """
+        Args:
+            model (Model): Trained model.
+            sliding_window_size (int): Size of sliding window within one batch.
+            top_k (int): Maximum number of guesses returned per record.
+        """
+        self.model = model
+        self.sliding_window_size = sliding_window_size
+        self.top_k = top_k
+        self.fingerprinting = FingerprintingMethod(model.ja_version)
+        self.columns = list(
+            dict.fromkeys(
+                [CONFIG.APP_NAME, CONFIG.FILE]
+                + CONFIG.get_keys(model.ja_version)
+                + model.context_columns
+            )
+        )
+        # window items of the same columns as Apriori uses for context
+        self.context_columns = [
+            column for column in CONFIG.columns_to_keep_for_context if column in self.columns
+        ]
+
+        # fallback counters of context, kept by Apriori in training
+        self.context = FallbackCounters()
+
+    @classmethod
+    def load(cls, path, sliding_window_size, top_k):
+        return cls(Model.load(path), sliding_window_size, top_k)
+
+    def classify(self, records, top_k=None):
+        """classifies batch of records
+
+        Returns:
+            list: per record JA and combination candidates and top-k guesses with fingerprint and context scores.
+        """
+        top_k = min(top_k or self.top_k, self.top_k)
+        if not records:
+            return []
+
+        # Missing columns are None, same as null values of records received by server.
+        batch = [{column: record.get(column) for column in self.columns} for record in records]
+
+        num_records = len(batch)
+        window_size = min(self.sliding_window_size, num_records)
+        half_window = window_size // 2
+
+        results = []
+        for index, row in enumerate(batch):
+            window_start = min(max(index - half_window, 0), num_records - window_size)
+            window = batch[window_start : window_start + window_size]
+
+            ja_candidates = self.fingerprinting.get_ja_candidates(row, self.model)
+            comb_candidates = self.fingerprinting.get_ja_comb_candidates(
+                row, self.model, ja_candidates
+            )
+
+            ja_context = self._context(ja_candidates, window, is_comb=False)
+            comb_context = self._context(comb_candidates, window, is_comb=True)
+
+            results.append(
+                {
+                    "ja_candidates": sorted(ja_candidates),
+                    "comb_candidates": sorted(comb_candidates),
+                    "ja_guesses": self._guesses(row, ja_context, top_k),
+                    "guesses": self._guesses(row, comb_context, top_k),
+                }
+            )
+        return results
+
+    def _context(self, candidates, window, is_comb):
+        db_subset = self._filter_frequent_patterns(self.model, candidates)
+        return self._find_context_candidates(db_subset, self.model, window, is_comb)
+
+    def _score(self, patterns, window, branch, is_comb):
+        # Same scores as Apriori.find_similarity.
+        if not patterns:
+            return []
+        tls_set = frozenset(row[column] for row in window for column in self.context_columns)
+        scores = patterns.normalized_scores(tls_set)
+        return heapq.nlargest(self.top_k, scores.items(), key=lambda x: x[1])
+
+    def _guesses(self, row, context, top_k):
+        return [
+            {
+                "app": app,
+                "fingerprint_score": self._fingerprint_score(row, app),
+                "context_score": float(score),
+            }
+            for app, score in context[:top_k]
+        ]
+
+    def _fingerprint_score(self, row, app):
+        # Share of fingerprints (JA, JAS, SNI) of the record which were seen with the app.
+        keys = (
+            self.fingerprinting.JA_key,
+            self.fingerprinting.JAS_key,
+            self.fingerprinting.SNI_key,
+        )
+        matches = sum(1 for key in keys if app in self.model.get_app(key, row[key]))
+        return matches / len(keys)
+
+    def statistics(self):
+        return {
+            "ja_version": self.model.ja_version,
+            "apps": len(self.model.frequent_patterns),
+            "context_using_whole_db": self.context.context_using_whole_db,
+            "context_using_whole_db_comb": self.context.context_using_whole_db_comb,
+            "pure_context": self.context.pure_context,
+            "pure_context_comb": self.context.pure_context_comb,
+        }
@@ -0,0 +1,110 @@
+"""
+File: ja4_index.py
+Description: This file contains index over sections of JA4/JA4S fingerprints (a_b_c) and their truncated prefixes.
+             It narrows candidate apps of hashes unseen in the lookup table, so context does not have to
+             score the whole database of frequent patterns.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as CONFIG
+from .logger import Logger
+
+from collections import Counter
+
+import pandas as pd
+
+# Components of JA4 hash ordered from the most specific to the least specific one.
+# Section a holds protocol, TLS version, SNI flag, number of ciphers and extensions and ALPN,
+# section b hash of ciphers (JA4S: chosen cipher) and section c hash of extensions.
+LEVELS = [
+    ("ab", lambda a, b, c: f"{a}_{b}"),
+    ("ac", lambda a, b, c: f"{a}_{c}"),
+    ("bc", lambda a, b, c: f"{b}_{c}"),
+    ("b", lambda a, b, c: b),
+    ("c", lambda a, b, c: c),
+    ("a", lambda a, b, c: a),
+    ("a_prefix", lambda a, b, c: a[:-2]),  # section a without ALPN
+]
+
+
+def _sections(value):
+    if not isinstance(value, str):
+        return None
+    sections = value.split("_")
+    return sections if len(sections) == 3 else None
+
+
+class JA4Index:
+    def __init__(self, lookup_table, keys=(CONFIG.JA4, CONFIG.JA4_S)):
+        """
+        Args:
+            lookup_table (dict): Lookup table of database (column -> hash -> set of apps).
+            keys (tuple): Columns with JA4 like hashes to index.
+        """
+        self.keys = [key for key in keys if key in lookup_table]
+        # column -> level -> component -> set of apps
+        self.index = {key: {level: {} for level, _ in LEVELS} for key in self.keys}
+        self.level_hits = Counter()
+
+        for key in self.keys:
+            for value, apps in lookup_table[key].items():
+                sections = _sections(value)
+                if sections is None:
+                    continue
+                for level, component in LEVELS:
+                    self.index[key][level].setdefault(component(*sections), set()).update(
+                        apps
+                    )
+
+        with Logger() as logger:
+            logger.info("JA4 section index built for %s", self.keys)
+
+    def get_partial(self, key, value):
+        """returns apps sharing the most specific matching component of unseen hash
+
+        Args:
+            key (str): Indexed column.
+            value (str): JA4 or JA4S hash.
+
+        Returns:
+            set: of apps, empty if no component matches.
+        """
+        sections = _sections(value)
+        if key not in self.index or sections is None:
+            return set()
+        for level, component in LEVELS:
+            apps = self.index[key][level].get(component(*sections))
+            if apps:
+                self.level_hits[level] += 1
+                return apps
+        return set()
+
+    def narrow(self, row, db, keys):
+        """narrows candidate apps of one record, seen values are resolved exactly, unseen
+        JA4/JA4S hashes by their sections
+
+        Args:
+            row (Series): TLS record.
+            db (Database): Database with lookup table.
+            keys (list): Columns used for candidates.
+
+        Returns:
+            set: of candidate apps, intersection of non-empty sets or their union if they are disjoint.
+        """
+        sets = []
+        for key in keys:
+            value = row[key]
+            if pd.isna(value):
+                continue
+            apps = db.get_app(key, value)
+            if not apps:
+                apps = self.get_partial(key, value)
+            if apps:
+                sets.append(apps)
+
+        if not sets:
+            return set()
+        return set.intersection(*sets) or set.union(*sets)
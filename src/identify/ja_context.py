@@ -4,31 +4,64 @@ Description: This file contains the JA_Context class that implements the JA3/4 f
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 15/11/2024
-Updated: 09/05/2025
+Updated: 19/10/2026
 """
 
 import config as CONFIG
 from .database import Database
 from .fingerprinting import FingerprintingMethod
 from .pattern_matching import Apriori
+from .context_cascade import ContextCascade
 from .logger import Logger
+from .metrics import metrics
+from .ja4_index import JA4Index
 
 import numpy as np
-import pandas as pd
 
+# Fallbacks which score whole db or its complement, they are narrowed by MinHashLSH.
+LSH_BRANCHES = ("whole_db", "complement", "complement_full")
 
-class JA_Context:
+
+class JA_Context(ContextCascade):
     def __init__(
         self,
         fingerprinting: FingerprintingMethod,
         context: Apriori,
         sliding_window_size,
+        cascade=False,
+        partial_match=False,
     ):
         self.context = context
         self.fingerprinting = fingerprinting
         self.sliding_window_size = sliding_window_size
+        # cascade mode returns decisive fingerprint answers without context scoring
+        self.cascade = cascade
+        self.context.cascade = cascade
+        # last context resolution per scope (is_comb) as (candidates, window items, result, branch)
+        self._last_resolved = {False: None, True: None}
+        # partial match narrows candidates by JA4 sections instead of scoring whole db
+        self.partial_match = partial_match
+        self.context.partial_match = partial_match
+        self.ja4_index = None
+        # optional per-record log of predictions (ResultsSink)
+        self.results_sink = None
+        # branch of context which produced last resolution per scope (is_comb)
+        self._branch = {False: None, True: None}
+        # optional cache of top guesses of (selected apps, window items) (ScoreCache)
+        self.score_cache = None
+        # optional approximate shortlist of apps for fallbacks scoring many apps (MinHashLSH)
+        self.lsh = None
 
     def shuffle_df(self, df):
+        # Shuffled test data is taken from rows of test data by positions in one step.
+        return df.take(self.shuffle_order(df)).reset_index(drop=True)
+
+    def shuffle_order(self, df):
+        """positions of rows of df in shuffled order, launches of apps alternate
+
+        Returns:
+            array: of positions of rows, rows of one launch stay together and in order.
+        """
         grouped_by_file = df.groupby(CONFIG.FILE)
         grouped_by_app = df.groupby(CONFIG.APP_NAME)
 
@@ -49,10 +82,10 @@ class JA_Context:
                 if lookup[app]:  # If there are files left for this app
                     shuffled_filenames.append(lookup[app].pop(0))  # Take one file
 
-        # Reconstruct DataFrame in the new order
-        return pd.concat(
-            [grouped_by_file.get_group(fname) for fname in shuffled_filenames]
-        ).reset_index(drop=True)
+        positions = grouped_by_file.indices
+        if not shuffled_filenames:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([positions[fname] for fname in shuffled_filenames])
 
     def _log_apps_in_window(self, window):
         with Logger() as logger:
@@ -60,13 +93,15 @@ class JA_Context:
             apps_in_window = []
             for _, file in files_in_window:
                 apps_in_window.append(file[CONFIG.APP_NAME].iloc[0])
-            logger.debug(f"Apps in window: {apps_in_window}")
+            logger.debug("Apps in window: %s", apps_in_window)
 
-    def identify(self, db: Database):
-        with Logger() as logger:
+    def identify(self, db: Database, test_df=None):
+        with Logger() as logger, metrics.timer("context_identify"):
             self._log_identification_start()
 
-            test_df = self._prepare_test_data(db)
+            # shuffled test data can be shared by evaluations of more versions
+            if test_df is None:
+                test_df = self._prepare_test_data(db)
             num_test_launches = len(test_df)
             self.context.number_of_tls = num_test_launches
 
@@ -75,6 +110,8 @@ class JA_Context:
                 f"number of test launches: {num_test_launches}"
             )
             self.context.sliding_window_size = self.sliding_window_size
+            if self.partial_match:
+                self.ja4_index = JA4Index(db.lookup_table)
             for i in range(num_test_launches):
                 self._process_window(i, test_df, db)
 
@@ -85,8 +122,7 @@ class JA_Context:
             )
 
     def _prepare_test_data(self, db: Database):
-        test_df = db.get_test_df()
-        return self.shuffle_df(test_df)
+        return db.get_shuffled_test_data(self.shuffle_order)
 
     def _slide_window(self, index: int, test_df):
         window_size = self.sliding_window_size
@@ -101,25 +137,40 @@ class JA_Context:
 
         with Logger() as logger:
             logger.debug(
-                f"Window position: start={window_start}, end={window_start + window_size - 1}"
+                "Window position: start=%s, end=%s",
+                window_start,
+                window_start + window_size - 1,
             )
-            logger.debug(f"Row index within window: {row_index_within_window}")
-            logger.debug(f"Real app: {row[CONFIG.APP_NAME]}")
+            logger.debug("Row index within window: %s", row_index_within_window)
+            logger.debug("Real app: %s", row[CONFIG.APP_NAME])
 
         return window, row
 
     def _process_window(self, index: int, test_df, db: Database):
-        window, row = self._slide_window(index, test_df)
-        real_app = row[CONFIG.APP_NAME]
+        with metrics.timer("context_window"):
+            window, row = self._slide_window(index, test_df)
+            real_app = row[CONFIG.APP_NAME]
 
-        self._log_apps_in_window(window)
+            if CONFIG.DEBUG_ENABLED:
+                self._log_apps_in_window(window)
 
-        ja_candidates = self._get_ja_candidates(row, db)
-        ja_comb_candidates = self._get_ja_comb_candidates(row, db, ja_candidates)
+            ja_candidates = self._get_ja_candidates(row, db)
+            ja_comb_candidates = self._get_ja_comb_candidates(row, db, ja_candidates)
 
-        self._evaluate_context_and_update_stats(
-            db, window, real_app, ja_candidates, ja_comb_candidates
-        )
+            ja_context, ja_comb_context = self._evaluate_context_and_update_stats(
+                db, window, row, ja_candidates, ja_comb_candidates
+            )
+
+            if self.results_sink is not None:
+                self.results_sink.add(
+                    self.fingerprinting.version,
+                    index,
+                    int(window.index[0]),
+                    row,
+                    {False: ja_candidates, True: ja_comb_candidates},
+                    {False: ja_context, True: ja_comb_context},
+                    dict(self._branch),
+                )
 
     def _get_ja_candidates(self, row, db):
         with Logger() as logger:
@@ -128,7 +179,7 @@ class JA_Context:
                 logger.warn("Empty JA candidates")
                 self.context.empty_ja += 1
             else:
-                logger.debug(f"JA: {candidates}")
+                logger.debug("JA: %s", candidates)
             return candidates
 
     def _get_ja_comb_candidates(self, row, db, ja_candidates):
@@ -141,105 +192,141 @@ class JA_Context:
                 logger.warn("Empty JA_comb candidates")
                 self.context.empty_ja_comb += 1
             else:
-                logger.debug(f"JA COMB: {candidates}")
+                logger.debug("JA COMB: %s", candidates)
             return candidates
 
     def _evaluate_context_and_update_stats(
-        self, db, window, real_app, ja_candidates, ja_comb_candidates
+        self, db, window, row, ja_candidates, ja_comb_candidates
     ):
+        real_app = row[CONFIG.APP_NAME]
         with Logger() as logger:
-            db_for_ja = self._filter_frequent_patterns(db, ja_candidates)
-            db_for_ja_comb = self._filter_frequent_patterns(db, ja_comb_candidates)
-
-            ja_context = self._find_context_candidates(
-                db_for_ja, db, window, is_comb=False
+            ja_context = self._resolve_candidates(
+                db, window, row, ja_candidates, is_comb=False
             )
-            logger.debug(f"CONTEXT (JA) : {[app for (app, score) in ja_context]}")
+            logger.debug(lambda: f"CONTEXT (JA) : {[app for (app, _) in ja_context]}")
             self.context._update_statistics(real_app, ja_context, is_comb=False)
 
-            ja_comb_context = self._find_context_candidates(
-                db_for_ja_comb, db, window, is_comb=True
+            ja_comb_context = self._resolve_candidates(
+                db, window, row, ja_comb_candidates, is_comb=True
             )
             logger.debug(
-                f"CONTEXT (JA COMB): {[app for (app, score) in ja_comb_context]}\n"
+                lambda: f"CONTEXT (JA COMB): {[app for (app, _) in ja_comb_context]}\n"
             )
             self.context._update_statistics(real_app, ja_comb_context, is_comb=True)
+            return ja_context, ja_comb_context
 
-    def _filter_frequent_patterns(self, db, candidates):
-        if not candidates:
-            return {}
-        # Filter candidates to only include those present in the database
-        return {
-            key: db.frequent_patterns[key]
-            for key in candidates
-            if key in db.frequent_patterns
-        }
-
-    def _find_context_candidates(self, db_subset, db, window, is_comb):
-        """finds candidates using context
+    def _resolve_candidates(self, db, window, row, candidates, is_comb):
+        """resolves candidates from fingerprinting, using context only when needed
 
         Args:
-            db_subset (dict): Subset of the database to search for candidates.
-            db (dict): Database containing the frequent patterns.
+            db (Database): Database containing the frequent patterns.
             window (df): Sliding window of data to analyze.
+            row (Series): Identified record, real application name is used for cascade statistics.
+            candidates (set): Candidates found by fingerprinting method.
             is_comb (bool): Flag indicating if the context is for a combination of fingerprints.
 
         Returns:
-            list: of top N candidates found using patterns and shortened database.
+            list: of top N candidates with their scores.
         """
-        with Logger() as logger:
-            if not db_subset:
-                self._log_empty_subset(logger, is_comb)
-                return self.context.find_similarity(db.frequent_patterns, window)
-
-            candidates = self.context.find_similarity(db_subset, window)
-
-            if not candidates:
-                logger.info("No candidates found. Falling back to pure context.")
-                return self._use_pure_context(
-                    db.frequent_patterns, db_subset, window, is_comb
-                )
-
-            return candidates
-
-    def _log_empty_subset(self, logger, is_comb):
-        context_label = "[comb]" if is_comb else ""
-        logger.info(
-            f"Subset of DB is empty, using whole database for context. {context_label}"
-        )
+        self._branch[is_comb] = None
+        if not self.cascade:
+            db_subset = self._filter_frequent_patterns(db, candidates)
+            return self._find_context_candidates(db_subset, db, window, is_comb, row)
 
-        if is_comb:
-            self.context.context_using_whole_db_comb += 1
-        else:
-            self.context.context_using_whole_db += 1
+        real_app = row[CONFIG.APP_NAME]
 
-    def _use_pure_context(self, patterns, db_subset, window, is_comb):
-        with Logger() as logger:
-            context_type = "[comb]" if is_comb else ""
-            logger.info(
-                f"Failed to find similarity with subset db. Falling back to pure context using complement of db. {context_type}"
+        scope = "comb" if is_comb else "ja"
+        # Fingerprint is unambiguous, context can not improve the answer.
+        if len(candidates) == 1:
+            metrics.increment("context_branch", branch="cascade_singleton", scope=scope)
+            self._branch[is_comb] = "cascade_singleton"
+            result = [(next(iter(candidates)), 1.0)]
+            self.context._update_cascade_statistics(
+                real_app, result, is_comb, reused=False
+            )
+            return result
+
+        # Same candidates over the same window items were just resolved.
+        window_items = self.context._window_items(window)
+        last = self._last_resolved[is_comb]
+        if last is not None and last[0] == candidates and last[1] == window_items:
+            _, _, result, branch = last
+            # reused resolution is reported under the branch which produced it
+            metrics.increment("cascade_reused", branch=branch, scope=scope)
+            self._branch[is_comb] = branch
+            self._count_fallback(branch, is_comb)
+            self.context._update_cascade_statistics(
+                real_app, result, is_comb, reused=True
             )
+            return result
+
+        db_subset = self._filter_frequent_patterns(db, candidates)
+        result = self._find_context_candidates(db_subset, db, window, is_comb, row)
+        self._last_resolved[is_comb] = (
+            frozenset(candidates),
+            window_items,
+            result,
+            self._branch[is_comb],
+        )
+        return result
 
+    def _count_fallback(self, branch, is_comb):
+        # Counters of fallbacks taken by resolution of given branch, as if it was resolved again.
+        if branch == "whole_db":
+            if is_comb:
+                self.context.context_using_whole_db_comb += 1
+            else:
+                self.context.context_using_whole_db += 1
+        elif branch in ("complement", "complement_full"):
             self._increment_pure_context_counter(is_comb)
+        elif branch == "partial_match":
+            if is_comb:
+                self.context.partial_match_comb += 1
+            else:
+                self.context.partial_match_count += 1
 
-            logger.debug(f"Database subset keys: {list(db_subset.keys())}")
-
-            db_complement = self._get_db_complement(patterns, db_subset)
-            logger.debug(f"Database complement keys: {list(db_complement.keys())}")
-
-            candidates = self.context.find_similarity(db_complement, window)
-
-            if not candidates:
-                logger.info("No candidates found in complement. Using full patterns.")
-                candidates = self.context.find_similarity(patterns, window)
-
-            return candidates
-
-    def _increment_pure_context_counter(self, is_comb):
+    def _find_partial_match_candidates(self, db, window, row, is_comb):
+        # Narrow patterns by sections of unseen JA4/JA4S hashes before falling back to whole db.
+        keys = [self.fingerprinting.JA_key]
         if is_comb:
-            self.context.pure_context_comb += 1
-        else:
-            self.context.pure_context += 1
-
-    def _get_db_complement(self, patterns, db_subset):
-        return {key: value for key, value in patterns.items() if key not in db_subset}
+            keys += [self.fingerprinting.JAS_key, self.fingerprinting.SNI_key]
+        narrowed = self.ja4_index.narrow(row, db, keys)
+        db_subset = self._filter_frequent_patterns(db, narrowed)
+        if not db_subset:
+            return []
+
+        candidates = self._score(db_subset, window, "partial_match", is_comb)
+        if candidates:
+            with Logger() as logger:
+                logger.info(
+                    "Whole database avoided, partial match narrowed db to %s apps. %s",
+                    len(db_subset),
+                    "[comb]" if is_comb else "",
+                )
+            if is_comb:
+                self.context.partial_match_comb += 1
+            else:
+                self.context.partial_match_count += 1
+        return candidates
+
+    def _score(self, patterns, window, branch, is_comb):
+        # Context scoring of one branch, measured per scope for metrics report.
+        scope = "comb" if is_comb else "ja"
+        metrics.increment("context_branch", branch=branch, scope=scope)
+        self._branch[is_comb] = branch
+        with metrics.timer("context_scoring", branch=branch, scope=scope):
+            if self.lsh is not None and branch in LSH_BRANCHES:
+                patterns = self.lsh.shortlist(patterns, window)
+            if self.score_cache is None or not patterns:
+                return self.context.find_similarity(patterns, window)
+            window_items = self.context._window_items(window)
+            key = self.score_cache.key(patterns, window_items)
+            scores = self.score_cache.get(key)
+            if scores is not None:
+                metrics.increment("score_cache", result="hit", scope=scope)
+                # scores are stored per set of apps, ties are resolved by order of this selection
+                return self.context._top(self.score_cache.ordered(scores, patterns))
+            metrics.increment("score_cache", result="miss", scope=scope)
+            scores = self.context._normalized_scores(patterns, window_items)
+            self.score_cache.put(key, scores)
+            return self.context._top(scores)
@@ -0,0 +1,139 @@
+"""
+File: lean.py
+Description: This file contains LeanDatabase, memory-lean mode of Database. Only columns kept in db are parsed,
+             filtered rows are encoded into one base table (fingerprint columns as categoricals, app and file
+             names as shared string objects) and training and testing rows are kept as arrays of positions
+             into it instead of concatenated copies. Frames of training or testing rows are taken from the base
+             table when they are requested and intermediate frames are freed after the split.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as col_names
+from .database import Database, _read_dataset_file, split_launches
+from .logger import Logger
+
+import gc
+
+import numpy as np
+import pandas as pd
+
+# Grouped columns are not categorical, groupby of categoricals would also return unobserved groups.
+GROUP_COLUMNS = [col_names.APP_NAME, col_names.FILE]
+
+
+def encode(df):
+    """encodes columns of filtered dataset, values of rows stay the same
+
+    Returns:
+        df: with positional index, categorical fingerprint columns and one string object per distinct
+            value of grouped columns.
+    """
+    df = df.reset_index(drop=True)
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+        if column in GROUP_COLUMNS:
+            codes, uniques = pd.factorize(df[column])
+            values = np.asarray(uniques, dtype=object).take(codes)
+            values[codes == -1] = np.nan
+            df[column] = values
+        else:
+            df[column] = df[column].astype("category")
+    return df
+
+
+class PositionalRows:
+    """Rows of base table in given order, shuffled testing data of LeanDatabase.
+
+    Supports len() and positional slices (iloc[start:stop]) taken by sliding windows, frame of rows
+    is taken from the base table only for the requested slice. Index of the slice is position in the
+    order, same as index of shuffled frame.
+    """
+
+    def __init__(self, df, positions):
+        self.df = df
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def iloc(self):
+        return self
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("Only slices of rows are supported")
+        start, _, _ = key.indices(len(self))
+        rows = self.df.take(self.positions[key])
+        rows.index = pd.RangeIndex(start, start + len(rows))
+        return rows
+
+
+class LeanDatabase(Database):
+    def __init__(self, dataset, workers=None):
+        self.train_index = np.zeros(0, dtype=np.int64)  # positions of training rows in self.df
+        self.test_index = np.zeros(0, dtype=np.int64)  # positions of testing rows in self.df
+        super().__init__(dataset, workers)
+
+    def handle_file(self, file):
+        with Logger() as logger:
+            logger.info("Parsing dataset (lean) ...")
+            files = self.resolve_files(file)
+            try:
+                if not files:
+                    raise FileNotFoundError(file)
+                if len(files) == 1:
+                    # only columns kept in db are parsed, rows of type A and M are dropped while reading
+                    self.df = _read_dataset_file(files[0])
+                else:
+                    self.df = self.handle_files(files)
+            except FileNotFoundError:
+                logger.error("File not found.")
+                print("File not found.")
+                exit(1)
+            except pd.errors.EmptyDataError:
+                logger.error("File is empty.")
+                print("File is empty.")
+                exit(1)
+
+    def filter_out_dataset(self):
+        super().filter_out_dataset()
+        self.df = encode(self.df)
+        with Logger() as logger:
+            logger.info(
+                "Dataset encoded, %s bytes", int(self.df.memory_usage(deep=True).sum())
+            )
+
+    def split_dataset(self):
+        with Logger() as logger:
+            train_list, test_list = split_launches(self.df)
+            # index of encoded table is positional
+            self.train_index = self._positions(train_list)
+            self.test_index = self._positions(test_list)
+            self.train_df = self.test_df = None
+            del train_list, test_list
+            gc.collect()
+
+            logger.info(f"training dataset: {len(self.train_index)}")
+            logger.info(f"testing dataset: {len(self.test_index)}")
+
+    @staticmethod
+    def _positions(parts):
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate([part.index.to_numpy(dtype=np.int64) for part in parts])
+
+    def get_train_df(self):
+        return self.df.take(self.train_index)
+
+    def get_test_df(self):
+        return self.df.take(self.test_index)
+
+    def get_shuffled_test_data(self, shuffle_order):
+        # order is computed from grouped columns only, no frame of testing rows is kept
+        groups = self.df[GROUP_COLUMNS].take(self.test_index)
+        return PositionalRows(self.df, self.test_index[shuffle_order(groups)])
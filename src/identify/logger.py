@@ -1,53 +1,202 @@
 """
 File: logger.py
 Description: This file contains Logger class for creating log information.
+             Messages are passed to a process-wide writer thread, which owns a single
+             long-lived handle of the log file, so logging does not block the caller on file I/O.
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 15/11/2024
-Updated: 03/05/2025
+Updated: 19/10/2026
 """
 
-import inspect
+from config import DEBUG_ENABLED, LOG_CALLER_INFO, LOG_QUEUE_SIZE
 from datetime import datetime
-from config import DEBUG_ENABLED
+import atexit
 import os
+import queue
+import sys
+import threading
+import time
+
+
+class _LogWriter:
+    """Background writer of one log file, shared by every Logger in the process."""
+
+    # Maximum number of records written before the file is flushed.
+    BATCH_SIZE = 256
+    # Seconds between checks that the writer thread is still alive while waiting for it.
+    POLL_INTERVAL = 0.1
+    # Maximum number of seconds close waits for the writer thread.
+    CLOSE_TIMEOUT = 5
+
+    def __init__(self, log_file):
+        self.log = open(log_file, "a")
+        self.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self.thread = threading.Thread(target=self.__run, daemon=True)
+        self.thread.start()
+
+    def put(self, record):
+        # Blocks when the queue is full, so no message is lost under load,
+        # message is dropped only if the writer thread is not alive any more.
+        while True:
+            try:
+                self.queue.put(record, timeout=self.POLL_INTERVAL)
+                return
+            except queue.Full:
+                if not self.thread.is_alive():
+                    return
+
+    def join(self):
+        # Waits until every queued message is written or the writer thread is not alive.
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks and self.thread.is_alive():
+                self.queue.all_tasks_done.wait(self.POLL_INTERVAL)
+
+    def close(self):
+        if self.thread.is_alive():
+            try:
+                self.queue.put(None, timeout=self.CLOSE_TIMEOUT)
+            except queue.Full:
+                pass
+            self.thread.join(self.CLOSE_TIMEOUT)
+        if not self.thread.is_alive():
+            self.log.close()
+
+    def __run(self):
+        while True:
+            record = self.queue.get()
+            taken = 1
+            # Drain everything that is already waiting before flushing.
+            while record is not None:
+                self.__write(self.__format(record))
+                if taken >= self.BATCH_SIZE:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                    taken += 1
+                except queue.Empty:
+                    break
+            self.__write(None)
+            for _ in range(taken):
+                self.queue.task_done()
+            if record is None:
+                return
+
+    def __write(self, line):
+        # Writer thread must never die, error of the file is reported to stderr only.
+        try:
+            if line is None:
+                self.log.flush()
+            else:
+                self.log.write(line)
+        except Exception as e:
+            print(f"Log write error: {e}", file=sys.stderr)
+
+    def __format(self, record):
+        timestamp, level, caller, message, args = record
+        current_time = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+        try:
+            if callable(message):
+                message = message()
+            elif args:
+                message = message % args
+        except Exception as e:
+            # bad arguments or raising lazy message are logged, they do not stop the writer
+            message = f"<log format error: {e!r}> {message!r} {args!r}"
+
+        if caller is None:
+            return f"{current_time} [{level}] - {message}\n"
+
+        full_path, lineno = caller
+        project_folder = os.path.basename(os.path.dirname(full_path))
+        filename = os.path.basename(full_path)
+        return f"{current_time} [{level}] {project_folder}/{filename}:{lineno} - {message}\n"
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(log_file):
+    writer = _writers.get(log_file)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(log_file)
+            if writer is None:
+                writer = _writers[log_file] = _LogWriter(log_file)
+    return writer
+
+
+def _close_writers():
+    with _writers_lock:
+        for writer in _writers.values():
+            writer.close()
+        _writers.clear()
+
+
+def _flush_writers():
+    # Buffers must be empty before fork, otherwise child would write them again.
+    for writer in list(_writers.values()):
+        writer.join()
+
+
+def _reset_writers_in_child():
+    # Writer threads are not inherited by forked processes, child creates its own.
+    global _writers_lock
+    _writers.clear()
+    _writers_lock = threading.Lock()
+
+
+atexit.register(_close_writers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_flush_writers, after_in_child=_reset_writers_in_child
+    )
 
 
 class Logger:
+    """
+    Logger keeping the original context manager interface (`with Logger() as logger:`).
+    Messages may be passed with %-style arguments or as a callable, then they are
+    formatted only in the writer thread and only if the level is enabled.
+    """
+
     DEFAULT_LOG_FILE = "identify.log"
 
     def __init__(self, log_file=None):
         self.log_file = log_file or self.DEFAULT_LOG_FILE
 
     def __enter__(self):
-        self.log = open(self.log_file, "a")
+        self.log = _get_writer(self.log_file)
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.log.close()
+        # Handle of the log file is process-wide and closed at exit.
+        pass
 
-    def __log(self, level, message):
-        frame = inspect.currentframe().f_back.f_back
-        full_path = frame.f_code.co_filename
-        project_folder = os.path.basename(os.path.dirname(full_path))
-        filename = os.path.basename(full_path)
-        lineno = frame.f_lineno
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def __log(self, level, message, args):
+        caller = None
+        if LOG_CALLER_INFO:
+            # 0: __log, 1: debug/info/..., 2: caller
+            frame = sys._getframe(2)
+            caller = (frame.f_code.co_filename, frame.f_lineno)
 
-        log_message = f"{current_time} [{level}] {project_folder}/{filename}:{lineno} - {message}\n"
+        _get_writer(self.log_file).put((time.time(), level, caller, message, args))
 
-        self.log.write(log_message)
-        self.log.flush()
-
-    def debug(self, message):
+    def debug(self, message, *args):
         if DEBUG_ENABLED:
-            self.__log("DEBUG", message)
+            self.__log("DEBUG", message, args)
+
+    def info(self, message, *args):
+        self.__log("INFO", message, args)
 
-    def info(self, message):
-        self.__log("INFO", message)
+    def warn(self, message, *args):
+        self.__log("WARNING", message, args)
 
-    def warn(self, message):
-        self.__log("WARNING", message)
+    def error(self, message, *args):
+        self.__log("ERROR", message, args)
 
-    def error(self, message):
-        self.__log("ERROR", message)
+    def flush(self):
+        # Wait until every queued message is written, used before the process forks or exits.
+        _get_writer(self.log_file).join()
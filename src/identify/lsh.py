@@ -0,0 +1,149 @@
+"""
+File: lsh.py
+Description: This file contains MinHashLSH, approximate retrieval of apps for context fallbacks which score many
+             apps (whole db, complement of candidates). Every frequent pattern gets MinHash signature of its items
+             split into bands of rows, pattern is stored in one bucket per band. Patterns are mined from single
+             records, so index is queried with items of every record of the window, apps of patterns sharing
+             a bucket with any record are shortlisted and only they are scored exactly. Pattern with Jaccard
+             similarity s to a record is found with probability 1 - (1 - s^rows)^bands.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as CONFIG
+from .logger import Logger
+from .pattern_store import PatternStore
+
+import numpy as np
+
+# Mersenne prime of universal hash functions (a * x + b) mod p, item IDs are smaller.
+PRIME = (1 << 31) - 1
+# Maximum number of distinct records with memoized shortlisted apps.
+MAX_RECORDS = 65536
+
+
+class MinHashLSH:
+    def __init__(self, patterns: PatternStore, bands, rows, seed=0):
+        """
+        Args:
+            patterns (PatternStore): Frequent patterns of all apps.
+            bands (int): Number of bands, more bands find less similar patterns.
+            rows (int): Number of rows (hash functions) per band, more rows make buckets more selective.
+            seed (int): Seed of hash functions.
+        """
+        self.patterns = patterns
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, PRIME, size=bands * rows, dtype=np.uint64)
+        self.b = rng.integers(0, PRIME, size=bands * rows, dtype=np.uint64)
+        self.buckets = [{} for _ in range(bands)]  # band key -> set of app IDs
+        self._records = {}  # record values -> IDs of apps sharing a bucket with the record
+
+        self.queries = 0
+        self.shortlisted = 0  # sum of shortlisted apps over queries
+        self.scored_apps = 0  # sum of apps of fallbacks over queries
+        self.empty = 0  # queries without any shortlisted app, scored exactly
+        self._build()
+
+    def _signatures(self, items, starts):
+        # minimum of every hash function over items of every itemset (items of itemset are contiguous)
+        hashes = (self.a * items.astype(np.uint64)[:, None] + self.b) % PRIME
+        return np.minimum.reduceat(hashes, starts, axis=0)
+
+    def _keys(self, signature):
+        return [
+            signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _build(self):
+        with Logger() as logger:
+            store = self.patterns
+            store._build()
+            nonempty = np.flatnonzero(store.lengths > 0)
+            if not len(nonempty):
+                return
+            starts = store.indptr[nonempty]
+            items = store.indices[starts[0] :]
+            signatures = self._signatures(items, starts - starts[0])
+            for pattern, signature in zip(nonempty, signatures):
+                app_id = int(store.pattern_app[pattern])
+                for bucket, key in zip(self.buckets, self._keys(signature)):
+                    bucket.setdefault(key, set()).add(app_id)
+            logger.info(
+                "MinHash LSH of %s patterns built, %s bands of %s rows, %s buckets",
+                len(nonempty),
+                self.bands,
+                self.rows,
+                sum(len(bucket) for bucket in self.buckets),
+            )
+
+    def _record_apps(self, record):
+        apps = self._records.get(record)
+        if apps is not None:
+            return apps
+        item_ids = self.patterns.item_ids
+        ids = sorted({item_ids[item] for item in record if item in item_ids})
+        apps = set()
+        if ids:
+            signature = self._signatures(np.array(ids, dtype=np.int64), [0])[0]
+            for bucket, key in zip(self.buckets, self._keys(signature)):
+                apps |= bucket.get(key, set())
+        if len(self._records) >= MAX_RECORDS:
+            self._records.clear()
+        # records repeat across sliding windows, signature of every distinct record is computed once
+        self._records[record] = apps = frozenset(apps)
+        return apps
+
+    def query(self, window):
+        """IDs of apps with patterns likely similar to items of any record of window"""
+        columns = [c for c in CONFIG.columns_to_keep_for_context if c in window.columns]
+        apps = set()
+        # plain lists of columns, selecting frame of columns costs more than scoring of small store
+        for record in zip(*(window[column].tolist() for column in columns)):
+            apps |= self._record_apps(record)
+        return apps
+
+    def shortlist(self, patterns, window):
+        """patterns of apps of the fallback shortlisted by the index, all patterns if none is shortlisted
+
+        Args:
+            patterns (PatternStore): Patterns scored by fallback (whole store or its subset).
+            window (df): Sliding window of data to analyze.
+        """
+        app_ids = self.query(window)
+        # order of apps of the fallback is kept, ties of scores are resolved by it
+        if patterns.selection is None:
+            selected = sorted(app_ids)
+        else:
+            selected = [app_id for app_id in patterns.selection if app_id in app_ids]
+        self.queries += 1
+        self.scored_apps += len(patterns)
+        if not selected:
+            self.empty += 1
+            return patterns
+        self.shortlisted += len(selected)
+        return patterns.subset([self.patterns.apps[app_id] for app_id in selected])
+
+    def statistics(self):
+        return {
+            "bands": self.bands,
+            "rows": self.rows,
+            "queries": self.queries,
+            "empty": self.empty,
+            "avg_shortlisted": self.shortlisted / (self.queries - self.empty)
+            if self.queries > self.empty
+            else 0,
+            "avg_fallback_apps": self.scored_apps / self.queries if self.queries else 0,
+        }
+
+    def display_statistics(self):
+        stats = self.statistics()
+        print(
+            f"MinHash LSH ({self.bands} bands x {self.rows} rows): {stats['queries']} fallbacks, "
+            f"{round(stats['avg_shortlisted'], 2)} of {round(stats['avg_fallback_apps'], 2)} apps "
+            f"shortlisted on average, {stats['empty']} scored exactly (empty shortlist)\n"
+        )
@@ -0,0 +1,179 @@
+"""
+File: metrics.py
+Description: This file contains process-wide registry of per-stage timings and counters,
+             which can be exported as JSON report or Prometheus text format.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from bisect import bisect_left
+from contextlib import nullcontext
+import json
+import time
+
+
+class _Timer:
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+class _Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def cumulative_counts(self):
+        cumulative = []
+        total = 0
+        for count in self.bucket_counts:
+            total += count
+            cumulative.append(total)
+        return cumulative
+
+
+class Metrics:
+    # Upper bounds of latency histogram buckets in seconds.
+    BUCKETS = (
+        0.0001,
+        0.00025,
+        0.0005,
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+        2.5,
+        5.0,
+        10.0,
+        30.0,
+        60.0,
+    )
+    PREFIX = "identify"
+
+    def __init__(self):
+        self.enabled = False
+        self.timers = {}
+        self.counters = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def reset(self):
+        self.timers = {}
+        self.counters = {}
+
+    def timer(self, name, **labels):
+        """Context manager measuring wall time of the block, no-op if metrics are disabled."""
+        if not self.enabled:
+            return nullcontext()
+        return _Timer(self, name, labels)
+
+    def observe(self, name, seconds, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.timers.get(key)
+        if histogram is None:
+            histogram = self.timers[key] = _Histogram(self.BUCKETS)
+        histogram.observe(seconds)
+
+    def increment(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self):
+        timers = {}
+        for (name, labels), histogram in sorted(self.timers.items()):
+            timers.setdefault(name, []).append(
+                {
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "wall_time": histogram.sum,
+                    "mean": histogram.sum / histogram.count,
+                    "min": histogram.min,
+                    "max": histogram.max,
+                    "buckets": {
+                        str(bound): count
+                        for bound, count in zip(
+                            self.BUCKETS + ("+Inf",), histogram.cumulative_counts()
+                        )
+                    },
+                }
+            )
+
+        counters = {}
+        for (name, labels), value in sorted(self.counters.items()):
+            counters.setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+        return {"timers": timers, "counters": counters}
+
+    def export_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def export_prometheus(self, path):
+        lines = []
+        for name, series in self.to_dict()["timers"].items():
+            metric = f"{self.PREFIX}_{name}_seconds"
+            lines.append(f"# HELP {metric} Wall time of {name} stage.")
+            lines.append(f"# TYPE {metric} histogram")
+            for entry in series:
+                labels = entry["labels"]
+                for bound, count in entry["buckets"].items():
+                    bucket_labels = self.__format_labels({**labels, "le": bound})
+                    lines.append(f"{metric}_bucket{bucket_labels} {count}")
+                lines.append(f"{metric}_sum{self.__format_labels(labels)} {entry['wall_time']}")
+                lines.append(f"{metric}_count{self.__format_labels(labels)} {entry['count']}")
+
+        for name, series in self.to_dict()["counters"].items():
+            metric = f"{self.PREFIX}_{name}_total"
+            lines.append(f"# HELP {metric} Number of {name} events.")
+            lines.append(f"# TYPE {metric} counter")
+            for entry in series:
+                lines.append(f"{metric}{self.__format_labels(entry['labels'])} {entry['value']}")
+
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def __format_labels(self, labels):
+        if not labels:
+            return ""
+        escaped = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            for value in labels.values()
+        )
+        pairs = ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped))
+        return "{" + pairs + "}"
+
+
+# Process-wide registry, enabled from command line.
+metrics = Metrics()
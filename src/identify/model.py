@@ -0,0 +1,73 @@
+"""
+File: model.py
+Description: This file contains Model class, trained state of identification (lookup tables and frequent patterns),
+             which can be stored to disk and loaded again without the training dataset.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as col_names
+from .logger import Logger
+
+import os
+import pickle
+import tempfile
+
+
+class Model:
+    FORMAT_VERSION = 2
+
+    def __init__(
+        self,
+        ja_version,
+        lookup_table,
+        frequent_patterns,
+        min_support=None,
+        context_columns=None,
+    ):
+        self.format_version = self.FORMAT_VERSION
+        self.ja_version = ja_version
+        self.lookup_table = lookup_table
+        self.frequent_patterns = frequent_patterns
+        self.min_support = min_support
+        self.context_columns = list(context_columns or col_names.columns_to_keep_for_context)
+
+    @classmethod
+    def from_database(cls, db, min_support=None):
+        return cls(
+            db.ja_version,
+            db.lookup_table,
+            db.frequent_patterns,
+            min_support,
+            col_names.columns_to_keep_for_context,
+        )
+
+    def get_app(self, type, value):
+        # Same interface as Database.get_app, so fingerprinting can use the model directly.
+        return self.lookup_table[type].get(value, set())
+
+    def save(self, path):
+        """Stores the model atomically, readers never see partially written file."""
+        with Logger() as logger:
+            directory = os.path.dirname(os.path.abspath(path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            logger.info("Model saved to %s", path)
+
+    @classmethod
+    def load(cls, path):
+        with Logger() as logger:
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+            if not isinstance(model, cls) or model.format_version != cls.FORMAT_VERSION:
+                raise ValueError(f"{path} is not a compatible model file")
+            logger.info("Model loaded from %s", path)
+            return model
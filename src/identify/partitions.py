@@ -0,0 +1,205 @@
+"""
+File: partitions.py
+Description: This file contains PartitionedDatabase for out-of-core training. Dataset is read in one streaming
+             pass in chunks and rows are spilled into on-disk partition per app (pickled DataFrame chunks).
+             Apps are then trained one partition at a time (optionally in parallel processes), every partition
+             is split into training and testing launches, its training rows update the lookup table and are mined
+             for frequent patterns. Peak memory of training is bounded by the largest app instead of the dataset.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as col_names
+from .database import Database, split_launches
+from .logger import Logger
+from .metrics import metrics
+from .pattern_store import PatternStore
+from .readers import detect_format, read_frames
+
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import hashlib
+import os
+import pickle
+from types import SimpleNamespace
+
+import pandas as pd
+
+PARTITION_SUFFIX = ".part"
+TEST_PARTITION = "test" + PARTITION_SUFFIX
+
+
+def _append(path, frame):
+    with open(path, "ab") as f:
+        pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load(path):
+    # partition is sequence of pickled chunks appended during streaming pass
+    frames = []
+    with open(path, "rb") as f:
+        while True:
+            try:
+                frames.append(pickle.load(f))
+            except EOFError:
+                break
+    return pd.concat(frames) if frames else pd.DataFrame()
+
+
+def _train_partition(path, context, ja_keys):
+    """splits and mines one app partition, runs in worker process when training is parallel
+
+    Returns:
+        tuple: of app name, values of lookup keys, mined patterns, testing rows and context with statistics.
+    """
+    train_list, test_list = split_launches(_load(path))
+    train = pd.concat(train_list)
+    app = train[col_names.APP_NAME].iloc[0]
+    values = {key: train[key].dropna().unique() for key in ja_keys}
+
+    scratch = SimpleNamespace(frequent_patterns=PatternStore())
+    context._train_group(train, scratch)
+    patterns = scratch.frequent_patterns[app].to_frame()
+    test = pd.concat(test_list) if test_list else None
+    return app, values, patterns, test, context
+
+
+class PartitionedDatabase(Database):
+    def __init__(self, dataset, directory, workers=None, chunk_size=None):
+        """
+        Args:
+            dataset (str | list): Same as in Database.
+            directory (str): Directory of partition files, existing partitions in it are replaced.
+            workers (int): Number of processes training partitions, 1 trains in the main process.
+            chunk_size (int): Number of rows read at once, defaults to READER_CHUNK_SIZE.
+        """
+        self.directory = directory
+        self.chunk_size = chunk_size or col_names.READER_CHUNK_SIZE
+        self.partitions = {}  # app name -> partition file
+        self.num_rows = 0
+        super().__init__(dataset, workers)
+
+    # --- streaming pass ---
+
+    def handle_file(self, file):
+        with Logger() as logger:
+            logger.info("Partitioning dataset by app into %s ...", self.directory)
+            files = self.resolve_files(file)
+            if not files:
+                logger.error("File not found.")
+                print("File not found.")
+                exit(1)
+
+            os.makedirs(self.directory, exist_ok=True)
+            for name in os.listdir(self.directory):
+                if name.endswith(PARTITION_SUFFIX):
+                    os.unlink(os.path.join(self.directory, name))
+
+            try:
+                for path in files:
+                    for chunk in self._read_chunks(path):
+                        self._spill(chunk)
+            except FileNotFoundError:
+                logger.error("File not found.")
+                print("File not found.")
+                exit(1)
+            except pd.errors.EmptyDataError:
+                logger.error("File is empty.")
+                print("File is empty.")
+                exit(1)
+
+            logger.info("%s rows spilled into %s partitions", self.num_rows, len(self.partitions))
+
+    def _read_chunks(self, path):
+        keep = set(col_names.columns_to_keep_in_db) | {col_names.TYPE}
+        if detect_format(path) != "csv":
+            return read_frames(path, self.chunk_size)
+        return pd.read_csv(
+            path,
+            delimiter=";",
+            usecols=lambda column: column in keep,
+            chunksize=self.chunk_size,
+        )
+
+    def _spill(self, chunk):
+        chunk = chunk[~chunk[col_names.TYPE].isin(["A", "M"])]
+        chunk = chunk.filter(col_names.columns_to_keep_in_db)
+        # Position in the whole dataset, so testing rows can be restored in the order of Database.
+        chunk.index = pd.RangeIndex(self.num_rows, self.num_rows + len(chunk))
+        self.num_rows += len(chunk)
+        for app, rows in chunk.groupby(col_names.APP_NAME, sort=False):
+            path = self.partitions.get(app)
+            if path is None:
+                name = hashlib.sha1(str(app).encode()).hexdigest()[:16]
+                path = self.partitions[app] = os.path.join(
+                    self.directory, name + PARTITION_SUFFIX
+                )
+            _append(path, rows)
+
+    def filter_out_dataset(self):
+        # rows are filtered during streaming pass
+        pass
+
+    def split_dataset(self):
+        # partitions are split when they are trained
+        pass
+
+    # --- training ---
+
+    def create_lookup_table(self, ja_version):
+        raise TypeError("Lookup table of partitioned database is built by train()")
+
+    def train(self, context, ja_version):
+        """trains apps one partition at a time, lookup table is built from the same partitions
+
+        Args:
+            context (Apriori): Configured pattern matching method, mines patterns of every app.
+            ja_version (int | list): JA version or list of versions of lookup table.
+        """
+        with Logger() as logger, metrics.timer("partitioned_train"):
+            self.ja_version = ja_version
+            versions = ja_version if isinstance(ja_version, list) else [ja_version]
+            ja_keys = list(
+                dict.fromkeys(key for version in versions for key in col_names.get_keys(version))
+            )
+            self.lookup_table = {key: {} for key in ja_keys}
+            test_path = os.path.join(self.directory, TEST_PARTITION)
+
+            # apps are trained in sorted order, same as groups of Apriori.train
+            paths = [self.partitions[app] for app in sorted(self.partitions)]
+            workers = min(self.workers or 1, len(paths)) if paths else 1
+            logger.info("Training %s partitions using %s processes ...", len(paths), workers)
+            if workers > 1:
+                # Tasks are pickled lazily, copy keeps statistics merged meanwhile out of them.
+                template = copy.deepcopy(context)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = executor.map(
+                        _train_partition, paths, [template] * len(paths), [ja_keys] * len(paths)
+                    )
+                    for app, values, patterns, test, worker_context in results:
+                        self._add_partition(app, values, patterns, test, test_path)
+                        context.merge_statistics(worker_context)
+            else:
+                for path in paths:
+                    app, values, patterns, test, _ = _train_partition(path, context, ja_keys)
+                    self._add_partition(app, values, patterns, test, test_path)
+            context.log_patterns(self)
+
+            # Testing rows in the order of Database (by file, then by position in dataset).
+            self.test_df = _load(test_path) if os.path.exists(test_path) else pd.DataFrame()
+            if not self.test_df.empty:
+                self.test_df = self.test_df.sort_index().sort_values(
+                    col_names.FILE, kind="stable"
+                )
+            logger.info(f"testing dataset: {len(self.test_df)}")
+
+    def _add_partition(self, app, values, patterns, test, test_path):
+        for key, key_values in values.items():
+            table = self.lookup_table[key]
+            for value in key_values:
+                table.setdefault(value, set()).add(app)
+        self.frequent_patterns[app] = patterns
+        if test is not None:
+            _append(test_path, test)
@@ -0,0 +1,159 @@
+"""
+File: pattern_cache.py
+Description: This file contains on-disk cache of frequent patterns mined for one app.
+             Entries are addressed by hash of app's training transactions and mining parameters
+             (min_support, columns used for context and pattern filters), so only apps with changed
+             data or parameters are mined again. Size of cache is limited, least recently used
+             entries are evicted first.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from .logger import Logger
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import mlxtend
+import pandas as pd
+
+# Increase when format of entries or mining changes, old entries are not used anymore.
+CACHE_VERSION = 1
+
+
+class PatternCache:
+    def __init__(self, directory, max_size):
+        """
+        Args:
+            directory (str): Directory of cache entries.
+            max_size (int): Maximum size of all entries in bytes.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.time_saved = 0.0
+
+    def key(self, transactions, min_support, columns, pattern_filters, sampling=None):
+        """hash of encoded transactions of one app and mining parameters
+
+        Args:
+            transactions (df): Training rows of app, only columns used for context.
+            min_support (float): Minimum support of Apriori.
+            columns (list): Columns used for context.
+            pattern_filters (list): Filters applied to mined patterns.
+            sampling (dict): Parameters of sampling of large groups, None if all rows are mined.
+
+        Returns:
+            str: hex digest addressing the cache entry.
+        """
+        digest = hashlib.sha256()
+        parameters = {
+            "version": CACHE_VERSION,
+            "mlxtend": mlxtend.__version__,
+            "min_support": min_support,
+            "columns": list(columns),
+            "pattern_filters": pattern_filters,
+            "sampling": sampling,
+        }
+        digest.update(json.dumps(parameters, sort_keys=True).encode())
+        rows = pd.util.hash_pandas_object(transactions.astype(str), index=False)
+        digest.update(rows.values.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key):
+        """returns cached patterns (DataFrame) of key or None"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # damaged entry is mined again and replaced
+            with Logger() as logger:
+                logger.warn("Damaged pattern cache entry %s removed", path)
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                # removed by another process meanwhile
+                pass
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            # evicted by another process after it was loaded, loaded patterns are still valid
+            pass
+        self.hits += 1
+        self.time_saved += entry["mining_time"]
+        return entry["patterns"]
+
+    def put(self, key, patterns, mining_time):
+        """stores patterns of key atomically and evicts least recently used entries over size limit"""
+        entry = {"patterns": patterns, "mining_time": mining_time}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        size = sum(entry[1] for entry in entries)
+        if size <= self.max_size:
+            return
+        with Logger() as logger:
+            for _, entry_size, path in sorted(entries):
+                if size <= self.max_size:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                size -= entry_size
+                self.evictions += 1
+                logger.debug("Pattern cache entry %s evicted", path)
+
+    def merge_statistics(self, other):
+        # counters of cache copy used in worker process
+        self.hits += other.hits
+        self.misses += other.misses
+        self.evictions += other.evictions
+        self.time_saved += other.time_saved
+
+    def display_statistics(self):
+        print(
+            f"Pattern cache: hits {self.hits}, misses {self.misses}, "
+            f"evictions {self.evictions}, mining time saved {round(self.time_saved, 2)} s\n"
+        )
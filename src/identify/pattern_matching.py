@@ -4,7 +4,7 @@ Description: This file contains algorithms for detecting frequent patterns.
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 15/11/2024
-Updated: 13/05/2025
+Updated: 19/10/2026
 
 CITATIONS OF SOURCES:
 [1] CHOUDHARY G. A Beginner’s Guide to Apriori .... [Online]. Best Tech Blog For Programming .., 2. září 2023.
@@ -14,19 +14,27 @@ CITATIONS OF SOURCES:
 
 from .database import Database
 from .logger import Logger
+from .metrics import metrics
 import config
 
 import pandas as pd
-from mlxtend.frequent_patterns import apriori
-from mlxtend.preprocessing import TransactionEncoder
+from concurrent.futures import ProcessPoolExecutor
 import heapq
-from sklearn.metrics.pairwise import cosine_similarity
+import multiprocessing
 import numpy as np
-from collections import defaultdict
-from math import log
 import operator
 import csv
 import os
+import time
+
+# State shared with forked processes identifying launches (pattern index is not pickled).
+_shared = {}
+
+
+def _identify_launches(positions):
+    context = _shared["context"]
+    patterns = _shared["patterns"]
+    return [context._rank(patterns, _shared["launches"][i]) for i in positions]
 
 
 class PatternMatchingMethod:
@@ -60,6 +68,18 @@ class PatternMatchingMethod:
 
         self.pattern_sim = {}
 
+        self.cascade = False
+        self.cascade_singleton = 0
+        self.cascade_singleton_comb = 0
+        self.cascade_reused = 0
+        self.cascade_reused_comb = 0
+        self.cascade_correct = 0
+        self.cascade_correct_comb = 0
+
+        self.partial_match = False
+        self.partial_match_count = 0
+        self.partial_match_comb = 0
+
     def _update_statistics(self, real_app, top_similarities, is_comb=False):
         if top_similarities:
             self._check_top_guesses(real_app, top_similarities, is_comb)
@@ -90,6 +110,26 @@ class PatternMatchingMethod:
         elif len(top_similarities) > 0:
             self.len_of_candidates.append(len(top_similarities))
 
+    def _update_cascade_statistics(self, real_app, top_similarities, is_comb, reused):
+        # Count records resolved without context scoring and how many of them were right.
+        if is_comb:
+            if reused:
+                self.cascade_reused_comb += 1
+            else:
+                self.cascade_singleton_comb += 1
+        else:
+            if reused:
+                self.cascade_reused += 1
+            else:
+                self.cascade_singleton += 1
+
+        top_apps = [app for app, _ in top_similarities[: self.candidate_size]]
+        if real_app in top_apps:
+            if is_comb:
+                self.cascade_correct_comb += 1
+            else:
+                self.cascade_correct += 1
+
     def _update_correct_guess(self, guess_rank, app, is_comb=False):
         # Update stats based on which guess was correct.
         if is_comb:
@@ -99,7 +139,49 @@ class PatternMatchingMethod:
 
     def _log_no_similar_apps_found(self, real_app):
         with Logger() as logger:
-            logger.warn(f"No similar apps found for {real_app}.")
+            logger.warn("No similar apps found for %s.", real_app)
+
+    def get_statistics(self, is_comb=False):
+        # Statistics of one method as a row for tabular exports (sweep, cross-validation).
+        correct_list = self.comb_correct if is_comb else self.correct
+        correct = sum(correct_list)
+        incorrect = self.comb_incorrect if is_comb else self.incorrect
+        len_of_candidates = (
+            self.comb_len_of_candidates if is_comb else self.len_of_candidates
+        )
+        total = self.number_of_tls
+
+        statistics = {
+            "is_comb": is_comb,
+            "min_support": self.min_support,
+            "candidate_size": self.candidate_size,
+            "ja_version": self.ja_version,
+            "correct": correct,
+            "incorrect": incorrect,
+            "empty_candidates": (
+                self.empty_comb_candidates if is_comb else self.empty_candidates
+            ),
+            "total": total,
+            "accuracy_overall": correct / total if total else 0,
+            "error_rate": incorrect / total if total else 0,
+            "empty_ja": self.empty_ja_comb if is_comb else self.empty_ja,
+            "pure_context": self.pure_context_comb if is_comb else self.pure_context,
+            "context_using_whole_db": (
+                self.context_using_whole_db_comb
+                if is_comb
+                else self.context_using_whole_db
+            ),
+            "avg_len_of_candidates": (
+                sum(len_of_candidates) / len(len_of_candidates)
+                if len_of_candidates
+                else 0
+            ),
+        }
+        for i, count in enumerate(correct_list, start=1):
+            statistics[f"guess_{i}"] = count
+        for i, count in enumerate(correct_list, start=1):
+            statistics[f"guess_perc_{i}"] = count / total if total else 0
+        return statistics
 
     def display_statistics(self, is_comb=False):
         print("________________________________________________________")
@@ -150,6 +232,17 @@ class PatternMatchingMethod:
             f"Context using whole db: {context_using_whole_db} ({round(context_using_whole_db / total, 2)})\n"
         )
 
+        if self.cascade:
+            self._display_cascade_statistics(is_comb)
+
+        if self.partial_match:
+            partial_match = (
+                self.partial_match_comb if is_comb else self.partial_match_count
+            )
+            print(
+                f"Whole db avoided by partial match: {partial_match} ({round(partial_match / total, 2)})\n"
+            )
+
         avg_len = sum(len_of_candidates) / len(len_of_candidates)
         median_len = np.median(len_of_candidates)
         modus_len = max(set(len_of_candidates), key=len_of_candidates.count)
@@ -162,9 +255,34 @@ class PatternMatchingMethod:
         if not is_comb:
             self.display_statistics(is_comb=True)
 
-    def export_to_csv(self, data, headers=None):
-        file_exists = os.path.exists(self.csv_file)
-        with open(self.csv_file, mode="a", newline="") as csvfile:
+    def _display_cascade_statistics(self, is_comb=False):
+        singleton = self.cascade_singleton_comb if is_comb else self.cascade_singleton
+        reused = self.cascade_reused_comb if is_comb else self.cascade_reused
+        cascade_correct = self.cascade_correct_comb if is_comb else self.cascade_correct
+        short_circuited = singleton + reused
+        total = self.number_of_tls
+
+        print(
+            f"Cascade short-circuited: {short_circuited} ({round(short_circuited / total, 2)})"
+        )
+        print(f"  Unambiguous fingerprint: {singleton}")
+        print(f"  Reused last resolution: {reused}")
+        if short_circuited:
+            print(
+                f"  Accuracy of short-circuited: {round(cascade_correct / short_circuited, 4)}"
+            )
+        escalated = total - short_circuited
+        correct = sum(self.comb_correct) if is_comb else sum(self.correct)
+        if escalated:
+            print(
+                f"  Accuracy of escalated to context: {round((correct - cascade_correct) / escalated, 4)}"
+            )
+        print()
+
+    def export_to_csv(self, data, headers=None, mode="a"):
+        # header is written to new file or when the file is rewritten (mode "w")
+        file_exists = mode == "a" and os.path.exists(self.csv_file)
+        with open(self.csv_file, mode=mode, newline="") as csvfile:
             csv_writer = csv.writer(
                 csvfile,
                 delimiter=";",
@@ -182,6 +300,15 @@ class PatternMatchingMethod:
 
 
 class Apriori(PatternMatchingMethod):
+    def __init__(self, min_sup, version, max_candidates_size, csv_file=None):
+        super().__init__(min_sup, version, max_candidates_size, csv_file)
+        # filters applied to patterns of every app, sweep may replace them per configuration
+        self.pattern_filters = config.PATTERN_FILTERS
+        # optional on-disk cache of mined patterns (PatternCache)
+        self.pattern_cache = None
+        # optional sampling of large app groups (SupportSampler)
+        self.sampler = None
+
     def __str__(self):
         return
 
@@ -190,7 +317,7 @@ class Apriori(PatternMatchingMethod):
         Train the Apriori algorithm on dataset grouped by app for multiple launches,
         so that the frequent patterns are found over more launches.
         """
-        with Logger() as logger:
+        with Logger() as logger, metrics.timer("train"):
             logger.info("Training Apriori algorithm ...")
             # Retrieve training data.
             data = db.get_train_df()
@@ -202,20 +329,19 @@ class Apriori(PatternMatchingMethod):
                 self._train_group(one_app_tls, db)
             self.log_patterns(db)
 
+    def merge_statistics(self, other):
+        """adds counters of sampling and pattern cache of context copy trained in worker process"""
+        if self.sampler is not None:
+            self.sampler.merge_statistics(other.sampler)
+        if self.pattern_cache is not None:
+            self.pattern_cache.merge_statistics(other.pattern_cache)
+
     def log_patterns(self, db):
         with Logger() as logger:
             logger.debug("Frequent patterns found: \n")
             for app, patterns in db.frequent_patterns.items():
-                logger.debug(f"app: {app}")
-                logger.debug(f"patterns: {patterns}\n")
-
-    def _init_db_for_app(self, app, db):
-        if app in db.frequent_patterns:
-            return
-        else:
-            db.frequent_patterns[app] = pd.DataFrame()
-            with Logger() as logger:
-                logger.debug(f"Creating new entry for {app}")
+                logger.debug("app: %s", app)
+                logger.debug("patterns: %s\n", patterns)
 
     def _add_patterns_to_db(self, app, patterns, db):
         """
@@ -224,8 +350,8 @@ class Apriori(PatternMatchingMethod):
         # Remove duplicates
         patterns = patterns.drop_duplicates(subset="itemsets")
 
-        # Sort by support
-        patterns.sort_values(by="support", ascending=False, inplace=True)
+        # Sort by support, stable so that ties keep the order of apriori output
+        patterns.sort_values(by="support", ascending=False, inplace=True, kind="stable")
 
         # map operator for dynamic configuration of filters
         ops = {
@@ -240,7 +366,7 @@ class Apriori(PatternMatchingMethod):
         filtered_patterns = []
 
         # Extract filters from config
-        for f in config.PATTERN_FILTERS:
+        for f in self.pattern_filters:
             op = ops[f["operator"]]
             length = f["length"]
             head = f["head"]
@@ -255,12 +381,12 @@ class Apriori(PatternMatchingMethod):
             patterns = pd.concat(filtered_patterns, ignore_index=True)
 
         patterns = patterns.reset_index(drop=True)
-        db.frequent_patterns[app] = pd.DataFrame(patterns)
         if patterns.empty:
+            db.frequent_patterns[app] = patterns
             return
-        db.frequent_patterns[app] = self._normalize_support(db.frequent_patterns[app])
+        db.frequent_patterns[app] = self._normalize_support(patterns)
         with Logger() as logger:
-            logger.debug(f"Found {len(patterns)} frequent item sets for {app} \n")
+            logger.debug("Found %s frequent item sets for %s \n", len(patterns), app)
 
     def _normalize_support(self, patterns_df):
         patterns_df["normalized_support"] = np.log1p(
@@ -269,15 +395,37 @@ class Apriori(PatternMatchingMethod):
         return patterns_df
 
     def _train_group(self, group, db):
-        with Logger() as logger:
-            app_name = group[config.APP_NAME].iloc[0]
-            logger.debug(f"Training for {app_name}, with length of {len(group)}")
+        app_name = group[config.APP_NAME].iloc[0]
+        with Logger() as logger, metrics.timer("mining", app=app_name):
+            logger.debug("Training for %s, with length of %s", app_name, len(group))
+
+            if self.pattern_cache is not None:
+                key = self.pattern_cache.key(
+                    group.filter(config.columns_to_keep_for_context),
+                    self.min_support,
+                    config.columns_to_keep_for_context,
+                    self.pattern_filters,
+                    self.sampler.parameters() if self.sampler is not None else None,
+                )
+                patterns = self.pattern_cache.get(key)
+                if patterns is not None:
+                    logger.debug("Patterns of %s loaded from cache", app_name)
+                    metrics.increment("pattern_cache", result="hit")
+                    db.frequent_patterns[app_name] = patterns
+                    return
+                metrics.increment("pattern_cache", result="miss")
+                start_time = time.perf_counter()
 
             frequent_item_sets = self._execute_apriori(group)
-            self._init_db_for_app(app_name, db)
-
             self._add_patterns_to_db(app_name, frequent_item_sets, db)
 
+            if self.pattern_cache is not None:
+                self.pattern_cache.put(
+                    key,
+                    db.frequent_patterns[app_name].to_frame(),
+                    time.perf_counter() - start_time,
+                )
+
     def _preprocess(self, data):
         # Strip data of unnecessary columns.
         # Keep only columns that are needed for the Apriori algorithm.
@@ -286,6 +434,9 @@ class Apriori(PatternMatchingMethod):
         # Serialize the data.
         data_list = data.values.tolist()
 
+        # mlxtend is imported only by training
+        from mlxtend.preprocessing import TransactionEncoder
+
         ###! The following code is based on [1] (see full citation at the top of the file) !###
 
         # Transform into one-hot encoding.
@@ -300,6 +451,11 @@ class Apriori(PatternMatchingMethod):
         return df_encoded
 
     def _execute_apriori(self, group):
+        if self.sampler is not None and self.sampler.should_sample(group):
+            return self._execute_sampled_apriori(group)
+
+        from mlxtend.frequent_patterns import apriori
+
         processed_group = self._preprocess(group)
         with Logger() as logger:
             logger.info(
@@ -313,6 +469,30 @@ class Apriori(PatternMatchingMethod):
 
         return freq_items_set
 
+    def _execute_sampled_apriori(self, group):
+        # Mine uniform sample of the group, supports are optionally verified on all rows.
+        from mlxtend.frequent_patterns import apriori
+
+        sample = self.sampler.sample(group)
+        min_support = self.sampler.mining_support(self.min_support)
+        with Logger() as logger:
+            logger.info(
+                "Executing Apriori algorithm on %s of %s rows with min_support=%s ...",
+                len(sample),
+                len(group),
+                min_support,
+            )
+        freq_items_set = apriori(
+            self._preprocess(sample),
+            min_support=min_support,
+            use_colnames=True,
+        )
+        if self.sampler.verify:
+            freq_items_set = self.sampler.verify_supports(
+                freq_items_set, group, self.min_support
+            )
+        return freq_items_set
+
     def _jaccard_similarity(self, set1, set2):
         intersection = len(set1.intersection(set2))
         union = len(set1.union(set2))
@@ -331,6 +511,8 @@ class Apriori(PatternMatchingMethod):
         )
 
     def _cosine_similarity(self, set1, set2):
+        from sklearn.metrics.pairwise import cosine_similarity
+
         # Convert sets to bag-of-words representation
         all_items = list(set1.union(set2))
         vec1 = np.array([1 if item in set1 else 0 for item in all_items])
@@ -339,20 +521,94 @@ class Apriori(PatternMatchingMethod):
         # Compute Cosine Similarity
         return cosine_similarity([vec1], [vec2])[0][0]
 
-    def identify(self, db: Database):
-        with Logger() as logger:
+    def identify(self, db: Database, workers=1):
+        """identifies every launch (file) of test data as one unit
+
+        Items of the whole launch are scored against patterns of all apps. Scoring index of patterns is
+        built once, launches are spread over forked processes sharing it.
+
+        Args:
+            db (Database): Database with frequent patterns and test data.
+            workers (int): Number of processes, 1 identifies launches in this process.
+
+        Returns:
+            list: of (file, real app, top guesses) per launch, in order of file names.
+        """
+        with Logger() as logger, metrics.timer("launch_identify"):
             logger.info("Identifying using Apriori algorithm ...")
-            # Retrieve test data and group it by app.
+            # Retrieve test data and group it by launch.
             test_ds = db.get_test_df()
-            test_ds_launches = test_ds.groupby(config.FILE)
+            launches = [
+                (file, launch[config.APP_NAME].iloc[0], self._window_items(launch))
+                for file, launch in test_ds.groupby(config.FILE)
+            ]
+            db.frequent_patterns.prepare()
+
+            workers = max(1, min(workers or 1, len(launches)))
+            logger.info("Identifying %s launches using %s processes ...", len(launches), workers)
+            tls_sets = [tls_set for _, _, tls_set in launches]
+            if workers > 1:
+                _shared.update(context=self, patterns=db.frequent_patterns, launches=tls_sets)
+                # few contiguous chunks per process, order of launches is kept by map
+                chunks = np.array_split(np.arange(len(launches)), workers * 4)
+                try:
+                    with ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context("fork"),
+                    ) as executor:
+                        guesses = [
+                            top_guesses
+                            for chunk in executor.map(_identify_launches, chunks)
+                            for top_guesses in chunk
+                        ]
+                finally:
+                    _shared.clear()
+            else:
+                guesses = [self._rank(db.frequent_patterns, tls_set) for tls_set in tls_sets]
 
-            for _, launch in test_ds_launches:
-                real_app = launch[config.APP_NAME].iloc[0]
-                # Find similarity of tle entries in db of frequent patterns.
-                top_guesses = self.find_similarity(db.frequent_patterns, launch)
+            results = []
+            for (file, real_app, _), top_guesses in zip(launches, guesses):
                 self._debug_identify_print(real_app, top_guesses)
                 # Update statistics based on the results.
+                self.number_of_tls += 1
                 self._update_statistics(real_app, top_guesses)
+                results.append((file, real_app, top_guesses))
+            return results
+
+    def display_launch_statistics(self):
+        print("________________________________________________________")
+        print(f"Apriori with JA{self.ja_version} per launch:")
+        total = self.number_of_tls
+        correct = sum(self.correct)
+        print(f"Correct: {correct}")
+        print(f"Incorrect: {self.incorrect}")
+        print(f"Empty context candidates: {self.empty_candidates}")
+        print(f"Total launches: {total}\n")
+        if not total:
+            return
+        print(f"Accuracy overall: {round(correct / total, 4)}")
+        print(f"Error rate: {round(self.incorrect / total, 4)}\n")
+        for i, count in enumerate(self.correct, start=1):
+            print(f"{i}. guess: {count} ({round(count / total, 2)})")
+        print()
+
+    def export_launches(self, results):
+        """writes top guesses of all launches to csv_file at once, previous content is replaced"""
+        headers = ["file", "real_app", "correct_rank"]
+        for rank in range(1, self.candidate_size + 1):
+            headers += [f"guess_{rank}", f"score_{rank}"]
+        rows = []
+        for file, real_app, top_guesses in results:
+            apps = [app for app, _ in top_guesses]
+            row = [file, real_app, apps.index(real_app) + 1 if real_app in apps else 0]
+            for rank in range(self.candidate_size):
+                if rank < len(top_guesses):
+                    app, score = top_guesses[rank]
+                    row += [app, round(score, 6)]
+                else:
+                    row += ["", ""]
+            rows.append(row)
+        self.export_to_csv(rows, headers, mode="w")
 
     def _debug_identify_print(self, real_app, top_guesses):
         if config.DEBUG_ENABLED:
@@ -364,64 +620,27 @@ class Apriori(PatternMatchingMethod):
                     print(f"{app} {similarity:.2f}", end="; ")
             print()
 
-    def _minmax_normalize(self, scores):
-        if not scores:
-            return {}
-
-        min_score = min(scores.values())
-        max_score = max(scores.values())
-
-        # Prevent division by zero (if all scores are the same)
-        if min_score == max_score:
-            return {k: 0.5 for k in scores}
-
-        return {k: (v - min_score) / (max_score - min_score) for k, v in scores.items()}
+    def _window_items(self, tls_group):
+        # Items of the window used for context, flattened into one set.
+        stripped_tls = tls_group.filter(config.columns_to_keep_for_context)
+        return frozenset(stripped_tls.values.flatten())
 
     def find_similarity(self, frequent_patterns, tls_group):
         if not frequent_patterns:
             return {}
-        top_scores = {}
-        pattern_df = defaultdict(int)
-
-        stripped_tls = tls_group.filter(config.columns_to_keep_for_context)
-        # print(stripped_tls)
-        tls_set = frozenset(stripped_tls.values.flatten())
-        total_apps = len(frequent_patterns)
-
-        for app, patterns in frequent_patterns.items():
-            for _, row in patterns.iterrows():
-                pattern = frozenset(row["itemsets"])
-                pattern_df[pattern] += 1
-
-        for app, patterns in frequent_patterns.items():
-            # Reset total score for each app
-            total_score = 0
-
-            for _, row in patterns.iterrows():
-                pattern_set = frozenset(row["itemsets"])
-
-                if not pattern_set:
-                    continue
-
-                df = pattern_df[pattern_set]
-                idf = log(1 + total_apps / df)
-
-                total_score += (
-                    self._jaccard_similarity(pattern_set, tls_set) + 1
-                ) * idf
 
-                if pattern_set.issubset(tls_set):
-                    total_score += (
-                        len(pattern_set) * 10 * idf * (row["normalized_support"] + 1)
-                    )
+        return self._rank(frequent_patterns, self._window_items(tls_group))
 
-            if total_score > 0:
-                top_scores[app] = total_score
+    def _rank(self, frequent_patterns, tls_set):
+        return self._top(self._normalized_scores(frequent_patterns, tls_set))
 
-        # Normalize scores using Min-Max Scaling
-        norm_scores = self._minmax_normalize(top_scores)
+    def _normalized_scores(self, frequent_patterns, tls_set):
+        # Jaccard similarity and subset bonus weighted by idf of every pattern, summed per app,
+        # computed over arrays of the pattern store and normalized using Min-Max Scaling.
+        return frequent_patterns.normalized_scores(tls_set)
 
-        # Return top N apps with highest scores
+    def _top(self, norm_scores):
+        # Return top N apps with highest scores, ties are resolved by order of apps in scores
         return heapq.nlargest(
             self.candidate_size, norm_scores.items(), key=lambda x: x[1]
         )
@@ -0,0 +1,361 @@
+"""
+File: pattern_store.py
+Description: This file contains PatternStore, columnar storage of frequent patterns of all apps.
+             Items of patterns are stored as int32 IDs in one array with CSR offsets per pattern,
+             app, length, support and normalized support of patterns in flat arrays and patterns
+             of one app in one contiguous range. Store behaves like dict of apps, patterns of one app
+             are accessible through read-only view (used by logging and debugging).
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import copy
+from math import log
+
+import numpy as np
+
+
+class AppPatterns:
+    """Read-only view of patterns of one app."""
+
+    def __init__(self, store, app_id):
+        self.store = store
+        self.app_id = app_id
+        store._build()
+        self.start = store.app_ptr[app_id]
+        self.end = store.app_ptr[app_id + 1]
+
+    def __len__(self):
+        return int(self.end - self.start)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def itemsets(self):
+        store = self.store
+        return [
+            frozenset(
+                store.vocabulary[i]
+                for i in store.indices[store.indptr[p] : store.indptr[p + 1]]
+            )
+            for p in range(self.start, self.end)
+        ]
+
+    @property
+    def support(self):
+        return self.store.support[self.start : self.end]
+
+    @property
+    def normalized_support(self):
+        return self.store.normalized_support[self.start : self.end]
+
+    def to_frame(self):
+        # pandas is not needed to load model and score patterns
+        import pandas as pd
+
+        if self.empty:
+            return pd.DataFrame()
+        return pd.DataFrame(
+            {
+                "support": self.support,
+                "itemsets": self.itemsets,
+                "normalized_support": self.normalized_support,
+            }
+        )
+
+    def __str__(self):
+        return str(self.to_frame())
+
+    __repr__ = __str__
+
+
+class PatternStore:
+    def __init__(self):
+        self.vocabulary = []  # item ID -> item
+        self.item_ids = {}  # item -> item ID
+        self.pattern_ids = {}  # sorted item IDs -> pattern key, same itemset has the same key in all apps
+        self.apps = []  # app ID -> app name
+        self.app_ids = {}  # app name -> app ID
+
+        # per app arrays (indices, lengths, keys, support, normalized support) added since last build
+        self._chunks = {}
+        self._built = True
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.lengths = np.zeros(0, dtype=np.int32)
+        self.pattern_keys = np.zeros(0, dtype=np.int32)
+        self.pattern_app = np.zeros(0, dtype=np.int32)
+        self.support = np.zeros(0, dtype=np.float64)
+        self.normalized_support = np.zeros(0, dtype=np.float64)
+        self.app_ptr = np.zeros(1, dtype=np.int64)
+
+        # selected app IDs in order, None for all apps of the store
+        self.selection = None
+        # arrays of selected patterns which do not depend on window, built by prepare()
+        self._index = None
+
+    # --- building ---
+
+    def __setitem__(self, app, patterns):
+        """Stores patterns (DataFrame with itemsets, support and normalized_support) of app."""
+        if self.selection is not None:
+            raise TypeError("Subset of pattern store is read-only")
+        self._unbuild()
+        if app not in self.app_ids:
+            self.app_ids[app] = len(self.apps)
+            self.apps.append(app)
+
+        item_ids = []
+        lengths = []
+        keys = []
+        if not patterns.empty:
+            for itemset in patterns["itemsets"]:
+                ids = sorted(self._item_id(item) for item in itemset)
+                item_ids.extend(ids)
+                lengths.append(len(ids))
+                keys.append(self.pattern_ids.setdefault(tuple(ids), len(self.pattern_ids)))
+        num_patterns = len(lengths)
+        self._chunks[self.app_ids[app]] = (
+            np.array(item_ids, dtype=np.int32),
+            np.array(lengths, dtype=np.int32),
+            np.array(keys, dtype=np.int32),
+            np.asarray(patterns["support"] if num_patterns else [], dtype=np.float64),
+            np.asarray(
+                patterns["normalized_support"] if num_patterns else [], dtype=np.float64
+            ),
+        )
+
+    def _item_id(self, item):
+        item_id = self.item_ids.get(item)
+        if item_id is None:
+            item_id = self.item_ids[item] = len(self.vocabulary)
+            self.vocabulary.append(item)
+        return item_id
+
+    def _unbuild(self):
+        # Split flat arrays back into per app chunks, so patterns of any app can be replaced.
+        if not self._built:
+            return
+        for app_id in range(len(self.apps)):
+            start, end = self.app_ptr[app_id], self.app_ptr[app_id + 1]
+            self._chunks[app_id] = (
+                self.indices[self.indptr[start] : self.indptr[end]],
+                self.lengths[start:end],
+                self.pattern_keys[start:end],
+                self.support[start:end],
+                self.normalized_support[start:end],
+            )
+        self._built = False
+        self._index = None
+
+    def _build(self):
+        # Concatenate chunks of all apps into flat arrays, apps keep order of insertion.
+        if self._built:
+            return
+        chunks = [self._chunks[app_id] for app_id in range(len(self.apps))]
+        self.indices = np.concatenate([chunk[0] for chunk in chunks]).astype(np.int32)
+        self.lengths = np.concatenate([chunk[1] for chunk in chunks]).astype(np.int32)
+        self.pattern_keys = np.concatenate([chunk[2] for chunk in chunks]).astype(np.int32)
+        self.support = np.concatenate([chunk[3] for chunk in chunks])
+        self.normalized_support = np.concatenate([chunk[4] for chunk in chunks])
+
+        self.indptr = np.zeros(len(self.lengths) + 1, dtype=np.int64)
+        np.cumsum(self.lengths, out=self.indptr[1:])
+        counts = np.array([len(chunk[1]) for chunk in chunks], dtype=np.int64)
+        self.app_ptr = np.zeros(len(chunks) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.app_ptr[1:])
+        self.pattern_app = np.repeat(np.arange(len(chunks), dtype=np.int32), counts)
+
+        self._chunks = {}
+        self._built = True
+
+    def __getstate__(self):
+        self._build()
+        # scoring index is rebuilt on demand, it is not stored with model
+        state = dict(self.__dict__)
+        state["_index"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__.setdefault("_index", None)
+
+    # --- dict like access ---
+
+    def _selected_apps(self):
+        if self.selection is None:
+            return range(len(self.apps))
+        return self.selection
+
+    def __len__(self):
+        return len(self._selected_apps())
+
+    def __iter__(self):
+        return (self.apps[app_id] for app_id in self._selected_apps())
+
+    def __contains__(self, app):
+        app_id = self.app_ids.get(app)
+        if app_id is None:
+            return False
+        return self.selection is None or app_id in self.selection
+
+    def __getitem__(self, app):
+        if app not in self:
+            raise KeyError(app)
+        return AppPatterns(self, self.app_ids[app])
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [AppPatterns(self, app_id) for app_id in self._selected_apps()]
+
+    def items(self):
+        return [
+            (self.apps[app_id], AppPatterns(self, app_id))
+            for app_id in self._selected_apps()
+        ]
+
+    def subset(self, apps):
+        """returns read-only store of given apps (in given order), arrays are shared"""
+        self._build()
+        subset = copy.copy(self)
+        subset.selection = [self.app_ids[app] for app in apps if app in self]
+        subset._index = None
+        return subset
+
+    def complement(self, apps):
+        """returns read-only store of apps not in given apps, in order of the store"""
+        return self.subset([app for app in self if app not in apps])
+
+    @property
+    def num_patterns(self):
+        self._build()
+        if self.selection is None:
+            return len(self.lengths)
+        return int(sum(self.app_ptr[a + 1] - self.app_ptr[a] for a in self.selection))
+
+    # --- scoring ---
+
+    def _selected_patterns(self):
+        # Indices of patterns of selected apps and position of their app in selection.
+        if self.selection is None:
+            return np.arange(len(self.lengths)), self.pattern_app
+        ranges = [np.arange(self.app_ptr[a], self.app_ptr[a + 1]) for a in self.selection]
+        patterns = np.concatenate(ranges) if ranges else np.zeros(0, dtype=np.int64)
+        positions = np.repeat(
+            np.arange(len(self.selection)), [len(r) for r in ranges]
+        )
+        return patterns, positions
+
+    def prepare(self):
+        """builds scoring index of selected patterns (item offsets, idf, subset bonus weights)
+
+        Index does not depend on window, it is built once and reused by every scoring of the store,
+        forked worker processes share it.
+        """
+        if self._index is not None:
+            return self._index
+        self._build()
+        patterns, positions = self._selected_patterns()
+        total_apps = len(self._selected_apps())
+
+        lengths = self.lengths[patterns]
+        starts = self.indptr[patterns]
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(
+            lengths.sum()
+        )
+
+        # document frequency of itemsets within selected apps
+        _, inverse, counts = np.unique(
+            self.pattern_keys[patterns], return_inverse=True, return_counts=True
+        )
+        idf = np.array([log(1 + total_apps / int(count)) for count in counts])[inverse]
+        bonus = (
+            (lengths * 10).astype(np.float64)
+            * idf
+            * (self.normalized_support[patterns] + 1)
+        )
+
+        self._index = {
+            "num_patterns": len(patterns),
+            "positions": np.repeat(positions, 2),
+            "lengths": lengths,
+            "items": self.indices[offsets],
+            "owners": np.repeat(np.arange(len(patterns)), lengths),
+            "idf": idf,
+            "bonus": bonus,
+            "empty": lengths == 0,
+        }
+        return self._index
+
+    def scores(self, tls_set):
+        """scores apps by similarity of their patterns with items of window
+
+        Score of app is sum over its patterns of (jaccard + 1) * idf, patterns which are subset
+        of window items add len * 10 * idf * (normalized support + 1), where idf = log(1 + apps / df)
+        and df is number of patterns with the same itemset in selected apps.
+
+        Args:
+            tls_set (frozenset): Items of window.
+
+        Returns:
+            dict: of apps with positive score, in order of selection.
+        """
+        index = self.prepare()
+        apps = list(self._selected_apps())
+        total_apps = len(apps)
+        num_patterns = index["num_patterns"]
+        if not num_patterns:
+            return {}
+
+        in_window = np.zeros(len(self.vocabulary), dtype=bool)
+        for item in tls_set:
+            item_id = self.item_ids.get(item)
+            if item_id is not None:
+                in_window[item_id] = True
+
+        # number of items of every selected pattern present in window
+        lengths = index["lengths"]
+        intersection = np.bincount(
+            index["owners"], weights=in_window[index["items"]], minlength=num_patterns
+        )
+
+        idf = index["idf"]
+        union = lengths + len(tls_set) - intersection
+        jaccard = np.divide(
+            intersection, union, out=np.zeros(num_patterns), where=union != 0
+        )
+        similarity = (jaccard + 1) * idf
+        subset_bonus = np.where(intersection == lengths, index["bonus"], 0.0)
+        # empty itemsets are skipped
+        similarity[index["empty"]] = 0.0
+        subset_bonus[index["empty"]] = 0.0
+
+        # Both terms are added in pattern order, same as summing pattern by pattern.
+        weights = np.column_stack((similarity, subset_bonus)).ravel()
+        totals = np.bincount(index["positions"], weights=weights, minlength=total_apps)
+        return {
+            self.apps[app_id]: float(totals[position])
+            for position, app_id in enumerate(apps)
+            if totals[position] > 0
+        }
+
+    def normalized_scores(self, tls_set):
+        """scores of apps (see scores) min-max normalized to [0, 1], 0.5 when all scores are the same"""
+        scores = self.scores(tls_set)
+        if not scores:
+            return {}
+
+        min_score = min(scores.values())
+        max_score = max(scores.values())
+
+        # Prevent division by zero (if all scores are the same)
+        if min_score == max_score:
+            return {k: 0.5 for k in scores}
+
+        return {k: (v - min_score) / (max_score - min_score) for k, v in scores.items()}
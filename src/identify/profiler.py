@@ -0,0 +1,211 @@
+"""
+File: profiler.py
+Description: This file contains StageProfiler class for profiling selected stages of identification
+             (Apriori.train, FingerprintingMethod.identify, JA_Context.identify).
+             Deterministic mode uses cProfile, sampling mode periodically samples stack of the profiled thread.
+             Peak memory of every profiled stage is measured using tracemalloc.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from .logger import Logger
+
+from collections import Counter
+from contextlib import nullcontext
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+
+class _StackSampler:
+    """Samples call stack of one thread in fixed intervals from a background thread."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self.__run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+                )
+                frame = frame.f_back
+            # Root first, as expected by folded stack format.
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_folded(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def report(self, limit):
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            functions = stack.split(";")
+            own[functions[-1]] += count
+            for function in set(functions):
+                inclusive[function] += count
+
+        lines = [f"{self.samples} samples every {self.interval * 1000:.1f} ms\n"]
+        lines.append(f"{'own':>8} {'own %':>7} {'incl':>8} {'incl %':>7}  function")
+        for function, count in own.most_common(limit):
+            lines.append(
+                f"{count:>8} {100 * count / self.samples:>6.2f}% "
+                f"{inclusive[function]:>8} {100 * inclusive[function] / self.samples:>6.2f}%  {function}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+class _ProfiledStage:
+    def __init__(self, profiler, name, suffix=""):
+        self.profiler = profiler
+        self.name = name
+        # label of output files and summary, stages of more JA versions get version suffix
+        self.label = name + suffix
+
+    def __enter__(self):
+        # Tracing is kept only for the profiled stage, other stages run at full speed.
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        self.memory_start, _ = tracemalloc.get_traced_memory()
+
+        if self.profiler.mode == "sampling":
+            self.sampler = _StackSampler(
+                threading.get_ident(), self.profiler.sampling_interval
+            )
+            self.sampler.start()
+        else:
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall_time = time.perf_counter() - self.start
+
+        if self.profiler.mode == "sampling":
+            self.sampler.stop()
+        else:
+            self.cprofile.disable()
+
+        memory_end, memory_peak = tracemalloc.get_traced_memory()
+        if self.started_tracing:
+            tracemalloc.stop()
+        self.profiler._stage_finished(
+            self,
+            {
+                "wall_time": wall_time,
+                "memory_start": self.memory_start,
+                "memory_end": memory_end,
+                "memory_peak": memory_peak,
+                "memory_peak_increase": memory_peak - self.memory_start,
+            },
+        )
+
+
+class StageProfiler:
+    # Stage names selectable from command line and profiled methods.
+    STAGES = {
+        "train": "Apriori.train",
+        "fingerprint": "FingerprintingMethod.identify",
+        "context": "JA_Context.identify",
+    }
+    MODES = ("deterministic", "sampling")
+
+    def __init__(
+        self,
+        stages,
+        mode="deterministic",
+        output_dir="profile",
+        sampling_interval=0.005,
+        report_limit=40,
+    ):
+        self.stages = set(stages or [])
+        self.mode = mode
+        self.output_dir = output_dir
+        self.sampling_interval = sampling_interval
+        self.report_limit = report_limit
+        self.summary = {}
+
+    def stage(self, name, suffix=""):
+        """Context manager profiling the block if the stage was selected, no-op otherwise.
+
+        Args:
+            name (str): Stage name from STAGES.
+            suffix (str): Suffix of output files and summary label (e.g., JA version).
+        """
+        if name not in self.stages:
+            return nullcontext()
+        return _ProfiledStage(self, name, suffix)
+
+    def _stage_finished(self, stage, summary):
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, stage.label)
+
+        if self.mode == "sampling":
+            stats_file = f"{base}.folded"
+            stage.sampler.write_folded(stats_file)
+            report = stage.sampler.report(self.report_limit)
+        else:
+            stats_file = f"{base}.prof"
+            stage.cprofile.dump_stats(stats_file)
+            stream = io.StringIO()
+            stats = pstats.Stats(stage.cprofile, stream=stream)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.report_limit)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(self.report_limit)
+            report = stream.getvalue()
+
+        report_file = f"{base}.txt"
+        with open(report_file, "w") as f:
+            f.write(f"Stage: {self.STAGES[stage.name]} [{stage.label}] ({self.mode})\n")
+            f.write(f"Wall time: {summary['wall_time']:.4f} s\n")
+            f.write(f"Peak traced memory: {summary['memory_peak'] / 2**20:.2f} MiB\n\n")
+            f.write(report)
+
+        summary["method"] = self.STAGES[stage.name]
+        summary["stats_file"] = stats_file
+        summary["report_file"] = report_file
+        self.summary[stage.label] = summary
+
+        with open(os.path.join(self.output_dir, "summary.json"), "w") as f:
+            json.dump(self.summary, f, indent=2)
+
+        with Logger() as logger:
+            logger.info(
+                "Profiled %s [%s]: %.4f s, peak memory %s B, report %s",
+                self.STAGES[stage.name],
+                stage.label,
+                summary["wall_time"],
+                summary["memory_peak"],
+                report_file,
+            )
@@ -0,0 +1,199 @@
+"""
+File: readers.py
+Description: This file contains streaming readers of TLS records produced by sensors, Zeek ssl.log
+             (TSV or JSON lines) and Suricata eve.json (TLS events). Records are mapped straight to the
+             column names in config.py, so logs do not have to be converted to ;-separated CSV first.
+             Files are read line by line, at most one chunk of records is kept in memory.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as col_names
+
+from itertools import islice
+import json
+import os
+import re
+
+FORMATS = ["csv", "zeek", "zeek_json", "eve"]
+
+COLUMNS = [
+    col_names.APP_NAME,
+    col_names.FILE,
+    col_names.TYPE,
+    col_names.JA3,
+    col_names.JA3_S,
+    col_names.JA4,
+    col_names.JA4_S,
+    col_names.SNI,
+]
+
+# Zeek ssl.log fields in order of arguments of _record (ja3/ja3s and ja4/ja4s are added by JA3 and JA4 packages)
+ZEEK_FIELDS = ["ja3", "ja3s", "ja4", "ja4s", "server_name"]
+
+_ZEEK_ESCAPE = re.compile(r"\\x([0-9a-fA-F]{2})")
+
+
+def _unescape(value):
+    if "\\x" not in value:
+        return value
+    return _ZEEK_ESCAPE.sub(lambda match: chr(int(match.group(1), 16)), value)
+
+
+def detect_format(path):
+    """detects format of file by its first line"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        line = f.readline()
+    if line.startswith("#separator"):
+        return "zeek"
+    if line.lstrip().startswith("{"):
+        record = json.loads(line)
+        return "eve" if "event_type" in record else "zeek_json"
+    return "csv"
+
+
+def _record(app_name, filename, ja3, ja3s, ja4, ja4s, sni):
+    # Sensors see only client traffic, records are of type 0 (kept in dataset).
+    return {
+        col_names.APP_NAME: app_name,
+        col_names.FILE: filename,
+        col_names.TYPE: "0",
+        col_names.JA3: ja3 or None,
+        col_names.JA3_S: ja3s or None,
+        col_names.JA4: ja4 or None,
+        col_names.JA4_S: ja4s or None,
+        col_names.SNI: sni or None,
+    }
+
+
+def _label(path, app_name):
+    # Logs are not labeled, app is given or taken from the directory of the log (<app>/ssl.log).
+    if app_name is None:
+        app_name = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    return app_name, path
+
+
+def read_zeek(path, app_name=None):
+    """yields records of Zeek ssl.log in TSV format"""
+    app_name, filename = _label(path, app_name)
+    separator = "\t"
+    unset = "-"
+    empty = "(empty)"
+    positions = None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line.startswith("#"):
+                directive, _, value = line[1:].partition(
+                    " " if line.startswith("#separator") else separator
+                )
+                if directive == "separator":
+                    separator = _unescape(value)
+                elif directive == "unset_field":
+                    unset = value
+                elif directive == "empty_field":
+                    empty = value
+                elif directive == "fields":
+                    fields = value.split(separator)
+                    positions = [
+                        fields.index(field) if field in fields else None
+                        for field in ZEEK_FIELDS
+                    ]
+                continue
+            if positions is None or not line:
+                continue
+
+            values = line.split(separator)
+            fingerprints = []
+            for position in positions:
+                value = values[position] if position is not None else unset
+                fingerprints.append(
+                    None if value == unset or value == empty else _unescape(value)
+                )
+            yield _record(app_name, filename, *fingerprints)
+
+
+def read_zeek_json(path, app_name=None):
+    """yields records of Zeek ssl.log in JSON lines format"""
+    app_name, filename = _label(path, app_name)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            yield _record(app_name, filename, *(entry.get(field) for field in ZEEK_FIELDS))
+
+
+def read_eve(path, app_name=None):
+    """yields records of TLS events of Suricata eve.json, other events are skipped"""
+    app_name, filename = _label(path, app_name)
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            # cheap check before parsing, most of events are not TLS
+            if '"tls"' not in line:
+                continue
+            entry = json.loads(line)
+            if entry.get("event_type") != "tls":
+                continue
+            tls = entry.get("tls", {})
+            yield _record(
+                app_name,
+                filename,
+                tls.get("ja3", {}).get("hash"),
+                tls.get("ja3s", {}).get("hash"),
+                tls.get("ja4"),
+                tls.get("ja4s"),
+                tls.get("sni"),
+            )
+
+
+READERS = {
+    "zeek": read_zeek,
+    "zeek_json": read_zeek_json,
+    "eve": read_eve,
+}
+
+
+def read_records(path, app_name=None, file_format=None):
+    """yields records (dicts with column names of config.py) of sensor log
+
+    Args:
+        path (str): Path to Zeek ssl.log or Suricata eve.json.
+        app_name (str): Label of records, defaults to name of directory of the log.
+        file_format (str): One of FORMATS except csv, detected from the file if None.
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in READERS:
+        raise ValueError(f"{path} is not Zeek ssl.log or Suricata eve.json")
+    return READERS[file_format](path, app_name)
+
+
+def read_frames(path, chunk_size=None, app_name=None, file_format=None):
+    """yields records of sensor log in DataFrames of at most chunk_size rows, missing values are NaN as in CSV"""
+    # pandas is imported only when DataFrames are requested, records can be streamed without it
+    import numpy as np
+    import pandas as pd
+
+    chunk_size = chunk_size or col_names.READER_CHUNK_SIZE
+    records = read_records(path, app_name, file_format)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        frame = pd.DataFrame.from_records(chunk, columns=COLUMNS)
+        yield frame.where(frame.notna(), np.nan)
+
+
+def read_dataframe(path, columns=None, chunk_size=None):
+    """reads whole sensor log into DataFrame with given columns, chunk by chunk"""
+    import pandas as pd
+
+    frames = [
+        frame.filter(columns) if columns is not None else frame
+        for frame in read_frames(path, chunk_size)
+    ]
+    if not frames:
+        return pd.DataFrame(columns=columns if columns is not None else COLUMNS)
+    return pd.concat(frames, ignore_index=True)
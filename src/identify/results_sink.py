@@ -0,0 +1,152 @@
+"""
+File: results_sink.py
+Description: This file contains ResultsSink, columnar log of predictions of every test record (real app,
+             JA and combination candidates, top-k context guesses with scores and branch of context which
+             produced them). Records are buffered and converted to column arrays per batch, file is opened
+             once, Parquet (requires pyarrow) gets one row group per batch, NumPy .npz is written on close.
+             Log can be loaded back into DataFrame by load_results for offline analysis.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as CONFIG
+from .logger import Logger
+
+import numpy as np
+import pandas as pd
+
+# candidates of one record are stored in one string column
+CANDIDATE_SEPARATOR = "|"
+
+SCOPES = {False: "ja", True: "comb"}
+
+
+def _output_path(path):
+    # np.savez_compressed appends .npz to other paths, path is normalized so it names the written file
+    if path.endswith(".parquet") or path.endswith(".npz"):
+        return path
+    return path + ".npz"
+
+
+class ResultsSink:
+    def __init__(self, path, top_k, batch_size=None):
+        """
+        Args:
+            path (str): Output file, .parquet for Parquet, NumPy .npz otherwise (.npz is appended if missing).
+            top_k (int): Number of context guesses stored per record.
+            batch_size (int): Number of records converted to columns at once.
+        """
+        self.path = _output_path(path)
+        self.top_k = top_k
+        self.batch_size = batch_size or CONFIG.RESULTS_BATCH_SIZE
+        self.parquet = self.path.endswith(".parquet")
+        self.writer = None
+        if self.parquet:
+            # optional dependency, only needed for Parquet output
+            import pyarrow  # noqa: F401
+
+        self.columns = self._columns()
+        self._buffer = {column: [] for column in self.columns}
+        self._batches = []
+        self.num_records = 0
+
+    def _columns(self):
+        columns = ["ja_version", "record", "window_start", "real_app", "filename"]
+        for scope in SCOPES.values():
+            columns += [f"{scope}_candidates", f"{scope}_num_candidates", f"{scope}_branch"]
+            columns.append(f"{scope}_correct_rank")
+            for rank in range(1, self.top_k + 1):
+                columns += [f"{scope}_top{rank}_app", f"{scope}_top{rank}_score"]
+        return columns
+
+    def add(self, ja_version, record, window_start, row, candidates, guesses, branches):
+        """buffers prediction of one record
+
+        Args:
+            ja_version (int): Evaluated JA version.
+            record (int): Position of record in shuffled test data.
+            window_start (int): Position of first record of sliding window.
+            row (Series): Identified record.
+            candidates (dict): Fingerprinting candidates per scope (is_comb).
+            guesses (dict): Context guesses [(app, score)] per scope (is_comb).
+            branches (dict): Branch of context which produced guesses per scope (is_comb).
+        """
+        buffer = self._buffer
+        real_app = row[CONFIG.APP_NAME]
+        buffer["ja_version"].append(ja_version)
+        buffer["record"].append(record)
+        buffer["window_start"].append(window_start)
+        buffer["real_app"].append(str(real_app))
+        buffer["filename"].append(str(row[CONFIG.FILE]))
+        for is_comb, scope in SCOPES.items():
+            buffer[f"{scope}_candidates"].append(
+                CANDIDATE_SEPARATOR.join(sorted(map(str, candidates[is_comb])))
+            )
+            buffer[f"{scope}_num_candidates"].append(len(candidates[is_comb]))
+            buffer[f"{scope}_branch"].append(branches[is_comb] or "")
+            top = guesses[is_comb][: self.top_k]
+            apps = [app for app, _ in top]
+            buffer[f"{scope}_correct_rank"].append(
+                apps.index(real_app) + 1 if real_app in apps else 0
+            )
+            for rank in range(1, self.top_k + 1):
+                app, score = top[rank - 1] if rank <= len(top) else ("", np.nan)
+                buffer[f"{scope}_top{rank}_app"].append(str(app))
+                buffer[f"{scope}_top{rank}_score"].append(float(score))
+
+        self.num_records += 1
+        if len(buffer["record"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer["record"]:
+            return
+        batch = {column: np.asarray(values) for column, values in self._buffer.items()}
+        self._buffer = {column: [] for column in self.columns}
+        if self.parquet:
+            self._write_parquet(batch)
+        else:
+            self._batches.append(batch)
+
+    def _write_parquet(self, batch):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(batch)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        self.flush()
+        if self.parquet:
+            if self.writer is not None:
+                self.writer.close()
+        else:
+            arrays = {
+                column: np.concatenate([batch[column] for batch in self._batches])
+                if self._batches
+                else np.zeros(0)
+                for column in self.columns
+            }
+            np.savez_compressed(self.path, **arrays)
+            self._batches = []
+        with Logger() as logger:
+            logger.info("Predictions of %s records written to %s", self.num_records, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def load_results(path):
+    """loads prediction log written by ResultsSink (to the same path) into DataFrame"""
+    path = _output_path(path)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    with np.load(path) as arrays:
+        return pd.DataFrame({column: arrays[column] for column in arrays.files})
@@ -0,0 +1,138 @@
+"""
+File: sampling.py
+Description: This file contains SupportSampler, which bounds number of rows mined per app.
+             Rows of large app groups are reduced to uniform reservoir sample, whose size is given by Hoeffding
+             inequality, so support of every itemset in the sample differs from its real support by more than
+             the error with probability lower than 1 - confidence. Supports of patterns mined from the sample
+             can be verified on all rows of the group in one extra scan.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config
+
+import math
+import random
+
+import numpy as np
+
+
+def hoeffding_sample_size(error, confidence):
+    """number of rows, so that P(|sample support - support| > error) <= 1 - confidence"""
+    return math.ceil(math.log(2 / (1 - confidence)) / (2 * error**2))
+
+
+def reservoir_sample(num_items, size, rng):
+    """indices of uniform sample of size items out of num_items, sorted
+
+    Algorithm L skips over items which would not enter the reservoir,
+    so only O(size * (1 + log(num_items / size))) random numbers are drawn.
+    """
+    if num_items <= size:
+        return list(range(num_items))
+    reservoir = list(range(size))
+    # 1 - random() is in (0, 1], so logarithm is defined
+    w = math.exp(math.log(1 - rng.random()) / size)
+    i = size - 1
+    while True:
+        i += math.floor(math.log(1 - rng.random()) / math.log(1 - w)) + 1
+        if i >= num_items:
+            break
+        reservoir[rng.randrange(size)] = i
+        w *= math.exp(math.log(1 - rng.random()) / size)
+    return sorted(reservoir)
+
+
+class SupportSampler:
+    def __init__(self, error, confidence=0.95, verify=False, seed=0):
+        """
+        Args:
+            error (float): Allowed difference of sample support and real support.
+            confidence (float): Probability that the difference is within the error.
+            verify (bool): Mine with support lowered by error and compute exact supports of mined patterns.
+            seed (int): Seed of sampling, same seed gives the same sample.
+        """
+        self.error = error
+        self.confidence = confidence
+        self.verify = verify
+        self.seed = seed
+        self.sample_size = hoeffding_sample_size(error, confidence)
+
+        self.sampled_apps = 0
+        self.total_rows = 0
+        self.mined_rows = 0
+        self.rejected_patterns = 0
+
+    def parameters(self):
+        return {
+            "error": self.error,
+            "confidence": self.confidence,
+            "verify": self.verify,
+            "seed": self.seed,
+        }
+
+    def should_sample(self, group):
+        return len(group) > self.sample_size
+
+    def sample(self, group):
+        rng = random.Random(f"{self.seed}:{group[config.APP_NAME].iloc[0]}")
+        indices = reservoir_sample(len(group), self.sample_size, rng)
+        self.sampled_apps += 1
+        self.total_rows += len(group)
+        self.mined_rows += len(indices)
+        return group.iloc[indices]
+
+    def mining_support(self, min_support):
+        # With verification no pattern frequent in all rows may be lost in the sample.
+        if self.verify:
+            return max(min_support - self.error, 1 / self.sample_size)
+        return min_support
+
+    def verify_supports(self, patterns, group, min_support):
+        """replaces sample supports of patterns by exact supports in all rows of group
+
+        Args:
+            patterns (df): Patterns mined from sample (support, itemsets).
+            group (df): All rows of app.
+            min_support (float): Minimum support, patterns with lower exact support are dropped.
+
+        Returns:
+            df: patterns with exact supports.
+        """
+        data = group.filter(config.columns_to_keep_for_context).astype(str).values
+        masks = {}
+        supports = []
+        for itemset in patterns["itemsets"]:
+            mask = np.ones(len(data), dtype=bool)
+            for item in itemset:
+                if item not in masks:
+                    masks[item] = (data == item).any(axis=1)
+                mask &= masks[item]
+            supports.append(mask.mean())
+
+        patterns = patterns.assign(support=supports)
+        verified = patterns[patterns["support"] >= min_support]
+        self.rejected_patterns += len(patterns) - len(verified)
+        return verified.reset_index(drop=True)
+
+    def merge_statistics(self, other):
+        # counters of sampler copy used in worker process
+        self.sampled_apps += other.sampled_apps
+        self.total_rows += other.total_rows
+        self.mined_rows += other.mined_rows
+        self.rejected_patterns += other.rejected_patterns
+
+    def display_statistics(self):
+        if not self.sampled_apps:
+            print(f"Sampling: no app has more than {self.sample_size} rows\n")
+            return
+        print(
+            f"Sampling: {self.sampled_apps} apps sampled to {self.sample_size} rows, "
+            f"mined {self.mined_rows} of {self.total_rows} rows "
+            f"({round(self.mined_rows / self.total_rows, 4)})"
+        )
+        if self.verify:
+            print(f"  Patterns rejected by exact support: {self.rejected_patterns}")
+        print()
@@ -0,0 +1,98 @@
+"""
+File: score_cache.py
+Description: This file contains in-memory cache of context scores. Consecutive windows often contain the same
+             items (clipped windows at start and end of test data, long runs of one app) and records share the
+             same candidate subsets, normalized scores of apps of (set of selected apps, window items) are
+             therefore stored and not computed again. Top guesses are selected from stored scores in order of
+             the current selection, so ties are resolved the same as without the cache. Number of entries is
+             limited, least recently used entries are evicted first.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from collections import OrderedDict
+import sys
+
+
+class ScoreCache:
+    def __init__(self, max_entries):
+        """
+        Args:
+            max_entries (int): Maximum number of stored results.
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.size = 0  # approximate size of keys and results in bytes
+        self.peak_size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, patterns, window_items):
+        """canonical key of scoring of window items against selected apps of pattern store
+
+        Scores do not depend on order of selected apps, selection is keyed as a set.
+        """
+        selection = patterns.selection
+        return (frozenset(selection) if selection is not None else None, window_items)
+
+    @staticmethod
+    def ordered(scores, patterns):
+        """stored scores in order of apps of the pattern store (selection)"""
+        if patterns.selection is None:
+            return scores
+        return {app: scores[app] for app in patterns if app in scores}
+
+    def get(self, key):
+        """returns stored normalized scores (app -> score) of key or None"""
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        self.size += self._entry_size(key, result)
+        self.peak_size = max(self.peak_size, self.size)
+        while len(self.entries) > self.max_entries:
+            old_key, old_result = self.entries.popitem(last=False)
+            self.size -= self._entry_size(old_key, old_result)
+            self.evictions += 1
+
+    def _entry_size(self, key, result):
+        # items and apps are shared with test data and pattern store, containers and scores are counted
+        selection, window_items = key
+        size = sys.getsizeof(key) + sys.getsizeof(window_items) + sys.getsizeof(result)
+        if selection is not None:
+            size += sys.getsizeof(selection)
+        return size + sum(sys.getsizeof(score) for score in result.values())
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def statistics(self):
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "size": self.size,
+            "peak_size": self.peak_size,
+        }
+
+    def display_statistics(self):
+        print(
+            f"Score cache: hits {self.hits}, misses {self.misses} (hit rate {round(self.hit_rate, 4)}), "
+            f"evictions {self.evictions}, entries {len(self.entries)}, "
+            f"memory {round(self.size / 2**20, 2)} MiB (peak {round(self.peak_size / 2**20, 2)} MiB)\n"
+        )
@@ -0,0 +1,225 @@
+"""
+File: server.py
+Description: This file contains long-running identification server, which keeps trained model in memory
+             and classifies batches of TLS records received over a local Unix domain socket.
+             Messages are JSON documents prefixed with their length (4 bytes, big-endian).
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from .inference import InferenceClassifier
+from .model import Model
+from .logger import Logger
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import signal
+import struct
+import threading
+import time
+
+HEADER = struct.Struct(">I")
+MAX_MESSAGE_SIZE = 64 * 2**20
+
+
+async def read_message(reader):
+    """Reads one length-prefixed JSON message, returns None when the peer closed the connection."""
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Message of {length} B exceeds limit of {MAX_MESSAGE_SIZE} B")
+    return json.loads(await reader.readexactly(length))
+
+
+async def write_message(writer, message):
+    data = json.dumps(message).encode()
+    writer.write(HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+class Classifier:
+    """
+    Classifies batches of TLS records with one loaded model, from any number of threads.
+    Every thread classifies with its own InferenceClassifier, so fallback counters are not shared.
+    """
+
+    def __init__(self, model: Model, sliding_window_size, top_k, model_path=None):
+        self.model = model
+        self.model_path = model_path
+        self.loaded_at = time.time()
+        self.sliding_window_size = sliding_window_size
+        self.top_k = top_k
+        self._local = threading.local()
+        self._classifiers = []  # classifier of every thread, summed by statistics
+        self._classifiers_lock = threading.Lock()
+
+    def _classifier(self):
+        classifier = getattr(self._local, "classifier", None)
+        if classifier is None:
+            classifier = self._local.classifier = InferenceClassifier(
+                self.model, self.sliding_window_size, self.top_k
+            )
+            with self._classifiers_lock:
+                self._classifiers.append(classifier)
+        return classifier
+
+    def classify(self, records, top_k=None):
+        return self._classifier().classify(records, top_k)
+
+    def statistics(self):
+        with self._classifiers_lock:
+            contexts = [classifier.context for classifier in self._classifiers]
+        counters = {
+            counter: sum(getattr(context, counter) for context in contexts)
+            for counter in (
+                "context_using_whole_db",
+                "context_using_whole_db_comb",
+                "pure_context",
+                "pure_context_comb",
+            )
+        }
+        return {
+            "model_path": self.model_path,
+            "loaded_at": self.loaded_at,
+            "ja_version": self.model.ja_version,
+            "apps": len(self.model.frequent_patterns),
+            **counters,
+        }
+
+
+class IdentificationServer:
+    def __init__(self, socket_path, model_path, sliding_window_size, top_k, workers=4):
+        self.socket_path = socket_path
+        self.model_path = model_path
+        self.sliding_window_size = sliding_window_size
+        self.top_k = top_k
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.classifier = None
+        self.requests = 0
+        self.records = 0
+        self.reloads = 0
+        self.reload_error = None  # error of the last failed reload
+        self._reload_lock = None
+
+    def _load_classifier(self, path):
+        model = Model.load(path)
+        return Classifier(model, self.sliding_window_size, self.top_k, path)
+
+    async def reload(self, path=None):
+        """
+        Loads model in background and swaps it atomically.
+        Requests already running keep the classifier they started with.
+        Failure is logged and the current model is kept, None is returned then
+        (reload requested by SIGHUP has nobody to report the error to).
+        """
+        path = path or self.model_path
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            try:
+                classifier = await loop.run_in_executor(
+                    self.executor, self._load_classifier, path
+                )
+            except Exception as e:
+                self.reload_error = f"Model reload from {path} failed: {e}"
+                with Logger() as logger:
+                    logger.error("%s", self.reload_error)
+                return None
+            self.classifier = classifier
+            self.model_path = path
+            self.reloads += 1
+        with Logger() as logger:
+            logger.info("Model reloaded from %s", path)
+        return classifier
+
+    async def serve_forever(self):
+        self._reload_lock = asyncio.Lock()
+        self.classifier = self._load_classifier(self.model_path)
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.ensure_future(self.reload()))
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        with Logger() as logger:
+            logger.info("Identification server listening on %s", self.socket_path)
+        print(f"Listening on {self.socket_path}")
+
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            self.executor.shutdown(wait=True)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                request = await read_message(reader)
+                if request is None:
+                    break
+                try:
+                    response = await self._dispatch(request)
+                except Exception as e:
+                    with Logger() as logger:
+                        logger.error("Request failed: %s", e)
+                    response = {"ok": False, "error": str(e)}
+                await write_message(writer, response)
+        except (ConnectionResetError, BrokenPipeError, ValueError) as e:
+            with Logger() as logger:
+                logger.warn("Connection closed: %s", e)
+        finally:
+            writer.close()
+
+    async def _dispatch(self, request):
+        op = request.get("op", "classify")
+
+        if op == "classify":
+            records = request.get("records", [])
+            # Keep reference, so the request finishes on the same model even if reloaded meanwhile.
+            classifier = self.classifier
+            loop = asyncio.get_running_loop()
+            start = time.perf_counter()
+            results = await loop.run_in_executor(
+                self.executor, classifier.classify, records, request.get("top_k")
+            )
+            self.requests += 1
+            self.records += len(records)
+            return {
+                "ok": True,
+                "results": results,
+                "model_path": classifier.model_path,
+                "took": time.perf_counter() - start,
+            }
+
+        if op == "reload":
+            classifier = await self.reload(request.get("path"))
+            if classifier is None:
+                return {"ok": False, "error": self.reload_error}
+            return {"ok": True, "model_path": classifier.model_path}
+
+        if op == "stats":
+            return {
+                "ok": True,
+                "requests": self.requests,
+                "records": self.records,
+                "reloads": self.reloads,
+                "model": self.classifier.statistics(),
+            }
+
+        if op == "ping":
+            return {"ok": True}
+
+        raise ValueError(f"Unknown operation: {op}")
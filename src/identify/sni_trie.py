@@ -0,0 +1,153 @@
+"""
+File: sni_trie.py
+Description: This file contains trie of reversed domain labels for SNI lookups.
+             Besides exact match it finds apps of registrable domain (example.com of cdn.eu.example.com)
+             or of the longest known suffix, so new subdomains of known domains are not missed.
+             Lookup visits one node per label of the domain.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+WILDCARD = "*"
+
+# Public suffixes with two labels, registrable domain has one label more.
+TWO_LABEL_SUFFIXES = {
+    "co.uk",
+    "org.uk",
+    "ac.uk",
+    "gov.uk",
+    "com.au",
+    "net.au",
+    "org.au",
+    "co.jp",
+    "ne.jp",
+    "co.kr",
+    "com.br",
+    "com.cn",
+    "com.tw",
+    "com.hk",
+    "co.in",
+    "co.nz",
+    "co.za",
+    "com.mx",
+    "com.tr",
+    "com.sg",
+}
+
+
+def _labels(domain):
+    # Reversed labels of domain, trailing dot and letter case are ignored.
+    return domain.strip(".").lower().split(".")[::-1]
+
+
+def registrable_depth(labels):
+    """number of reversed labels forming the registrable domain"""
+    if len(labels) >= 3 and f"{labels[1]}.{labels[0]}" in TWO_LABEL_SUFFIXES:
+        return 3
+    return 2
+
+
+class _Node:
+    __slots__ = ("children", "apps", "subtree")
+
+    def __init__(self):
+        self.children = {}
+        self.apps = None  # apps of domain ending in this node
+        self.subtree = set()  # apps of all domains below this node
+
+
+class SNITrie:
+    MODES = ["exact", "registrable", "suffix"]
+
+    def __init__(self):
+        self.root = _Node()
+        self.size = 0
+
+    @classmethod
+    def from_lookup_table(cls, sni_table, wildcards_only=False):
+        """
+        Args:
+            sni_table (dict): Lookup table of SNI column (domain -> set of apps).
+            wildcards_only (bool): Insert only wildcard domains (*.example.com), enough for exact mode,
+                                   other domains are matched by the table itself.
+        """
+        trie = cls()
+        for domain, apps in sni_table.items():
+            if not isinstance(domain, str) or not domain:
+                continue
+            if wildcards_only and not domain.startswith(WILDCARD + "."):
+                continue
+            trie.insert(domain, apps)
+        return trie
+
+    def insert(self, domain, apps):
+        node = self.root
+        node.subtree.update(apps)
+        for label in _labels(domain):
+            node = node.children.setdefault(label, _Node())
+            node.subtree.update(apps)
+        if node.apps is None:
+            node.apps = set()
+            self.size += 1
+        node.apps.update(apps)
+
+    def _walk(self, labels):
+        # Deepest node on the path of labels and its depth, wildcard nodes are matched on the last label.
+        node = self.root
+        depth = 0
+        for i, label in enumerate(labels):
+            child = node.children.get(label)
+            if child is None:
+                wildcard = node.children.get(WILDCARD)
+                if wildcard is not None and i == len(labels) - 1:
+                    return wildcard, depth + 1
+                break
+            node = child
+            depth += 1
+        return node, depth
+
+    def _exact(self, labels):
+        # Apps of the domain, or of wildcard entry replacing its first label.
+        node = self.root
+        for label in labels[:-1]:
+            node = node.children.get(label)
+            if node is None:
+                return set()
+        child = node.children.get(labels[-1])
+        if child is not None and child.apps:
+            return child.apps
+        wildcard = node.children.get(WILDCARD)
+        if wildcard is not None and wildcard.apps:
+            return wildcard.apps
+        return set()
+
+    def get(self, domain, mode="exact"):
+        """returns apps of domain
+
+        Args:
+            domain (str): Server name.
+            mode (str): exact - apps of the same domain or of wildcard entry of its parent domain
+                               (*.example.com matches cdn.example.com, not eu.cdn.example.com),
+                        registrable - apps of all known domains under the same registrable domain,
+                        suffix - apps of all known domains under the longest known suffix,
+                                 which is at least the registrable domain.
+
+        Returns:
+            set: of apps, empty if not found.
+        """
+        if not isinstance(domain, str) or not domain:
+            return set()
+        labels = _labels(domain)
+        if mode == "exact":
+            return self._exact(labels)
+
+        node, depth = self._walk(labels)
+
+        min_depth = registrable_depth(labels)
+        if depth < min_depth:
+            return set()
+        if mode == "registrable":
+            node, _ = self._walk(labels[:min_depth])
+        return node.subtree
@@ -0,0 +1,192 @@
+"""
+File: sweep.py
+Description: This file contains Sweep class, which evaluates combinations of hyperparameters
+             (min_support, pattern filters, sliding window size, candidate size) over one loaded dataset.
+             Every app is mined only once with the lowest requested support, patterns for higher supports
+             and other filters are derived from this result, since every itemset frequent with higher support
+             is also frequent with the lower one. Configurations are evaluated in parallel processes.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config
+from .database import Database
+from .fingerprinting import FingerprintingMethod
+from .pattern_matching import Apriori
+from .ja_context import JA_Context
+from .logger import Logger
+from .pattern_store import PatternStore
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from types import SimpleNamespace
+import csv
+import multiprocessing
+import time
+
+# State shared with forked worker processes (dataset and derived patterns are not pickled).
+_shared = {}
+
+
+def _evaluate(configuration):
+    min_support, filters, window, candidate_size = configuration
+    db = _shared["db"]
+    db.frequent_patterns = _shared["patterns"][(min_support, filters)]
+
+    fingerprinting = FingerprintingMethod(db.ja_version)
+    context = Apriori(min_support, db.ja_version, candidate_size)
+    ja_context = JA_Context(fingerprinting, context, window)
+
+    start_time = time.time()
+    ja_context.identify(db)
+    identification_time = time.time() - start_time
+
+    num_of_patterns = sum(len(patterns) for patterns in db.frequent_patterns.values())
+    rows = []
+    for is_comb in (False, True):
+        row = context.get_statistics(is_comb)
+        row["filters"] = filters
+        row["sliding_window_size"] = window
+        row["num_of_patterns"] = num_of_patterns
+        row["derive_time"] = _shared["derive_times"][(min_support, filters)]
+        row["time"] = identification_time
+        rows.append(row)
+    return rows
+
+
+class Sweep:
+    def __init__(
+        self,
+        dataset,
+        ja_version,
+        min_supports,
+        sliding_window_sizes,
+        candidate_sizes,
+        filter_presets,
+        workers=1,
+    ):
+        self.dataset = dataset
+        self.ja_version = ja_version
+        self.min_supports = sorted(set(min_supports))
+        self.sliding_window_sizes = sliding_window_sizes
+        self.candidate_sizes = candidate_sizes
+        self.filter_presets = filter_presets
+        self.workers = workers
+        self.timings = {}
+
+    def run(self):
+        with Logger() as logger:
+            start_time = time.time()
+            db = Database(self.dataset)
+            db.create_lookup_table(self.ja_version)
+            self.timings["load"] = time.time() - start_time
+
+            start_time = time.time()
+            mined = self._mine(db, self.min_supports[0])
+            self.timings["mining"] = time.time() - start_time
+            logger.info(
+                "Sweep mined %s apps with min_support=%s in %.2f s",
+                len(mined),
+                self.min_supports[0],
+                self.timings["mining"],
+            )
+
+            patterns = {}
+            derive_times = {}
+            for min_support, filters in product(self.min_supports, self.filter_presets):
+                start_time = time.time()
+                patterns[(min_support, filters)] = self._derive(mined, min_support, filters)
+                derive_times[(min_support, filters)] = time.time() - start_time
+
+            configurations = list(
+                product(
+                    self.min_supports,
+                    self.filter_presets,
+                    self.sliding_window_sizes,
+                    self.candidate_sizes,
+                )
+            )
+            logger.info("Sweep evaluates %s configurations", len(configurations))
+
+            _shared.update(db=db, patterns=patterns, derive_times=derive_times)
+            try:
+                if self.workers > 1:
+                    with ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("fork"),
+                    ) as executor:
+                        results = list(executor.map(_evaluate, configurations))
+                else:
+                    results = [_evaluate(configuration) for configuration in configurations]
+            finally:
+                _shared.clear()
+
+            return [row for rows in results for row in rows]
+
+    def _mine(self, db, min_support):
+        # Unfiltered frequent patterns of every app with the lowest support.
+        miner = Apriori(min_support, self.ja_version, max(self.candidate_sizes))
+        mined = {}
+        for app, one_app_tls in db.get_train_df().groupby(config.APP_NAME):
+            mined[app] = miner._execute_apriori(one_app_tls)
+        return mined
+
+    def _derive(self, mined, min_support, filters):
+        # Same patterns as Apriori.train would store for given support and filters.
+        apriori = Apriori(min_support, self.ja_version, max(self.candidate_sizes))
+        apriori.pattern_filters = config.PATTERN_FILTER_PRESETS[filters]
+        holder = SimpleNamespace(frequent_patterns=PatternStore())
+        for app, patterns in mined.items():
+            frequent = patterns[patterns["support"] >= min_support].copy()
+            apriori._add_patterns_to_db(app, frequent, holder)
+        return holder.frequent_patterns
+
+    def export_to_csv(self, rows, csv_file):
+        max_candidates = max(self.candidate_sizes)
+        headers = [
+            "is_comb",
+            "min_support",
+            "filters",
+            "sliding_window_size",
+            "candidate_size",
+            "ja_version",
+            "correct",
+            "incorrect",
+            "empty_candidates",
+            "num_of_patterns",
+            "total",
+            "accuracy_overall",
+            "error_rate",
+            "empty_ja",
+            "pure_context",
+            "context_using_whole_db",
+            "avg_len_of_candidates",
+            "derive_time",
+            "time",
+        ]
+        headers += [f"guess_{i}" for i in range(1, max_candidates + 1)]
+        headers += [f"guess_perc_{i}" for i in range(1, max_candidates + 1)]
+
+        with open(csv_file, mode="w", newline="") as csvfile:
+            csv_writer = csv.DictWriter(csvfile, fieldnames=headers, delimiter=";")
+            csv_writer.writeheader()
+            csv_writer.writerows(rows)
+
+    def display_results(self, rows):
+        print(f"Load: {round(self.timings['load'], 2)} s")
+        print(
+            f"Mining (min_support={self.min_supports[0]}): {round(self.timings['mining'], 2)} s\n"
+        )
+        print(
+            f"{'comb':<6}{'support':<9}{'filters':<13}{'window':<8}{'cand':<6}"
+            f"{'accuracy':<10}{'1. guess':<10}{'whole db':<10}{'pure ctx':<10}{'time':<8}"
+        )
+        for row in rows:
+            print(
+                f"{str(row['is_comb']):<6}{row['min_support']:<9}{row['filters']:<13}"
+                f"{row['sliding_window_size']:<8}{row['candidate_size']:<6}"
+                f"{round(row['accuracy_overall'], 4):<10}{round(row['guess_perc_1'], 4):<10}"
+                f"{row['context_using_whole_db']:<10}{row['pure_context']:<10}{round(row['time'], 2):<8}"
+            )
@@ -0,0 +1,106 @@
+"""
+File: loadgen.py
+Description: Local load generator for identification server (serve.py).
+             Sends batches of records from a dataset over several connections and measures throughput and latency.
+             Records can be streamed from Zeek ssl.log or Suricata eve.json instead of the CSV dataset.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config as col_names
+from identify.server import read_message, write_message
+from identify.readers import detect_format, read_records
+
+import argparse
+import asyncio
+from itertools import islice
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def load_records(dataset, limit=None):
+    if detect_format(dataset) != "csv":
+        # records of sensor logs are streamed, only records needed for requests are read
+        return list(islice(read_records(dataset), limit))
+    df = pd.read_csv(dataset, delimiter=";")
+    df = df[~df[col_names.TYPE].isin(["A", "M"])]
+    df = df.filter(col_names.columns_to_keep_in_db)
+    # NaN is not valid JSON, missing values are sent as null.
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict(orient="records")
+
+
+async def run_connection(socket_path, batches, latencies, reload_every, top_k):
+    reader, writer = await asyncio.open_unix_connection(socket_path)
+    try:
+        for i, batch in enumerate(batches):
+            if reload_every and i and i % reload_every == 0:
+                await write_message(writer, {"op": "reload"})
+                response = await read_message(reader)
+                if not response["ok"]:
+                    raise RuntimeError(response["error"])
+
+            start = time.perf_counter()
+            await write_message(writer, {"op": "classify", "records": batch, "top_k": top_k})
+            response = await read_message(reader)
+            latencies.append(time.perf_counter() - start)
+            if not response["ok"]:
+                raise RuntimeError(response["error"])
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run(args):
+    records = load_records(args.dataset, args.requests * args.batch_size)
+    batches = [
+        records[i : i + args.batch_size] for i in range(0, len(records), args.batch_size)
+    ]
+    # Repeat dataset until requested number of batches is reached.
+    batches = [batches[i % len(batches)] for i in range(args.requests)]
+
+    # Batches are spread over connections in round-robin order.
+    per_connection = [batches[i :: args.concurrency] for i in range(args.concurrency)]
+    latencies = []
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_connection(args.socket, conn_batches, latencies, args.reload_every, args.top_k)
+            for conn_batches in per_connection
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    num_records = sum(len(batch) for batch in batches)
+    latencies = np.array(latencies) * 1000
+    print(f"Requests: {len(batches)} (batch size {args.batch_size}, connections {args.concurrency})")
+    print(f"Records: {num_records}")
+    print(f"Elapsed: {round(elapsed, 2)} s")
+    print(f"Throughput: {round(num_records / elapsed, 2)} records/s, {round(len(batches) / elapsed, 2)} requests/s")
+    print(
+        f"Latency [ms]: mean {latencies.mean():.2f}, p50 {np.percentile(latencies, 50):.2f}, "
+        f"p95 {np.percentile(latencies, 95):.2f}, p99 {np.percentile(latencies, 99):.2f}, max {latencies.max():.2f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-d", "--dataset", type=str, required=True)
+    parser.add_argument("-s", "--socket", type=str, default="identify.sock")
+    parser.add_argument("-b", "--batch_size", type=int, default=50)
+    parser.add_argument("-n", "--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("-c", "--top_k", type=int, default=3)
+    parser.add_argument(
+        "--reload_every",
+        type=int,
+        default=0,
+        help="send reload request after every N batches on each connection",
+    )
+
+    asyncio.run(run(parser.parse_args()))
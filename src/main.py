@@ -4,7 +4,7 @@ Description: Main file for identification of applications using JA3/4 fingerprin
 Author: Pomsar Jakub
 Xlogin: xpomsa00
 Created: 15/11/2024
-Updated: 13/05/2025
+Updated: 19/10/2026
 """
 
 from identify.command_line_parser import CommandLineParser
@@ -13,6 +13,16 @@ from identify.database import Database
 from identify.fingerprinting import FingerprintingMethod
 from identify.pattern_matching import Apriori
 from identify.ja_context import JA_Context
+from identify.model import Model
+from identify.metrics import metrics
+from identify.profiler import StageProfiler
+from identify.pattern_cache import PatternCache
+from identify.sampling import SupportSampler
+from identify.partitions import PartitionedDatabase
+from identify.lean import LeanDatabase
+from identify.results_sink import ResultsSink
+from identify.score_cache import ScoreCache
+from identify.lsh import MinHashLSH
 import time
 
 
@@ -21,33 +31,204 @@ def main():
         logger.info("[START]")
 
         config = CommandLineParser()
-        db = Database(config.dataset)
+        if config.metrics_json or config.metrics_prom:
+            metrics.enable()
 
-        fingerprinting = FingerprintingMethod(config.ja_version)
-        db.create_lookup_table(config.ja_version)
-        fingerprinting.identify(db)
-        fingerprinting.display_statistics()
-
-        context = Apriori(
-            config.min_support,
-            config.ja_version,
-            config.max_candidates_length,
+        profiler = StageProfiler(
+            config.profile, config.profile_mode, config.profile_dir
         )
-        context.train(db)
 
-        ja_context = JA_Context(
-            fingerprinting,
-            context,
-            config.sliding_window_size,
+        if config.partition_dir:
+            # Out-of-core training, lookup table is built while partitions are trained.
+            db = PartitionedDatabase(config.dataset, config.partition_dir, config.workers)
+            context = Apriori(
+                config.min_support,
+                config.ja_versions[0],
+                config.max_candidates_length,
+            )
+            configure_training(context, config)
+            with profiler.stage("train"):
+                db.train(context, config.ja_version)
+            finish_training(db, context, config)
+        else:
+            if config.lean:
+                db = LeanDatabase(config.dataset, config.workers)
+            else:
+                db = Database(config.dataset, config.workers)
+            # lookup tables of all evaluated versions are built in one scan of training data
+            db.create_lookup_table(config.ja_version)
+
+        if config.per_launch:
+            identify_launches(db, config, profiler)
+        else:
+            results_sink = (
+                ResultsSink(config.results, config.max_candidates_length)
+                if config.results
+                else None
+            )
+            test_df = None
+            reports = []
+            for ja_version in config.ja_versions:
+                report, test_df = evaluate_version(
+                    db, config, profiler, ja_version, test_df, results_sink
+                )
+                reports.append(report)
+            if results_sink is not None:
+                results_sink.close()
+
+            if len(reports) > 1:
+                display_combined_report(reports)
+
+        if config.metrics_json:
+            metrics.export_json(config.metrics_json)
+        if config.metrics_prom:
+            metrics.export_prometheus(config.metrics_prom)
+
+        logger.info("[FINISH]")
+
+
+def configure_training(context, config):
+    if config.sample_error:
+        context.sampler = SupportSampler(
+            config.sample_error, config.sample_confidence, config.sample_verify
+        )
+    if config.pattern_cache:
+        context.pattern_cache = PatternCache(
+            config.pattern_cache, int(config.pattern_cache_size * 2**20)
         )
+
+
+def finish_training(db, context, config):
+    if context.sampler is not None:
+        context.sampler.display_statistics()
+    if context.pattern_cache is not None:
+        context.pattern_cache.display_statistics()
+
+    if config.save_model:
+        Model.from_database(db, config.min_support).save(config.save_model)
+
+
+def evaluate_version(db, config, profiler, ja_version, test_df=None, results_sink=None):
+    """evaluates fingerprinting and context identification of one JA version
+
+    Args:
+        db (Database): Loaded and split dataset with lookup tables of all versions.
+        config (CommandLineParser): Parsed arguments.
+        profiler (StageProfiler): Profiler of stages.
+        ja_version (int): Evaluated version (3 or 4).
+        test_df (df): Shuffled test data of previous version, prepared again if None.
+        results_sink (ResultsSink): Log of predictions of every record, shared by all versions.
+
+    Returns:
+        tuple: of report (dict) and shuffled test data shared with next versions.
+    """
+    report = {"ja_version": ja_version}
+    # profiles of stages of more versions would overwrite each other
+    suffix = f"_ja{ja_version}" if len(config.ja_versions) > 1 else ""
+
+    fingerprinting = FingerprintingMethod(ja_version, config.sni_match)
+    start_time = time.time()
+    with profiler.stage("fingerprint", suffix):
+        fingerprinting.identify(db)
+    report["fingerprint_time"] = time.time() - start_time
+    fingerprinting.display_statistics()
+
+    context = Apriori(
+        config.min_support,
+        ja_version,
+        config.max_candidates_length,
+    )
+    # Patterns do not depend on JA version, they are mined only once and shared.
+    if not db.frequent_patterns:
+        configure_training(context, config)
         start_time = time.time()
-        ja_context.identify(db)
-        finish_time = time.time() - start_time
+        with profiler.stage("train", suffix):
+            context.train(db)
+        report["train_time"] = time.time() - start_time
+        finish_training(db, context, config)
 
-        ja_context.context.display_statistics()
-        print("--- identification took %s seconds ---" % round(finish_time, 2))
+    ja_context = JA_Context(
+        fingerprinting,
+        context,
+        config.sliding_window_size,
+        config.cascade,
+        config.partial_match,
+    )
+    ja_context.results_sink = results_sink
+    if config.score_cache_size:
+        ja_context.score_cache = ScoreCache(config.score_cache_size)
+    if config.lsh:
+        ja_context.lsh = MinHashLSH(db.frequent_patterns, config.lsh_bands, config.lsh_rows)
+    if test_df is None:
+        test_df = ja_context._prepare_test_data(db)
+    start_time = time.time()
+    with profiler.stage("context", suffix):
+        ja_context.identify(db, test_df)
+    finish_time = time.time() - start_time
+    report["context_time"] = finish_time
 
-        logger.info("[FINISH]")
+    ja_context.context.display_statistics()
+    if ja_context.score_cache is not None:
+        ja_context.score_cache.display_statistics()
+    if ja_context.lsh is not None:
+        ja_context.lsh.display_statistics()
+    print("--- identification took %s seconds ---" % round(finish_time, 2))
+    print(
+        "--- throughput %s records/s ---"
+        % round(ja_context.context.number_of_tls / finish_time, 2)
+    )
+
+    report["fingerprint"] = fingerprinting.correct / len(fingerprinting.len_candidates)
+    report["fingerprint_comb"] = fingerprinting.correct_combination / len(
+        fingerprinting.len_candidates_combination
+    )
+    report["context"] = context.get_statistics(is_comb=False)["accuracy_overall"]
+    report["context_comb"] = context.get_statistics(is_comb=True)["accuracy_overall"]
+    return report, test_df
+
+
+def identify_launches(db, config, profiler):
+    """identifies every test launch as one unit using items of the whole launch"""
+    context = Apriori(
+        config.min_support,
+        config.ja_versions[0],
+        config.max_candidates_length,
+        config.launch_output,
+    )
+    if not db.frequent_patterns:
+        configure_training(context, config)
+        with profiler.stage("train"):
+            context.train(db)
+        finish_training(db, context, config)
+
+    start_time = time.time()
+    with profiler.stage("context"):
+        results = context.identify(db, config.workers)
+    finish_time = time.time() - start_time
+
+    context.display_launch_statistics()
+    print("--- identification took %s seconds ---" % round(finish_time, 2))
+    print("--- throughput %s launches/s ---" % round(len(results) / finish_time, 2))
+    if config.launch_output:
+        context.export_launches(results)
+
+
+def display_combined_report(reports):
+    print("________________________________________________________")
+    print("Comparison of JA versions (accuracy, time in seconds):")
+    print(
+        f"{'version':<9}{'fp':<9}{'fp comb':<9}{'ctx':<9}{'ctx comb':<10}"
+        f"{'fp time':<9}{'train':<9}{'ctx time':<9}"
+    )
+    for report in reports:
+        train_time = report.get("train_time")
+        print(
+            f"{'JA' + str(report['ja_version']):<9}{round(report['fingerprint'], 4):<9}"
+            f"{round(report['fingerprint_comb'], 4):<9}{round(report['context'], 4):<9}"
+            f"{round(report['context_comb'], 4):<10}{round(report['fingerprint_time'], 2):<9}"
+            f"{round(train_time, 2) if train_time is not None else 'shared':<9}"
+            f"{round(report['context_time'], 2):<9}"
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+"""
+File: serve.py
+Description: Runs identification server over a Unix domain socket using model stored by main.py (--save_model).
+             Model can be replaced without restart by sending SIGHUP or "reload" request.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+from identify.logger import Logger
+from identify.server import IdentificationServer
+
+import argparse
+import asyncio
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve identification of applications over a Unix domain socket"
+    )
+    parser.add_argument(
+        "-M", "--model", type=str, required=True, help="Path to the trained model"
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        type=str,
+        help="path of the Unix domain socket",
+        default="identify.sock",
+    )
+    parser.add_argument(
+        "-w",
+        "--sliding_window_size",
+        type=int,
+        help="size of sliding window within one batch",
+        default=10,
+    )
+    parser.add_argument(
+        "-c",
+        "--max_candidates_length",
+        type=int,
+        help="maximum number of guesses returned per record",
+        default=4,
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="number of threads classifying batches",
+        default=4,
+    )
+    args = parser.parse_args()
+
+    with Logger() as logger:
+        logger.info("[START SERVER]")
+        server = IdentificationServer(
+            args.socket,
+            args.model,
+            args.sliding_window_size,
+            args.max_candidates_length,
+            args.workers,
+        )
+        asyncio.run(server.serve_forever())
+        logger.info("[STOP SERVER]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+File: sweep.py
+Description: Hyperparameter sweep over min_support, pattern filters, sliding window size and candidate size.
+             Dataset is loaded and mined only once, every configuration is evaluated in parallel.
+Author: Pomsar Jakub
+Xlogin: xpomsa00
+Created: 19/10/2026
+Updated: 19/10/2026
+"""
+
+import config
+from identify.logger import Logger
+from identify.sweep import Sweep
+
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Evaluate combinations of hyperparameters over one loaded dataset"
+    )
+    parser.add_argument(
+        "-d", "--dataset", type=str, required=True, help="Path to the dataset"
+    )
+    parser.add_argument(
+        "-f",
+        "--ja_version",
+        type=int,
+        help="version of fingerprinting [JA3 or JA4]",
+        choices=[3, 4],
+        default=4,
+    )
+    parser.add_argument(
+        "-w",
+        "--sliding_window_size",
+        type=int,
+        nargs="+",
+        help="sizes of sliding window",
+        default=[10],
+    )
+    parser.add_argument(
+        "-m",
+        "--min_support",
+        type=float,
+        nargs="+",
+        help="minimum supports for frequent pattern mining",
+        default=[0.1],
+    )
+    parser.add_argument(
+        "-c",
+        "--max_candidates_length",
+        type=int,
+        nargs="+",
+        help="maximum lengths of candidate patterns",
+        default=[4],
+    )
+    parser.add_argument(
+        "--filters",
+        type=str,
+        nargs="+",
+        choices=list(config.PATTERN_FILTER_PRESETS),
+        help="named sets of pattern filters from config.PATTERN_FILTER_PRESETS",
+        default=["config"],
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, help="number of parallel processes", default=1
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, help="path of the results table (CSV)", default=None
+    )
+    args = parser.parse_args()
+
+    with Logger() as logger:
+        logger.info("[START SWEEP]")
+        sweep = Sweep(
+            args.dataset,
+            args.ja_version,
+            args.min_support,
+            args.sliding_window_size,
+            args.max_candidates_length,
+            args.filters,
+            args.workers,
+        )
+        rows = sweep.run()
+        sweep.display_results(rows)
+        if args.output:
+            sweep.export_to_csv(rows, args.output)
+            print(f"\nResults saved to {args.output}")
+        logger.info("[FINISH SWEEP]")
+
+
+if __name__ == "__main__":
+    main()